@@ -2,25 +2,65 @@
 #FUNCIONES DEL PROYECTO
 #--------------------------
 
-#   Parámetros (14 entradas en orden):
+#   Parámetros (14 entradas en orden, en unidades del modelo kN y m):
 #    ----------------------------------
-#    1. Vfy                : Limite de fluencia del acero (MPa)
-#    2. VEs                : Módulo de elasticidad del acero (GPa)
-#    3. Vfc_vigas          : f'c vigas (MPa)
-#    4. VEc_vigas          : Ec vigas (MPa)
-#    5. Vfc_columnas       : f'c columnas (MPa)
-#    6. VEc_columnas       : Ec columnas (MPa)
+#    1. Vfy                : Limite de fluencia del acero (kN/m²)
+#    2. VEs                : Módulo de elasticidad del acero (kN/m²)
+#    3. Vfc_vigas          : f'c vigas (kN/m²)
+#    4. VEc_vigas          : Ec vigas (kN/m²)
+#    5. Vfc_columnas       : f'c columnas (kN/m²)
+#    6. VEc_columnas       : Ec columnas (kN/m²)
 #    7. Vb1                : Ancho viga (m)
 #    8. Vh1                : Alto viga (m)
 #    9. Vb2                : Ancho columna (m)
 #    10. Vh2               : Alto columna (m)
-#    11. Vrec              : Recubrimiento (mm)
+#    11. Vrec              : Recubrimiento (m)
 #    12. VWentrepiso       : Carga muerta entrepiso (kN/m²)
 #    13. VWcubierta        : Carga muerta cubierta (kN/m²)
 #    14. VWviva            : Carga viva (kN/m²)
+#   Para pasar muestras LHS (MPa, GPa, mm) usar esquema_muestras.convertir_a_argumentos
+#
+#   Opciones (por nombre):
+#    ----------------------------------
+#    graficar=True      : Si es False, no dibuja la curva de capacidad (campañas y validaciones)
+#    dU=None            : Incremento de desplazamiento por paso del pushover en m (por defecto 1 mm)
+#    algoritmo=None     : Algoritmo de solución del pushover, como nombre o tupla de argumentos de
+#                         ops.algorithm, p. ej. 'KrylovNewton' o ('NewtonLineSearch', 0.8). Por
+#                         defecto ModifiedNewton -initial
+#    progreso=None      : Función progreso(paso, deriva) llamada tras cada paso convergido del
+#                         pushover (la usa el vigilante de campana.ejecutar_campana)
+#    registro_fuerzas=None : Registro selectivo de fuerzas internas (localForce) en memoria, en lugar
+#                         de los recorders de todas las columnas y vigas en cada paso. Diccionario con:
+#                           'elementos': grupos de GRUPOS_ELEMENTOS y/o tags (por defecto todos)
+#                           'cada'     : registra cada N pasos del pushover
+#                           'derivas'  : registra en estas derivas de techo, interpolando entre los
+#                                        dos pasos convergidos que las encierran (los elementos solo
+#                                        se consultan en esos pasos, no en todo el pushover)
+#                         Sin 'cada' ni 'derivas' se registra cada paso
+#
+#   Retorna un diccionario con los historiales 'desplazamiento', 'cortante_basal' y 'deriva',
+#   'cortante_maximo' y 'pasos_completados' (más 'fuerzas_elementos' con registro_fuerzas: 'elementos'
+#   (n,), 'paso' (m,), 'deriva' (m,) y 'fuerzas' (m, n, 12); 'paso' es fraccionario en los registros
+#   interpolados). Las sensibilidades a los 14 argumentos se obtienen con gradientes_pushover
+
+# Argumentos nominales del modelo (unidades del modelo)
+ARGUMENTOS_NOMINALES = (420000, 200000000, 21000, 21538106, 28000, 21538106, 0.30, 0.45, 0.45, 0.55, 0.04, 3.7, 0.20, 1.80)
+
+# Tags de elementos por grupo (columnas 1-45 entre pisos; vigas 46-81 en X y 82-111 en Y)
+GRUPOS_ELEMENTOS = {
+    'columnas_piso1':  list(range(1, 16)),                              # Entre base y piso 2
+    'columnas_piso2':  list(range(16, 31)),                             # Entre pisos 2 y 3
+    'columnas_piso3':  list(range(31, 46)),                             # Entre piso 3 y cubierta
+    'vigas_piso2':     list(range(46, 58)) + list(range(82, 92)),
+    'vigas_piso3':     list(range(58, 70)) + list(range(92, 102)),
+    'vigas_cubierta':  list(range(70, 82)) + list(range(102, 112)),
+    'columnas':        list(range(1, 46)),
+    'vigas':           list(range(46, 112)),
+}
 
 #Función 1: "pushover" - Toma como parámetros de entrada las 14 variables aleatorias y realiza el análisis pushover
-def pushover(Vfy, VEs,Vfc_vigas,VEc_vigas,Vfc_columnas,VEc_columnas,Vb1,Vh1,Vb2,Vh2,Vrec,VWentrepiso,VWcubierta,VWviva):
+def pushover(Vfy, VEs,Vfc_vigas,VEc_vigas,Vfc_columnas,VEc_columnas,Vb1,Vh1,Vb2,Vh2,Vrec,VWentrepiso,VWcubierta,VWviva,
+             graficar=True, dU=None, algoritmo=None, progreso=None, registro_fuerzas=None):
     # ============================================
     # IMPORTAR LIBRERÍAS
     # ============================================
@@ -290,6 +330,8 @@ def pushover(Vfy, VEs,Vfc_vigas,VEc_vigas,Vfc_columnas,VEc_columnas,Vb1,Vh1,Vb2,
         ops.element("dispBeamColumn",23+i,*[i,i+1],2,2,'-cMass',0)
     for i in range(56,60):
         ops.element("dispBeamColumn",22+i,*[i,i+1],2,2,'-cMass',0)
+    elementos_columnas = list(range(1,46))   # Columnas: material 1 (acero), 4 y 5 (concreto)
+    elementos_vigas = list(range(46,112))    # Vigas: material 1 (acero), 2 y 3 (concreto)
     #Creación de vigas piso en sentido Y
     for i in range(16,21):
         ops.element("dispBeamColumn",66+i,*[i,i+5],2,2,'-cMass',0)
@@ -403,23 +445,41 @@ def pushover(Vfy, VEs,Vfc_vigas,VEc_vigas,Vfc_columnas,VEc_columnas,Vb1,Vh1,Vb2,
     # DEFINICIÓN DE CONTROL DE DESPLAZAMIENTO 
     control_dof= 1                  # Grado de libertad de control (1=X, 2=Y, 3=Z)
     control_nodo= nodo_maestro_cub  # Nodo maestro de control (nodo de cubierta)
-    dU= 1.0*mm                      # Incremento de desplazamiento por paso
+    dU= dU or 1.0*mm                # Incremento de desplazamiento por paso
     # DEFINICIÓN DE RECORDERS DE SALIDA
     # Recorder de desplazamientos del nodo de control
     ops.recorder("Node", "-file", "desplazamientos.txt", "-time", "-node", control_nodo, "-dof", 1,2,3, "disp")
     # Recorder de reacciones en la base
     ops.recorder("Node", "-file", "reacciones_base.txt", "-time", "-node", *nodos_piso1, "-dof", 1,2,3, "reaction")
-    # Recorder de fuerzas internas en columnas
-    ops.recorder("Element", "-file", "fuerzas_columnas.txt", "-time", "-ele", *range(1,46), "localForce")
-    # Recorder de fuerzas internas en vigas
-    ops.recorder("Element", "-file", "fuerzas_vigas.txt", "-time", "-ele", *range(47,112), "localForce")
+    if registro_fuerzas is None:
+        # Recorder de fuerzas internas en columnas
+        ops.recorder("Element", "-file", "fuerzas_columnas.txt", "-time", "-ele", *range(1,46), "localForce")
+        # Recorder de fuerzas internas en vigas
+        ops.recorder("Element", "-file", "fuerzas_vigas.txt", "-time", "-ele", *range(47,112), "localForce")
+    else:
+        # Registro selectivo en memoria: subconjunto de elementos, cada N pasos y/o en derivas objetivo
+        opciones_desconocidas = set(registro_fuerzas) - {'elementos', 'cada', 'derivas'}
+        if opciones_desconocidas:
+            raise ValueError(f"Opciones de registro_fuerzas desconocidas: {sorted(opciones_desconocidas)}")
+        elementos_fuerzas = sorted({tag for grupo in registro_fuerzas.get('elementos', ['columnas', 'vigas'])
+                                    for tag in (GRUPOS_ELEMENTOS[grupo] if isinstance(grupo, str) else [grupo])})
+        derivas_objetivo = sorted(registro_fuerzas.get('derivas') or [])
+        cada_fuerzas = registro_fuerzas.get('cada') or (None if derivas_objetivo else 1)
+        def fuerzas_elementos():
+            return np.array([ops.eleResponse(tag, 'localForce') for tag in elementos_fuerzas])
+        fuerzas_registro, pasos_registro, derivas_registro = [], [], []
+        fuerzas_previas = fuerzas_elementos()                       # Estado tras las cargas de gravedad
+        deriva_previa, deriva_fuerzas, paso_fuerzas = 0.0, 0.0, 0     # Deriva del paso anterior y del estado consultado
     # CONFIGURACIÓN DE ANÁLISIS PARA PUSHOVER
     ops.wipeAnalysis()
     ops.constraints('Transformation')
     ops.numberer('RCM')
     ops.system('BandGeneral')
     ops.test('NormDispIncr', 1.0e-2, 25)
-    ops.algorithm('ModifiedNewton', '-initial')
+    if algoritmo is not None:
+        ops.algorithm(*((algoritmo,) if isinstance(algoritmo, str) else algoritmo))
+    else:
+        ops.algorithm('ModifiedNewton', '-initial')
     ops.integrator("DisplacementControl",control_nodo, control_dof, dU)
     ops.analysis('Static')
     desp_obj=0.50*m                 #Definición de desplazamiento objetivo
@@ -449,6 +509,32 @@ def pushover(Vfy, VEs,Vfc_vigas,VEc_vigas,Vfc_columnas,VEc_columnas,Vb1,Vh1,Vb2,
             reaccion = ops.nodeReaction(nodo, control_dof)     #Se calcula la reacción de todos los nodos de la base en cada paso
             cortante_basal += abs(reaccion)                    #Se suma la reacción de todos los nodos de la base en cada paso para calcular el cortante basal
         cortante_basal_historial.append(cortante_basal)        #Se registra la reacción del cortante basal en el vector historial
+        if progreso is not None:
+            progreso(paso + 1, deriva)                         #Informa el avance (vigilancia de tareas en campañas)
+        # ---- REGISTRO SELECTIVO DE FUERZAS INTERNAS ----
+        if registro_fuerzas is not None:
+            while derivas_objetivo and derivas_objetivo[0] <= deriva_previa:
+                derivas_objetivo.pop(0)                                        #Objetivos ya superados (p. ej. deriva 0)
+            toca_paso = bool(cada_fuerzas) and (paso + 1) % cada_fuerzas == 0
+            cruce = bool(derivas_objetivo) and deriva >= derivas_objetivo[0]
+            fuerzas_actuales = fuerzas_elementos() if (toca_paso or cruce) else None
+            while derivas_objetivo and deriva >= derivas_objetivo[0]:
+                #Interpolación lineal en la deriva entre el último estado consultado (normalmente el paso anterior) y el actual
+                w = (derivas_objetivo[0] - deriva_fuerzas) / (deriva - deriva_fuerzas)
+                fuerzas_registro.append(fuerzas_previas + w * (fuerzas_actuales - fuerzas_previas))
+                pasos_registro.append(paso_fuerzas + w * (paso + 1 - paso_fuerzas))
+                derivas_registro.append(derivas_objetivo.pop(0))
+            if toca_paso:
+                fuerzas_registro.append(fuerzas_actuales)
+                pasos_registro.append(paso + 1)
+                derivas_registro.append(deriva)
+            #Con DisplacementControl la deriva avanza casi lo mismo en cada paso: los elementos solo se consultan
+            #si el paso siguiente puede alcanzar el próximo objetivo (con dos incrementos de margen)
+            if fuerzas_actuales is None and derivas_objetivo and deriva + 2 * (deriva - deriva_previa) >= derivas_objetivo[0]:
+                fuerzas_actuales = fuerzas_elementos()
+            if fuerzas_actuales is not None:
+                fuerzas_previas, deriva_fuerzas, paso_fuerzas = fuerzas_actuales, deriva, paso + 1
+            deriva_previa = deriva
         # ---- ACTUALIZAR CORTANTE MÁXIMO ----
         if max_cortante == 0:           
             max_cortante = cortante_basal
@@ -484,21 +570,85 @@ def pushover(Vfy, VEs,Vfc_vigas,VEc_vigas,Vfc_columnas,VEc_columnas,Vb1,Vh1,Vb2,
     cortante_basal_historial = np.array(cortante_basal_historial) #Convierte el vector de historial de cortante basal a Array de Numpy
     desplazamiento_historial = np.array(desplazamiento_historial) #Convierte el vector de historial de desplazamiento a Array de Numpy
     deriva_historial = np.array(deriva_historial)                 #Convierte el vector de historial de deriva total  a Array de Numpy
-    # PROCESAMIENTO DE DATOS DE SALIDA
-    datos_desp = np.loadtxt('desplazamientos.txt')   #Lectura de datos de desplazamiento
-    pasos_tiempo = datos_desp[:, 0]                  #Lectura de datos de pasos de tiempo
-    desplazamientoX = datos_desp[:, 1]               #Lectura de datos de desplazamiento en X
-    desplazamientoY = datos_desp[:, 2]               #Lectura de datos de desplazamiento en Y
-    desplazamientoZ = datos_desp[:, 3]               #Lectura de datos de desplazamiento en Z
-    plt.figure(figsize=(10, 6))
-    plt.plot(desplazamientoX, cortante_basal_historial, 'b-', linewidth=2)
-    plt.xlabel('Desplazamiento de techo (m)', fontsize=12)
-    plt.ylabel('Cortante basal (kN)', fontsize=12)
-    plt.title('Curva de Capacidad - Análisis Pushover Dirección X', fontsize=14, fontweight='bold')
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig('curva_pushover.png', dpi=600)
-    plt.show()
+    # PROCESAMIENTO DE DATOS DE SALIDA (solo para la gráfica; sin ella no se lee el recorder)
+    if graficar:
+        datos_desp = np.loadtxt('desplazamientos.txt', ndmin=2)   #Lectura de datos de desplazamiento
+        pasos_tiempo = datos_desp[:, 0]                           #Lectura de datos de pasos de tiempo
+        desplazamientoX = datos_desp[:, 1]                        #Lectura de datos de desplazamiento en X
+        desplazamientoY = datos_desp[:, 2]                        #Lectura de datos de desplazamiento en Y
+        desplazamientoZ = datos_desp[:, 3]                        #Lectura de datos de desplazamiento en Z
+        plt.figure(figsize=(10, 6))
+        plt.plot(desplazamientoX, cortante_basal_historial, 'b-', linewidth=2)
+        plt.xlabel('Desplazamiento de techo (m)', fontsize=12)
+        plt.ylabel('Cortante basal (kN)', fontsize=12)
+        plt.title('Curva de Capacidad - Análisis Pushover Dirección X', fontsize=14, fontweight='bold')
+        plt.grid(True, alpha=0.3)
+        plt.tight_layout()
+        plt.savefig('curva_pushover.png', dpi=600)
+        plt.show()
+    resultados = {
+        'desplazamiento': desplazamiento_historial,
+        'cortante_basal': cortante_basal_historial,
+        'deriva': deriva_historial,
+        'cortante_maximo': max_cortante,
+        'pasos_completados': len(desplazamiento_historial),
+    }
+    if registro_fuerzas is not None:
+        resultados['fuerzas_elementos'] = {
+            'elementos': np.array(elementos_fuerzas),
+            'paso': np.array(pasos_registro, dtype=float),
+            'deriva': np.array(derivas_registro),
+            'fuerzas': np.array(fuerzas_registro).reshape(-1, len(elementos_fuerzas), 12),
+        }
+    return resultados
+
+#Función 2: "gradientes_pushover" - Sensibilidades de la curva de capacidad por diferencias finitas centradas
+def gradientes_pushover(argumentos=ARGUMENTOS_NOMINALES, h_rel=1e-3, n_procesos=None):
+    #   Parámetros:
+    #    ----------------------------------
+    #    argumentos : 14 argumentos de pushover (por defecto el modelo nominal)
+    #    h_rel      : Paso relativo de las diferencias finitas (h = h_rel*|argumento|)
+    #    n_procesos : Procesos para los 28 análisis perturbados (None usa todos los núcleos, 1 en serie)
+    #   Retorna un diccionario con 'parametros' (14 nombres), 'desplazamiento' (pasos,), 'dV_dp' (pasos, 14)
+    #   y 'pasos_completados' (14, 2) de los análisis +h y -h de cada argumento.
+    #   Con DisplacementControl el paso k tiene el mismo desplazamiento de techo en todos los análisis, así
+    #   que dV_dp es la sensibilidad del cortante basal a desplazamiento constante. Cada columna llega hasta
+    #   el último paso común a sus dos análisis (NaN después, y en toda la columna si uno de ellos falló).
+    #   Con openseespy 3.7.1 la convergencia del modelo varía entre procesos aun con los mismos argumentos
+    #   (ver README), así que la longitud de cada columna se revisa en 'pasos_completados'
+    import numpy as np
+    from functools import partial
+    from evaluacion import evaluar_puntos
+    nombres = ['Vfy', 'VEs', 'Vfc_vigas', 'VEc_vigas', 'Vfc_columnas', 'VEc_columnas', 'Vb1', 'Vh1', 'Vb2', 'Vh2',
+               'Vrec', 'VWentrepiso', 'VWcubierta', 'VWviva']
+    print("\n" + "="*50)
+    print("GRADIENTES POR DIFERENCIAS FINITAS CENTRADAS")
+    print("="*50)
+    argumentos = np.asarray(argumentos, dtype=float)
+    h = h_rel * np.abs(argumentos)
+    puntos = np.repeat(argumentos[None, :], 2 * len(argumentos), axis=0)
+    puntos[0::2][np.diag_indices(len(argumentos))] += h     # Fila 2i: argumento i + h
+    puntos[1::2][np.diag_indices(len(argumentos))] -= h     # Fila 2i+1: argumento i - h
+    salidas = evaluar_puntos(partial(pushover, graficar=False), puntos, n_procesos)
+    cortantes = [None if error is not None else resultado['cortante_basal'] for resultado, error in salidas]
+    pasos_completados = np.array([[-1 if V is None else len(V) for V in cortantes[2*i:2*i + 2]]
+                                  for i in range(len(argumentos))])
+    pasos = max(int(pasos_completados.min(axis=1).max()), 0)
+    dV_dp = np.full((pasos, len(argumentos)), np.nan)
+    desplazamiento = np.array([])
+    for i, nombre in enumerate(nombres):
+        V_mas, V_menos = cortantes[2*i], cortantes[2*i + 1]
+        if V_mas is None or V_menos is None:
+            print(f"✗ {nombre:<14} análisis perturbado con error")
+            continue
+        n = min(len(V_mas), len(V_menos))                   # Mismo desplazamiento por paso
+        dV_dp[:n, i] = (V_mas[:n] - V_menos[:n]) / (2 * h[i])
+        if n == pasos and len(desplazamiento) < pasos:
+            desplazamiento = salidas[2*i][0]['desplazamiento'][:n]
+        print(f"✓ {nombre:<14} {n} pasos, dV/dp final = {dV_dp[n - 1, i] if n else np.nan:.4g}")
+    return {'parametros': nombres, 'desplazamiento': desplazamiento, 'dV_dp': dV_dp,
+            'pasos_completados': pasos_completados}
 
-pushover(420000, 200000000, 21000, 21538106, 28000, 21538106, 0.30, 0.45, 0.45, 0.55, 0.04, 3.7, 0.20, 1.80)  
+if __name__ == "__main__":
+    pushover(*ARGUMENTOS_NOMINALES)
 
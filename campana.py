@@ -0,0 +1,390 @@
+"""
+=============================================================================
+EJECUCIÓN DE CAMPAÑAS PUSHOVER POR BLOQUES
+=============================================================================
+
+Conecta el muestreo LHS con la función de análisis sin materializar el
+diseño completo:
+
+1. productor_bloques: un hilo genera, valida y convierte los bloques LHS
+   a argumentos de pushover (orden y unidades del modelo, ver
+   esquema_muestras) y los deja en una cola acotada.
+2. ejecutar_campana: despacha cada fila a un pool de procesos en cuanto
+   llega su bloque, con un número máximo de tareas pendientes.
+
+Así los análisis del bloque 1 empiezan mientras se generan los siguientes,
+y la memoria queda acotada por la profundidad de la cola y del pool.
+
+Con tiempo_max o tasa_min, ejecutar_campana vigila cada muestra en su
+propio proceso: las que se estancan se matan, se registran como tiempo
+agotado y opcionalmente se reintentan con otras opciones de pushover
+(dU menor, otro algoritmo), de modo que una muestra rezagada no retiene
+toda la campaña.
+
+La evaluación de cada muestra (evaluar_muestra) y la de listas cortas de
+puntos ya construidos (evaluar_puntos) están en evaluacion.py.
+=============================================================================
+"""
+
+import os
+import time
+import queue
+import shutil
+import inspect
+import tempfile
+import threading
+import numpy as np
+from collections import deque
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from evaluacion import evaluar_muestra, contexto_procesos
+# Reexportadas para el código que las importaba desde campana
+from evaluacion import evaluador_lote, funcion_lote, evaluar_puntos, evaluar_salidas
+from lhs_muestreo import generar_lhs_por_bloques
+from esquema_muestras import convertir_a_argumentos, a_matriz
+
+
+# ============================================================================
+# PRODUCTOR DE BLOQUES
+# ============================================================================
+
+_FIN = object()
+
+
+def validar_bloque(bloque):
+    """
+    Comprueba que un bloque de argumentos sea utilizable por el modelo.
+
+    Lanza ValueError si hay valores no finitos o no positivos.
+    """
+    if not np.all(np.isfinite(bloque)):
+        raise ValueError("El bloque contiene valores no finitos")
+    filas, columnas = np.nonzero(bloque <= 0)
+    if len(filas):
+        raise ValueError(f"Valor no positivo en la fila {filas[0]}, argumento {columnas[0]}")
+    return bloque
+
+
+def productor_bloques(n_samples=1000, tam_bloque=100, seed=2025, correlacion=None,
+                      profundidad_cola=2):
+    """
+    Generador de bloques de argumentos de pushover producidos en segundo plano.
+
+    Un hilo genera cada bloque LHS, lo convierte a argumentos de pushover
+    (orden y unidades del modelo) y lo valida. La cola admite como máximo
+    `profundidad_cola` bloques listos, de modo que el productor se detiene
+    si el consumidor va más lento.
+
+    Parámetros:
+    -----------
+    n_samples : int
+        Número total de muestras (múltiplo de tam_bloque)
+    tam_bloque : int
+        Muestras por bloque
+    seed : int
+        Semilla maestra del diseño LHS
+    correlacion : array-like, opcional
+        Correlación de rangos objetivo (ver lhs_muestreo.inducir_correlacion)
+    profundidad_cola : int
+        Número máximo de bloques en espera
+
+    Produce:
+    --------
+    tuple : (indice_inicial, argumentos) con argumentos de forma
+            (tam_bloque, 14) en el orden y unidades de pushover
+    """
+    cola = queue.Queue(maxsize=profundidad_cola)
+    detener = threading.Event()
+
+    def poner(elemento):
+        # Espera lugar en la cola sin bloquearse si el consumidor ya se detuvo
+        while not detener.is_set():
+            try:
+                cola.put(elemento, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def producir():
+        try:
+            inicio = 0
+            for bloque in generar_lhs_por_bloques(n_samples, tam_bloque, seed,
+                                                  correlacion=correlacion):
+                argumentos = validar_bloque(a_matriz(convertir_a_argumentos(bloque)))
+                if not poner((inicio, argumentos)):
+                    return
+                inicio += len(bloque)
+            poner(_FIN)
+        except Exception as e:
+            poner(e)
+
+    hilo = threading.Thread(target=producir, daemon=True)
+    hilo.start()
+    try:
+        while True:
+            elemento = cola.get()
+            if elemento is _FIN:
+                break
+            if isinstance(elemento, Exception):
+                raise elemento
+            yield elemento
+    finally:
+        detener.set()
+
+
+# ============================================================================
+# EJECUTOR DE LA CAMPAÑA
+# ============================================================================
+
+def ejecutar_campana(funcion, bloques, n_procesos=None, max_pendientes=None, verbose=True,
+                     tiempo_max=None, tasa_min=None, ventana=30.0, reintentos=(),
+                     directorio_salida=None):
+    """
+    Ejecuta la función sobre un flujo de bloques de argumentos.
+
+    Con tiempo_max o tasa_min cada muestra corre vigilada en su propio
+    proceso (ver _ejecutar_vigilada) y el tiempo de una muestra queda
+    acotado por tiempo_max × (1 + len(reintentos)).
+
+    Parámetros:
+    -----------
+    funcion : callable
+        Función de análisis a nivel de módulo (debe poder serializarse),
+        p. ej. pushover
+    bloques : iterable
+        Flujo de (indice_inicial, argumentos), p. ej. productor_bloques(...)
+    n_procesos : int, opcional
+        Procesos del pool. None usa todos los núcleos
+    max_pendientes : int, opcional
+        Máximo de tareas enviadas y no terminadas (por defecto 2 × n_procesos)
+    verbose : bool
+        Si es True, informa el avance por bloque
+    tiempo_max : float, opcional
+        Segundos máximos por intento de una muestra
+    tasa_min : float, opcional
+        Pasos de pushover por segundo mínimos, medidos en ventanas de
+        `ventana` segundos a partir del primer paso (requiere que la función
+        acepte el argumento progreso, como pushover)
+    ventana : float
+        Duración en segundos de la ventana de medición de tasa_min
+    reintentos : sequence of dict
+        Opciones de la función para cada reintento de una muestra que agotó
+        su tiempo, p. ej. [{'dU': 0.5e-3}, {'algoritmo': 'KrylovNewton'}]
+    directorio_salida : str, opcional
+        Si se indica, cada muestra se evalúa en directorio_salida/muestra_{indice}
+        y se conservan sus archivos de recorders; si no, solo se conserva lo
+        que retorna la función (ver evaluar_muestra)
+
+    Retorna:
+    --------
+    list : [(indice, resultado, error)] ordenada por índice de muestra;
+           error es None si la evaluación terminó bien y empieza por
+           TIEMPO_AGOTADO si la muestra se detuvo por el vigilante
+    """
+    n_procesos = n_procesos or os.cpu_count() or 1
+    if tiempo_max is not None or tasa_min is not None:
+        return _ejecutar_vigilada(funcion, bloques, n_procesos, tiempo_max, tasa_min, ventana,
+                                  reintentos, verbose, directorio_salida)
+    max_pendientes = max_pendientes or 2 * n_procesos
+    resultados = {}
+    pendientes = set()
+
+    def recoger(hechos):
+        for futuro in hechos:
+            indice, resultado, error = futuro.result()
+            resultados[indice] = (indice, resultado, error)
+            if error is not None and verbose:
+                print(f"   ✗ Muestra {indice} falló")
+
+    with ProcessPoolExecutor(max_workers=n_procesos, mp_context=contexto_procesos()) as pool:
+        for inicio, argumentos in bloques:
+            for k, fila in enumerate(argumentos):
+                if len(pendientes) >= max_pendientes:
+                    hechos, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                    recoger(hechos)
+                pendientes.add(pool.submit(evaluar_muestra, funcion, inicio + k, tuple(fila),
+                                           directorio_salida=directorio_salida))
+            if verbose:
+                print(f"   ✓ Bloque desde la muestra {inicio} enviado ({len(argumentos)} muestras)")
+        hechos, _ = wait(pendientes)
+        recoger(hechos)
+
+    return [resultados[i] for i in sorted(resultados)]
+
+
+# ============================================================================
+# VIGILANCIA DE TAREAS
+# ============================================================================
+
+TIEMPO_AGOTADO = "Tiempo agotado"
+
+
+def _proceso_vigilado(funcion, indice, argumentos, opciones, progreso, conexion, directorio_base,
+                      directorio_salida):
+    """
+    Cuerpo del proceso de una muestra vigilada: informa los pasos en
+    `progreso` (pasos, instante) y envía (indice, resultado, error).
+    """
+    def avance(paso, *_):
+        progreso[0] = paso
+        progreso[1] = time.time()
+
+    try:
+        acepta_progreso = 'progreso' in inspect.signature(funcion).parameters
+    except (TypeError, ValueError):
+        acepta_progreso = False
+    if acepta_progreso:
+        opciones = {**opciones, 'progreso': avance}
+    conexion.send(evaluar_muestra(partial(funcion, **opciones), indice, argumentos,
+                                  directorio_base=directorio_base, directorio_salida=directorio_salida))
+    conexion.close()
+
+
+class _TareaVigilada:
+    """
+    Proceso de una muestra con su canal de resultado y su medidor de avance.
+
+    El directorio temporal de la muestra se crea dentro de un directorio
+    propio de la tarea, creado por el proceso principal: un proceso matado
+    no alcanza a borrar el suyo, y el principal lo borra en cerrar().
+    """
+
+    def __init__(self, funcion, indice, argumentos, intento, opciones, directorio_salida=None):
+        self.indice = indice
+        self.argumentos = argumentos
+        self.intento = intento
+        self.directorio = tempfile.mkdtemp(prefix=f"vigilada_{indice}_")
+        # Con forkserver, el servidor importa una vez este módulo y el de la función
+        contexto = contexto_procesos(
+            precargar=[__name__, getattr(funcion, '__module__', None) or __name__])
+        self.progreso = contexto.Array('d', [0.0, 0.0], lock=False)
+        self.conexion, extremo = contexto.Pipe(duplex=False)
+        self.proceso = contexto.Process(
+            target=_proceso_vigilado,
+            args=(funcion, indice, argumentos, opciones, self.progreso, extremo, self.directorio,
+                  directorio_salida), daemon=True)
+        self.proceso.start()
+        extremo.close()
+        self.inicio = time.time()
+        self.referencia = None         # (instante, pasos) del inicio de la ventana de tasa
+
+    def motivo_detencion(self, ahora, tiempo_max, tasa_min, ventana):
+        """Texto del motivo si la tarea debe detenerse, o None."""
+        if tiempo_max is not None and ahora - self.inicio > tiempo_max:
+            return f"{TIEMPO_AGOTADO}: más de {tiempo_max:g} s"
+        pasos, instante = self.progreso
+        if tasa_min is None or instante == 0:
+            return None
+        if self.referencia is None:
+            self.referencia = (instante, pasos)
+        elif ahora - self.referencia[0] >= ventana:
+            tasa = (pasos - self.referencia[1]) / (ahora - self.referencia[0])
+            if tasa < tasa_min:
+                return (f"{TIEMPO_AGOTADO}: {tasa:.2f} pasos/s < {tasa_min:g} "
+                        f"(paso {int(pasos)})")
+            self.referencia = (ahora, pasos)
+        return None
+
+    def cerrar(self):
+        """Espera al proceso, cierra el canal y borra el directorio de la tarea."""
+        self.proceso.join()
+        self.conexion.close()
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def detener(self):
+        self.proceso.kill()
+        self.cerrar()
+
+
+def _ejecutar_vigilada(funcion, bloques, n_procesos, tiempo_max, tasa_min, ventana,
+                       reintentos, verbose, directorio_salida=None):
+    """
+    Variante de ejecutar_campana con un proceso por muestra vigilado.
+
+    El proceso principal arranca hasta n_procesos muestras a la vez y cada
+    0.1 s revisa su avance: las que superan tiempo_max o avanzan a menos de
+    tasa_min pasos/s se matan y, si quedan opciones en `reintentos`,
+    vuelven al frente de la cola con las opciones del siguiente intento.
+    """
+    tareas = ((inicio + k, tuple(fila), inicio, k == len(argumentos) - 1)
+              for inicio, argumentos in bloques for k, fila in enumerate(argumentos))
+    en_espera = deque()        # (indice, argumentos, intento) de reintentos
+    activas = []
+    resultados = {}
+    agotado = False
+
+    try:
+        while True:
+            # Arrancar muestras hasta ocupar los procesos
+            while len(activas) < n_procesos:
+                if en_espera:
+                    indice, argumentos, intento = en_espera.popleft()
+                elif not agotado:
+                    siguiente = next(tareas, None)
+                    if siguiente is None:
+                        agotado = True
+                        continue
+                    indice, argumentos, inicio, fin_bloque = siguiente
+                    intento = 0
+                    if fin_bloque and verbose:
+                        print(f"   ✓ Bloque desde la muestra {inicio} enviado")
+                else:
+                    break
+                opciones = reintentos[intento - 1] if intento else {}
+                activas.append(_TareaVigilada(funcion, indice, argumentos, intento, opciones,
+                                              directorio_salida))
+
+            if not activas:
+                break
+
+            time.sleep(0.1)
+            ahora = time.time()
+            for tarea in list(activas):
+                vivo = tarea.proceso.is_alive()     # Antes de poll: un proceso terminado ya envió todo
+                resultado = None
+                if tarea.conexion.poll():
+                    try:
+                        resultado = tarea.conexion.recv()
+                    except EOFError:                # Canal cerrado sin resultado: el proceso murió
+                        vivo = False
+                if resultado is not None:
+                    resultados[tarea.indice] = resultado
+                    tarea.cerrar()
+                    activas.remove(tarea)
+                    if verbose and resultados[tarea.indice][2] is not None:
+                        print(f"   ✗ Muestra {tarea.indice} falló")
+                    continue
+
+                if not vivo:
+                    # Terminó sin enviar resultado (p. ej. una falla del motor de OpenSees)
+                    tarea.detener()
+                    activas.remove(tarea)
+                    resultados[tarea.indice] = (tarea.indice, None, f"El proceso terminó con código "
+                                                                    f"{tarea.proceso.exitcode}")
+                    if verbose:
+                        print(f"   ✗ Muestra {tarea.indice}: el proceso terminó sin resultado")
+                    continue
+
+                motivo = tarea.motivo_detencion(ahora, tiempo_max, tasa_min, ventana)
+                if motivo is None:
+                    continue
+                tarea.detener()
+                activas.remove(tarea)
+                if tarea.intento < len(reintentos):
+                    en_espera.append((tarea.indice, tarea.argumentos, tarea.intento + 1))
+                    if verbose:
+                        print(f"   ✗ Muestra {tarea.indice} detenida ({motivo}); "
+                              f"reintento con {reintentos[tarea.intento]}")
+                else:
+                    resultados[tarea.indice] = (tarea.indice, None,
+                                                f"{motivo} (intento {tarea.intento + 1})")
+                    if verbose:
+                        print(f"   ✗ Muestra {tarea.indice} detenida ({motivo})")
+    finally:
+        # Un error (p. ej. del productor de bloques) no deja procesos ni directorios huérfanos
+        for tarea in activas:
+            tarea.detener()
+
+    return [resultados[i] for i in sorted(resultados)]
@@ -0,0 +1,180 @@
+"""
+=============================================================================
+EJECUCIÓN DE CAMPAÑAS PUSHOVER CON MPI
+=============================================================================
+
+Variante de campana.ejecutar_campana para asignaciones HPC, donde los
+procesos los lanza mpirun/srun en lugar de un pool local:
+
+- El rango 0 genera los bloques LHS (productor_bloques) y reparte las
+  muestras una a una: cada trabajador pide la siguiente al entregar el
+  resultado anterior, de modo que los análisis lentos (no convergencia,
+  muchos pasos) no retrasan a los demás rangos.
+- Cada rango > 0 evalúa en su propio proceso (su propio dominio de
+  OpenSees) y en su propio directorio de trabajo, donde cada muestra usa
+  un subdirectorio temporal para los archivos de los recorders.
+
+Uso:
+
+    mpirun -n 4 python campana_mpi.py
+
+mpi4py solo se importa al ejecutar la campaña; el resto del paquete no lo
+necesita.
+=============================================================================
+"""
+
+import time
+import shutil
+import tempfile
+
+from evaluacion import evaluar_muestra
+
+
+_TAG_LISTO = 1      # Trabajador → rango 0: resultado anterior (o None) y pedido de tarea
+_TAG_TAREA = 2      # Rango 0 → trabajador: (indice, argumentos), o None para terminar
+
+
+def _importar_mpi():
+    """Importa mpi4py con un mensaje claro si no está instalado."""
+    try:
+        from mpi4py import MPI
+    except ImportError as e:
+        raise ImportError("La ejecución con MPI requiere mpi4py (pip install mpi4py) "
+                          "y una implementación de MPI") from e
+    return MPI
+
+
+def _tareas(bloques, verbose):
+    """Recorre los bloques muestra a muestra, informando cada bloque repartido."""
+    for inicio, argumentos in bloques:
+        for k, fila in enumerate(argumentos):
+            yield inicio + k, tuple(fila)
+        if verbose:
+            print(f"   ✓ Bloque desde la muestra {inicio} repartido ({len(argumentos)} muestras)")
+
+
+def _distribuir(comm, MPI, tareas, verbose):
+    """Rango 0: reparte las tareas a demanda y recoge los resultados."""
+    resultados = {}
+    activos = comm.Get_size() - 1
+    estado = MPI.Status()
+    fallo = None
+
+    while activos:
+        # Sondeo con pausas: un recv bloqueante mantiene ocupado un núcleo
+        # completo en el rango 0 mientras los trabajadores analizan
+        while not comm.Iprobe(source=MPI.ANY_SOURCE, tag=_TAG_LISTO, status=estado):
+            time.sleep(0.005)
+        mensaje = comm.recv(source=estado.Get_source(), tag=_TAG_LISTO)
+        if mensaje is not None:
+            indice, _, error = mensaje
+            resultados[indice] = mensaje
+            if error is not None and verbose:
+                print(f"   ✗ Muestra {indice} falló (rango {estado.Get_source()})")
+
+        # Un error del productor detiene el reparto, pero los trabajadores
+        # deben recibir igualmente la orden de terminar
+        try:
+            tarea = next(tareas, None) if fallo is None else None
+        except Exception as e:
+            fallo, tarea = e, None
+        comm.send(tarea, dest=estado.Get_source(), tag=_TAG_TAREA)
+        if tarea is None:
+            activos -= 1
+
+    if fallo is not None:
+        raise fallo
+    return [resultados[i] for i in sorted(resultados)]
+
+
+def _trabajar(comm, funcion, directorio):
+    """Rangos > 0: piden tareas hasta recibir la orden de terminar."""
+    mensaje = None
+    while True:
+        comm.send(mensaje, dest=0, tag=_TAG_LISTO)
+        tarea = comm.recv(source=0, tag=_TAG_TAREA)
+        if tarea is None:
+            return
+        mensaje = evaluar_muestra(funcion, *tarea, directorio_base=directorio)
+
+
+def ejecutar_campana_mpi(funcion, bloques, directorio_scratch=None, comm=None, verbose=True):
+    """
+    Ejecuta la función sobre un flujo de bloques de argumentos con MPI.
+
+    Todos los rangos deben llamarla. El flujo de bloques solo se recorre en
+    el rango 0, de modo que puede pasarse productor_bloques(...) en todos
+    los rangos sin generar el diseño más de una vez.
+
+    Parámetros:
+    -----------
+    funcion : callable
+        Función de análisis, p. ej. pushover
+    bloques : iterable
+        Flujo de (indice_inicial, argumentos), p. ej. productor_bloques(...)
+    directorio_scratch : str, opcional
+        Directorio donde cada rango crea su directorio de trabajo (p. ej. el
+        disco local del nodo). Por defecto el directorio temporal del sistema
+    comm : mpi4py.MPI.Comm, opcional
+        Comunicador (por defecto MPI.COMM_WORLD)
+    verbose : bool
+        Si es True, el rango 0 informa el avance por bloque
+
+    Retorna:
+    --------
+    list o None : En el rango 0, [(indice, resultado, error)] ordenada por
+                  índice de muestra (como campana.ejecutar_campana); en los
+                  demás rangos, None
+    """
+    MPI = _importar_mpi()
+    comm = comm or MPI.COMM_WORLD
+    rango = comm.Get_rank()
+    directorio = tempfile.mkdtemp(prefix=f"rango_{rango}_", dir=directorio_scratch)
+
+    try:
+        if comm.Get_size() == 1:
+            # Sin trabajadores: el rango 0 evalúa en serie
+            return [evaluar_muestra(funcion, indice, argumentos, directorio_base=directorio)
+                    for indice, argumentos in _tareas(bloques, verbose)]
+        if rango == 0:
+            return _distribuir(comm, MPI, _tareas(bloques, verbose), verbose)
+        _trabajar(comm, funcion, directorio)
+        return None
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+# ============================================================================
+# EJEMPLO DE USO (CAMPAÑA DE REFERENCIA)
+# ============================================================================
+
+def _funcion_referencia(*argumentos):
+    """Carga de CPU fija por muestra, como sustituto de un pushover."""
+    total = 0.0
+    for k in range(300_000):
+        total += k % 7
+    return total + sum(argumentos)
+
+
+if __name__ == "__main__":
+
+    from mpi4py import MPI
+    from campana import productor_bloques
+
+    comm = MPI.COMM_WORLD
+    n_samples = 400
+
+    comm.Barrier()
+    inicio = time.perf_counter()
+    # Con pushover: ejecutar_campana_mpi(pushover, productor_bloques(...))
+    resultados = ejecutar_campana_mpi(_funcion_referencia,
+                                      productor_bloques(n_samples=n_samples, tam_bloque=100),
+                                      verbose=False)
+    duracion = time.perf_counter() - inicio
+
+    if comm.Get_rank() == 0:
+        fallidas = sum(error is not None for _, _, error in resultados)
+        print("="*100)
+        print(f"✓ {len(resultados)} muestras ({fallidas} fallidas) con {comm.Get_size()} rangos "
+              f"en {duracion:.2f} s → {len(resultados) / duracion:.1f} muestras/s")
+        print("="*100)
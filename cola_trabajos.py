@@ -0,0 +1,425 @@
+"""
+=============================================================================
+COLA DE TRABAJOS PARA CAMPAÑAS PUSHOVER EN VARIAS MÁQUINAS
+=============================================================================
+
+Cola de tareas respaldada por un archivo SQLite, del que toman trabajo
+cualquier número de procesos trabajadores en una o varias máquinas. El
+mismo archivo es el almacén de la campaña: cada tarea guarda sus
+argumentos, su estado y, al terminar, su resultado (JSON) o su error.
+
+Ciclo de una tarea:
+
+    pendiente ──tomar──► en_curso ──completar──► terminada / fallida
+                            │
+                            └─ lease vencido (sin latidos) ──► pendiente
+                               (o fallida tras max_intentos)
+
+- tomar: en una transacción exclusiva (BEGIN IMMEDIATE) se devuelven a la
+  cola los leases vencidos y se asigna la tarea pendiente de menor índice,
+  con un lease de `duracion_lease` segundos.
+- latido: mientras evalúa, el trabajador renueva el lease desde un hilo
+  cada duracion_lease / 3 segundos. Si el trabajador muere (o la máquina
+  se cae), el lease vence y otra máquina retoma la tarea.
+- completar: solo se acepta el resultado del dueño actual del lease, de
+  modo que un trabajador que perdió su tarea no pisa el de otro.
+
+Para varias máquinas, el archivo debe estar en un sistema de archivos
+compartido con bloqueos POSIX (NFSv4, Lustre, ...); no se usa el modo WAL
+porque requiere memoria compartida en un solo host. Los relojes de las
+máquinas deben estar sincronizados con un margen pequeño frente a la
+duración del lease. Cada transacción dura milisegundos y cada tarea
+minutos, así que la contención sobre el archivo es despreciable.
+=============================================================================
+"""
+
+import os
+import json
+import time
+import socket
+import sqlite3
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from evaluacion import evaluar_muestra
+
+
+# ============================================================================
+# SERIALIZACIÓN
+# ============================================================================
+
+def _serializar(valor):
+    """Convierte arreglos y escalares de NumPy a tipos de JSON."""
+    if isinstance(valor, np.ndarray):
+        return valor.tolist()
+    if isinstance(valor, np.generic):
+        return valor.item()
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+
+
+# ============================================================================
+# COLA SOBRE SQLITE
+# ============================================================================
+
+_ESQUEMA = ("""
+CREATE TABLE IF NOT EXISTS tareas (
+    indice      INTEGER PRIMARY KEY,
+    argumentos  TEXT NOT NULL,
+    estado      TEXT NOT NULL DEFAULT 'pendiente',
+    trabajador  TEXT,
+    vence       REAL,
+    intentos    INTEGER NOT NULL DEFAULT 0,
+    resultado   TEXT,
+    error       TEXT,
+    inicio      REAL,
+    fin         REAL
+)""",
+    "CREATE INDEX IF NOT EXISTS tareas_estado ON tareas (estado, indice)")
+
+
+class ColaTrabajos:
+    """
+    Cola de tareas y almacén de resultados de una campaña en un archivo SQLite.
+
+    El objeto solo guarda la ruta y la configuración: cada operación abre
+    su propia conexión, así que puede pasarse a otros procesos o hilos.
+    """
+
+    def __init__(self, ruta, duracion_lease=300.0, max_intentos=3):
+        """
+        Parámetros:
+        -----------
+        ruta : str
+            Archivo SQLite de la campaña (se crea si no existe)
+        duracion_lease : float
+            Segundos que una tarea queda asignada sin recibir latidos
+        max_intentos : int
+            Asignaciones de una tarea antes de marcarla como fallida cuando
+            su lease vence una y otra vez (p. ej. un modelo que mata al
+            trabajador)
+        """
+        self.ruta = ruta
+        self.duracion_lease = duracion_lease
+        self.max_intentos = max_intentos
+        with self._transaccion() as con:
+            for sentencia in _ESQUEMA:
+                con.execute(sentencia)
+
+    @contextmanager
+    def _transaccion(self):
+        """Conexión con una transacción exclusiva de escritura."""
+        con = sqlite3.connect(self.ruta, timeout=60, isolation_level=None)
+        try:
+            con.execute("BEGIN IMMEDIATE")
+            try:
+                yield con
+            except BaseException:
+                con.execute("ROLLBACK")
+                raise
+            con.execute("COMMIT")
+        finally:
+            con.close()
+
+    # ------------------------------------------------------------------------
+    # Productor
+    # ------------------------------------------------------------------------
+
+    def agregar(self, bloques):
+        """
+        Encola las muestras de un flujo de bloques.
+
+        Las muestras ya presentes se ignoran, de modo que volver a encolar la
+        misma campaña (misma semilla) no duplica ni reinicia tareas.
+
+        Parámetros:
+        -----------
+        bloques : iterable
+            Flujo de (indice_inicial, argumentos), p. ej. productor_bloques(...)
+
+        Retorna:
+        --------
+        int : Número de tareas nuevas
+        """
+        nuevas = 0
+        for inicio, argumentos in bloques:
+            filas = [(inicio + k, json.dumps([float(v) for v in fila]))
+                     for k, fila in enumerate(argumentos)]
+            with self._transaccion() as con:
+                antes = con.total_changes
+                con.executemany("INSERT OR IGNORE INTO tareas (indice, argumentos) VALUES (?, ?)",
+                                filas)
+                nuevas += con.total_changes - antes
+        return nuevas
+
+    # ------------------------------------------------------------------------
+    # Trabajador
+    # ------------------------------------------------------------------------
+
+    def _liberar_vencidas(self, con, ahora):
+        """Devuelve a la cola (o da por fallidas) las tareas con lease vencido."""
+        con.execute("UPDATE tareas SET estado = 'fallida', trabajador = NULL, fin = ?, "
+                    "error = 'Lease vencido en ' || intentos || ' intentos' "
+                    "WHERE estado = 'en_curso' AND vence < ? AND intentos >= ?",
+                    (ahora, ahora, self.max_intentos))
+        return con.execute("UPDATE tareas SET estado = 'pendiente', trabajador = NULL "
+                           "WHERE estado = 'en_curso' AND vence < ?", (ahora,)).rowcount
+
+    def liberar_vencidas(self):
+        """
+        Devuelve a la cola las tareas cuyo lease venció.
+
+        Retorna:
+        --------
+        int : Número de tareas devueltas a la cola
+        """
+        with self._transaccion() as con:
+            return self._liberar_vencidas(con, time.time())
+
+    def tomar(self, trabajador):
+        """
+        Asigna la siguiente tarea pendiente al trabajador.
+
+        Retorna:
+        --------
+        tuple o None : (indice, argumentos), o None si no hay tareas pendientes
+        """
+        with self._transaccion() as con:
+            ahora = time.time()
+            self._liberar_vencidas(con, ahora)
+            fila = con.execute("SELECT indice, argumentos FROM tareas WHERE estado = 'pendiente' "
+                               "ORDER BY indice LIMIT 1").fetchone()
+            if fila is None:
+                return None
+            con.execute("UPDATE tareas SET estado = 'en_curso', trabajador = ?, vence = ?, "
+                        "intentos = intentos + 1, inicio = ? WHERE indice = ?",
+                        (trabajador, ahora + self.duracion_lease, ahora, fila[0]))
+        return fila[0], tuple(json.loads(fila[1]))
+
+    def latido(self, indice, trabajador):
+        """
+        Renueva el lease de una tarea.
+
+        Retorna:
+        --------
+        bool : False si el trabajador ya no es dueño de la tarea
+        """
+        with self._transaccion() as con:
+            return con.execute("UPDATE tareas SET vence = ? WHERE indice = ? AND "
+                               "estado = 'en_curso' AND trabajador = ?",
+                               (time.time() + self.duracion_lease, indice, trabajador)).rowcount == 1
+
+    def completar(self, indice, trabajador, resultado, error=None):
+        """
+        Guarda el resultado (o el error) de una tarea.
+
+        Retorna:
+        --------
+        bool : False si el resultado se descartó porque el lease ya no era
+               del trabajador
+        """
+        estado = 'terminada' if error is None else 'fallida'
+        texto = None if error is not None else json.dumps(resultado, default=_serializar)
+        with self._transaccion() as con:
+            return con.execute("UPDATE tareas SET estado = ?, resultado = ?, error = ?, fin = ?, "
+                               "vence = NULL WHERE indice = ? AND estado = 'en_curso' AND "
+                               "trabajador = ?",
+                               (estado, texto, error, time.time(), indice, trabajador)).rowcount == 1
+
+    # ------------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------------
+
+    def estado(self):
+        """
+        Número de tareas por estado.
+
+        Retorna:
+        --------
+        dict : {'pendiente': n, 'en_curso': n, 'terminada': n, 'fallida': n}
+        """
+        conteo = dict.fromkeys(['pendiente', 'en_curso', 'terminada', 'fallida'], 0)
+        with self._transaccion() as con:
+            conteo.update(con.execute("SELECT estado, COUNT(*) FROM tareas GROUP BY estado"))
+        return conteo
+
+    def reencolar_fallidas(self):
+        """
+        Devuelve las tareas fallidas a la cola (p. ej. tras corregir el modelo).
+
+        Retorna:
+        --------
+        int : Número de tareas devueltas a la cola
+        """
+        with self._transaccion() as con:
+            return con.execute("UPDATE tareas SET estado = 'pendiente', intentos = 0, error = NULL, "
+                               "fin = NULL WHERE estado = 'fallida'").rowcount
+
+    def resultados(self):
+        """
+        Resultados de las tareas terminadas o fallidas.
+
+        Los arreglos de NumPy del resultado se recuperan como listas.
+
+        Retorna:
+        --------
+        list : [(indice, resultado, error)] ordenada por índice de muestra,
+               con el mismo formato que campana.ejecutar_campana
+        """
+        with self._transaccion() as con:
+            filas = con.execute("SELECT indice, resultado, error FROM tareas "
+                                "WHERE estado IN ('terminada', 'fallida') ORDER BY indice").fetchall()
+        return [(indice, None if texto is None else json.loads(texto), error)
+                for indice, texto, error in filas]
+
+
+# ============================================================================
+# TRABAJADORES
+# ============================================================================
+
+class _Latido:
+    """Hilo que renueva el lease de una tarea mientras se evalúa."""
+
+    def __init__(self, cola, indice, trabajador):
+        self.cola = cola
+        self.indice = indice
+        self.trabajador = trabajador
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._latir, daemon=True)
+
+    def _latir(self):
+        while not self._detener.wait(self.cola.duracion_lease / 3):
+            if not self.cola.latido(self.indice, self.trabajador):
+                return
+
+    def __enter__(self):
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._detener.set()
+        self._hilo.join()
+
+
+def trabajador(funcion, ruta, duracion_lease=300.0, max_intentos=3, espera=5.0,
+               max_tareas=None, verbose=True):
+    """
+    Toma y evalúa tareas de la cola hasta que no quede trabajo.
+
+    Un trabajador sin tareas pendientes sigue esperando mientras haya
+    tareas en curso en otros trabajadores, por si alguno muere y su lease
+    vence.
+
+    Parámetros:
+    -----------
+    funcion : callable
+        Función de análisis, p. ej. pushover (recibe los 14 argumentos)
+    ruta : str
+        Archivo SQLite de la campaña
+    duracion_lease : float
+        Segundos sin latido tras los que la tarea vuelve a la cola
+    max_intentos : int
+        Ver ColaTrabajos
+    espera : float
+        Segundos entre consultas cuando no hay tareas pendientes
+    max_tareas : int, opcional
+        Número máximo de tareas a evaluar antes de terminar
+    verbose : bool
+        Si es True, informa cada tarea
+
+    Retorna:
+    --------
+    int : Número de tareas evaluadas
+    """
+    cola = ColaTrabajos(ruta, duracion_lease, max_intentos)
+    nombre = f"{socket.gethostname()}:{os.getpid()}"
+    n_tareas = 0
+
+    while max_tareas is None or n_tareas < max_tareas:
+        tarea = cola.tomar(nombre)
+        if tarea is None:
+            conteo = cola.estado()
+            if conteo['pendiente'] + conteo['en_curso'] == 0:
+                break
+            time.sleep(espera)
+            continue
+
+        indice, argumentos = tarea
+        with _Latido(cola, indice, nombre):
+            _, resultado, error = evaluar_muestra(funcion, indice, argumentos)
+        aceptado = cola.completar(indice, nombre, resultado, error)
+        n_tareas += 1
+
+        if verbose:
+            if not aceptado:
+                print(f"   ✗ [{nombre}] Muestra {indice}: lease perdido, resultado descartado")
+            elif error is not None:
+                print(f"   ✗ [{nombre}] Muestra {indice} falló")
+            else:
+                print(f"   ✓ [{nombre}] Muestra {indice} completada")
+
+    return n_tareas
+
+
+def ejecutar_trabajadores(funcion, ruta, n_trabajadores=None, **opciones):
+    """
+    Lanza varios trabajadores locales sobre la misma cola.
+
+    En otras máquinas basta con ejecutar trabajador(funcion, ruta) apuntando
+    al mismo archivo en el sistema de archivos compartido.
+
+    Parámetros:
+    -----------
+    funcion : callable
+        Función de análisis a nivel de módulo (debe poder serializarse)
+    ruta : str
+        Archivo SQLite de la campaña
+    n_trabajadores : int, opcional
+        Procesos trabajadores. None usa todos los núcleos
+    **opciones
+        Argumentos de trabajador (duracion_lease, espera, verbose, ...)
+
+    Retorna:
+    --------
+    int : Número total de tareas evaluadas
+    """
+    n_trabajadores = n_trabajadores or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=n_trabajadores) as pool:
+        futuros = [pool.submit(trabajador, funcion, ruta, **opciones)
+                   for _ in range(n_trabajadores)]
+        return sum(futuro.result() for futuro in futuros)
+
+
+# ============================================================================
+# EJEMPLO DE USO
+# ============================================================================
+
+def _funcion_ejemplo(*argumentos):
+    """Función de ejemplo con el costo simulado de un análisis."""
+    time.sleep(0.05)
+    return {'suma': float(np.sum(argumentos)), 'argumentos': np.asarray(argumentos)}
+
+
+if __name__ == "__main__":
+
+    import tempfile
+    from campana import productor_bloques
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'campana.db')
+
+        # 1. Encolar la campaña (puede hacerse desde cualquier máquina)
+        cola = ColaTrabajos(ruta)
+        nuevas = cola.agregar(productor_bloques(n_samples=40, tam_bloque=10, seed=2025))
+        print(f"✓ {nuevas} tareas encoladas")
+
+        # 2. Trabajadores (aquí 4 locales; con pushover: trabajador(pushover, ruta))
+        n = ejecutar_trabajadores(_funcion_ejemplo, ruta, n_trabajadores=4,
+                                  espera=0.1, verbose=False)
+
+        # 3. Resultados desde el almacén de la campaña
+        print(f"✓ {n} tareas evaluadas: {cola.estado()}")
+        indice, resultado, error = cola.resultados()[0]
+        print(f"  Muestra {indice}: suma = {resultado['suma']:.3f}")
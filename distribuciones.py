@@ -0,0 +1,278 @@
+"""
+=============================================================================
+REGISTRO DE DISTRIBUCIONES DE LAS 14 VARIABLES ALEATORIAS
+=============================================================================
+
+Definición única de las variables aleatorias, compartida por lhs_muestreo
+(transformación de muestras) y sensibilidad (percentiles del OAT). Cada
+variable se define por su media y desviación estándar; la Gumbel se
+parametriza por momentos y las normales truncadas usan sus límites.
+
+Incluye una inversa de la CDF rápida basada en tablas de interpolación de
+alta resolución, construidas una sola vez por variable con un error máximo
+acotado y guardadas en caché:
+
+- Zona central: malla uniforme en u con acceso directo por índice (sin
+  búsqueda binaria ni evaluación de la PPF de SciPy).
+- Colas: malla uniforme en z = Φ⁻¹(u), donde la PPF es suave; solo la
+  pequeña fracción de valores en las colas paga el costo de Φ⁻¹.
+
+Objetivo de tiempo de ppf_rapida (revisado): ≈0.4 s en caliente para una
+matriz de 10⁶ × 14 en un núcleo, frente a ≈0.6 s columna a columna y
+≈2.7 s con np.interp. El objetivo inicial de unos pocos milisegundos no es
+alcanzable con NumPy: una sola pasada elemento a elemento sobre la matriz
+ya toma ≈40 ms y la interpolación necesita unas diez, más los dos accesos
+por índice a las tablas.
+=============================================================================
+"""
+
+from functools import lru_cache
+import numpy as np
+from scipy.stats import norm, gumbel_r, truncnorm
+from scipy.special import ndtr, ndtri
+
+
+# ============================================================================
+# DEFINICIÓN DE VARIABLES ALEATORIAS (ORDEN DE COLUMNAS LHS)
+# ============================================================================
+
+variables_base = {
+    1: {'nombre': 'Carga muerta de entrepiso', 'unidad': 'kN/m²', 'distribucion': 'Normal',
+        'media': 6.03, 'desviacion_estandar': 0.63},
+    2: {'nombre': 'Carga muerta de cubierta', 'unidad': 'kN/m²', 'distribucion': 'Normal',
+        'media': 0.21, 'desviacion_estandar': 0.02},
+    3: {'nombre': 'Carga viva', 'unidad': 'kN/m²', 'distribucion': 'Gumbel',
+        'media': 1.75, 'desviacion_estandar': 0.46},
+    4: {'nombre': 'fc vigas', 'unidad': 'MPa', 'distribucion': 'Normal',
+        'media': 25.2, 'desviacion_estandar': 4.54},
+    5: {'nombre': 'fc columnas', 'unidad': 'MPa', 'distribucion': 'Normal',
+        'media': 34.0, 'desviacion_estandar': 6.05},
+    6: {'nombre': 'Fy acero', 'unidad': 'MPa', 'distribucion': 'Normal',
+        'media': 453.6, 'desviacion_estandar': 40.82},
+    7: {'nombre': 'Fu acero', 'unidad': 'MPa', 'distribucion': 'Normal',
+        'media': 683.64, 'desviacion_estandar': 27.35},
+    8: {'nombre': 'Ec concreto', 'unidad': 'GPa', 'distribucion': 'Normal',
+        'media': 23.59, 'desviacion_estandar': 4.25},
+    9: {'nombre': 'Es acero', 'unidad': 'GPa', 'distribucion': 'Normal',
+        'media': 200.0, 'desviacion_estandar': 8.0},
+    10: {'nombre': 'Ancho viga', 'unidad': 'm', 'distribucion': 'Normal truncada',
+        'media': 0.303, 'desviacion_estandar': 0.009,
+        'limite_inferior': 0.29, 'limite_superior': 0.315},
+    11: {'nombre': 'Alto viga', 'unidad': 'm', 'distribucion': 'Normal truncada',
+        'media': 0.396, 'desviacion_estandar': 0.012,
+        'limite_inferior': 0.39, 'limite_superior': 0.415},
+    12: {'nombre': 'Ancho columna', 'unidad': 'm', 'distribucion': 'Normal truncada',
+        'media': 0.404, 'desviacion_estandar': 0.016,
+        'limite_inferior': 0.39, 'limite_superior': 0.415},
+    13: {'nombre': 'Alto columna', 'unidad': 'm', 'distribucion': 'Normal truncada',
+        'media': 0.404, 'desviacion_estandar': 0.016,
+        'limite_inferior': 0.39, 'limite_superior': 0.415},
+    14: {'nombre': 'Recubrimiento', 'unidad': 'mm', 'distribucion': 'Normal',
+        'media': 34.67, 'desviacion_estandar': 1.65},
+}
+
+
+def distribucion_congelada(info):
+    """
+    Construye la distribución de SciPy (congelada) de una variable.
+
+    Parámetros:
+    -----------
+    info : dict
+        Definición con 'distribucion', 'media', 'desviacion_estandar' y,
+        para la normal truncada, 'limite_inferior' y 'limite_superior'
+
+    Retorna:
+    --------
+    scipy.stats.rv_frozen
+    """
+    media = info['media']
+    desv_est = info['desviacion_estandar']
+    distribucion = info['distribucion']
+
+    if distribucion == 'Normal':
+        return norm(loc=media, scale=desv_est)
+
+    elif distribucion == 'Gumbel':
+        # Ajuste por momentos:
+        # media = loc + gamma * scale (gamma ≈ 0.5772, constante de Euler-Mascheroni)
+        # desv_est = scale * pi / sqrt(6)
+        scale = desv_est * np.sqrt(6) / np.pi
+        loc = media - np.euler_gamma * scale
+        return gumbel_r(loc=loc, scale=scale)
+
+    elif distribucion == 'Normal truncada':
+        inferior = info.get('limite_inferior', -np.inf)
+        superior = info.get('limite_superior', np.inf)
+        return truncnorm(a=(inferior - media) / desv_est, b=(superior - media) / desv_est,
+                         loc=media, scale=desv_est)
+
+    raise ValueError(f"Distribución no soportada: {distribucion}")
+
+
+# Distribuciones congeladas por id de variable (1..14 = columnas LHS 0..13)
+DISTRIBUCIONES = {var_id: distribucion_congelada(info) for var_id, info in variables_base.items()}
+
+
+# ============================================================================
+# INVERSA DE LA CDF TABULADA
+# ============================================================================
+
+class TablaInversaCDF:
+    """
+    Inversa de la CDF por interpolación lineal en tablas precalculadas.
+
+    El error se estima en el punto medio de cada celda contra la PPF exacta
+    y las mallas se refinan hasta quedar por debajo de la tolerancia.
+    """
+
+    def __init__(self, dist, tolerancia=1e-6, n_celdas=2**14, z_max=8.3):
+        """
+        Parámetros:
+        -----------
+        dist : scipy.stats.rv_frozen
+            Distribución a invertir
+        tolerancia : float
+            Error máximo admitido, en múltiplos de la desviación estándar
+        n_celdas : int
+            Celdas de la malla uniforme en u de la zona central
+        z_max : float
+            Extremo de la malla en z de las colas (Φ(-8.3) ≈ 5e-17)
+        """
+        tol = tolerancia * dist.std()
+
+        # Colas: malla en z refinada hasta cumplir la tolerancia
+        m = 1024
+        while True:
+            z = np.linspace(-z_max, z_max, m + 1)
+            x = self._ppf_z(dist, z)
+            medio = self._ppf_z(dist, (z[:-1] + z[1:]) / 2)
+            error_cola = np.max(np.abs(medio - (x[:-1] + x[1:]) / 2))
+            if error_cola <= tol or m >= 2**20:
+                break
+            m *= 2
+        self._z0 = -z_max
+        self._inv_dz = m / (2 * z_max)
+        self._x_z = x
+
+        # Zona central: celdas en u cuyo error en el punto medio es admisible
+        u = np.arange(n_celdas + 1) / n_celdas
+        x = dist.ppf(u)
+        with np.errstate(invalid='ignore'):
+            error = np.abs(dist.ppf((u[:-1] + u[1:]) / 2) - (x[:-1] + x[1:]) / 2)
+        malas = np.flatnonzero(~(error <= tol))
+        centro = n_celdas // 2
+        self._i_inf = malas[malas < centro].max() + 1 if np.any(malas < centro) else 0
+        self._i_sup = malas[malas >= centro].min() - 1 if np.any(malas >= centro) else n_celdas - 1
+        self._n_celdas = n_celdas
+        self._x_u = x
+
+        self.error_maximo = max(error_cola, error[self._i_inf:self._i_sup + 1].max())
+
+    @staticmethod
+    def _ppf_z(dist, z):
+        """PPF en u = Φ(z), usando la ISF en la cola superior para no perder precisión."""
+        return np.where(z < 0, dist.ppf(ndtr(z)), dist.isf(ndtr(-z)))
+
+    def _colas(self, u):
+        """Interpolación en la malla en z para valores fuera de la zona central."""
+        t = np.clip((ndtri(u) - self._z0) * self._inv_dz, 0, len(self._x_z) - 1)
+        i = np.minimum(t.astype(np.intp), len(self._x_z) - 2)
+        w = np.clip(t - i, 0.0, 1.0)
+        return self._x_z[i] + w * (self._x_z[i + 1] - self._x_z[i])
+
+    def __call__(self, u):
+        """Evalúa la PPF aproximada en u (array-like en [0, 1])."""
+        u = np.asarray(u, dtype=np.float64)
+        t = u * self._n_celdas
+        i = t.astype(np.intp)
+        central = (i >= self._i_inf) & (i <= self._i_sup)
+
+        i = np.clip(i, self._i_inf, self._i_sup)
+        x = self._x_u[i] + (t - i) * (self._x_u[i + 1] - self._x_u[i])
+        if not central.all():
+            x[~central] = self._colas(u[~central])
+        return x
+
+
+@lru_cache(maxsize=None)
+def tabla_inversa(var_id, tolerancia=1e-6):
+    """Tabla de la inversa de la CDF de una variable del registro (en caché)."""
+    return TablaInversaCDF(DISTRIBUCIONES[var_id], tolerancia)
+
+
+@lru_cache(maxsize=None)
+def _tablas_fusionadas(tolerancia):
+    """
+    Tablas centrales de las 14 variables concatenadas en un solo arreglo,
+    para resolver todas las columnas con un único acceso por índice.
+
+    Se guarda el valor en cada nodo (float64, por la precisión de variables
+    como Es con media ≫ desviación) y la pendiente de cada celda (float32,
+    cuyo error relativo se multiplica por el ancho de la celda).
+    """
+    tablas = [tabla_inversa(var_id, tolerancia) for var_id in sorted(DISTRIBUCIONES)]
+    n_celdas = tablas[0]._n_celdas
+    with np.errstate(invalid='ignore'):
+        pendientes = np.concatenate([np.diff(t._x_u) for t in tablas]).astype(np.float32)
+    return {
+        'tablas': tablas,
+        'n_celdas': n_celdas,
+        'valores': np.concatenate([t._x_u[:-1] for t in tablas]),
+        'pendientes': pendientes,
+        'desplazamiento': np.arange(len(tablas), dtype=np.intp) * n_celdas,
+        'i_inf': np.array([t._i_inf for t in tablas], dtype=np.intp),
+        'i_sup': np.array([t._i_sup for t in tablas], dtype=np.intp),
+    }
+
+
+def ppf_rapida(uniform_matrix, tolerancia=1e-6, filas_bloque=4096):
+    """
+    Transforma una matriz uniforme (n, 14) a las 14 variables con las
+    tablas de inversa de la CDF (columna j = variable j + 1).
+
+    Todas las columnas se resuelven a la vez con un único acceso por índice
+    a las tablas fusionadas, escribiendo en una salida C-contigua
+    preasignada; solo los valores en las colas (≈2.5 %) se corrigen por
+    columna. Se recorre por bloques de filas para que los temporales queden
+    en caché (ver el objetivo de tiempo en la cabecera del módulo).
+
+    Parámetros:
+    -----------
+    uniform_matrix : np.ndarray
+        Matriz de forma (n, 14) con valores en [0, 1]
+    tolerancia : float
+        Error máximo admitido, en múltiplos de la desviación estándar
+    filas_bloque : int
+        Filas procesadas por bloque
+
+    Retorna:
+    --------
+    np.ndarray : Matriz de forma (n, 14) en las unidades de cada variable
+    """
+    f = _tablas_fusionadas(tolerancia)
+    u = np.asarray(uniform_matrix, dtype=np.float64)
+    x = np.empty(u.shape)
+    d = u.shape[1]
+
+    colas = []
+    for k in range(0, len(u), filas_bloque):
+        # Índice de celda acotado a la zona central de cada columna; w = t - i
+        # queda fuera de [0, 1] justamente en los valores de las colas
+        w = np.multiply(u[k:k + filas_bloque], f['n_celdas'])
+        i = w.astype(np.intp)
+        np.clip(i, f['i_inf'], f['i_sup'], out=i)
+        w -= i
+        i += f['desplazamiento']
+
+        np.take(f['valores'], i, out=x[k:k + filas_bloque])
+        pendiente = np.take(f['pendientes'], i)
+        pendiente *= w          # En float32: error relativo acotado por el de la pendiente
+        x[k:k + filas_bloque] += pendiente
+        colas.append(np.flatnonzero((w < 0) | (w > 1)) + k * d)
+
+    filas, cols = np.divmod(np.concatenate(colas), d)
+    for j in np.unique(cols):
+        sel = cols == j
+        x[filas[sel], j] = f['tablas'][j]._colas(u[filas[sel], j])
+    return x
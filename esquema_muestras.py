@@ -0,0 +1,122 @@
+"""
+=============================================================================
+ESQUEMA DE MUESTRAS: COLUMNAS LHS → ARGUMENTOS DE pushover
+=============================================================================
+
+El muestreo trabaja en las unidades de las distribuciones (MPa, GPa, mm,
+kN/m²) y en el orden de lhs_muestreo (cargas primero, luego f'c, fy, ...).
+La función pushover espera sus 14 argumentos en otro orden y en unidades
+del modelo (kN, m): esfuerzos y módulos en kN/m² y longitudes en m.
+
+Este módulo guarda para cada argumento su nombre, la columna LHS de la que
+sale, las unidades de origen y destino y un rango de plausibilidad. La
+conversión de una matriz completa se hace en una sola pasada vectorizada y
+el resultado es un arreglo estructurado que comparte memoria con la matriz
+de argumentos (sin copias por muestra).
+=============================================================================
+"""
+
+import numpy as np
+
+
+# Factores de conversión (unidad de muestreo, unidad del modelo)
+FACTORES_UNIDAD = {
+    ('MPa', 'kN/m²'): 1e3,
+    ('GPa', 'kN/m²'): 1e6,
+    ('mm', 'm'): 1e-3,
+    ('m', 'm'): 1.0,
+    ('kN/m²', 'kN/m²'): 1.0,
+}
+
+# Un registro por argumento de pushover, en el orden de su firma.
+# 'rango' es el intervalo plausible en unidades del modelo.
+ESQUEMA_PUSHOVER = [
+    {'argumento': 'Vfy', 'nombre': 'Fy acero', 'columna_lhs': 5,
+     'unidad_muestra': 'MPa', 'unidad_modelo': 'kN/m²', 'rango': (2.0e5, 8.0e5)},
+    {'argumento': 'VEs', 'nombre': 'Es acero', 'columna_lhs': 8,
+     'unidad_muestra': 'GPa', 'unidad_modelo': 'kN/m²', 'rango': (1.5e8, 2.5e8)},
+    {'argumento': 'Vfc_vigas', 'nombre': 'fc vigas', 'columna_lhs': 3,
+     'unidad_muestra': 'MPa', 'unidad_modelo': 'kN/m²', 'rango': (5.0e3, 6.0e4)},
+    {'argumento': 'VEc_vigas', 'nombre': 'Ec vigas', 'columna_lhs': 7,
+     'unidad_muestra': 'GPa', 'unidad_modelo': 'kN/m²', 'rango': (5.0e6, 5.0e7)},
+    {'argumento': 'Vfc_columnas', 'nombre': 'fc columnas', 'columna_lhs': 4,
+     'unidad_muestra': 'MPa', 'unidad_modelo': 'kN/m²', 'rango': (5.0e3, 6.0e4)},
+    {'argumento': 'VEc_columnas', 'nombre': 'Ec columnas', 'columna_lhs': 7,
+     'unidad_muestra': 'GPa', 'unidad_modelo': 'kN/m²', 'rango': (5.0e6, 5.0e7)},
+    {'argumento': 'Vb1', 'nombre': 'Ancho viga', 'columna_lhs': 9,
+     'unidad_muestra': 'm', 'unidad_modelo': 'm', 'rango': (0.1, 1.0)},
+    {'argumento': 'Vh1', 'nombre': 'Alto viga', 'columna_lhs': 10,
+     'unidad_muestra': 'm', 'unidad_modelo': 'm', 'rango': (0.1, 1.5)},
+    {'argumento': 'Vb2', 'nombre': 'Ancho columna', 'columna_lhs': 11,
+     'unidad_muestra': 'm', 'unidad_modelo': 'm', 'rango': (0.1, 1.5)},
+    {'argumento': 'Vh2', 'nombre': 'Alto columna', 'columna_lhs': 12,
+     'unidad_muestra': 'm', 'unidad_modelo': 'm', 'rango': (0.1, 1.5)},
+    {'argumento': 'Vrec', 'nombre': 'Recubrimiento', 'columna_lhs': 13,
+     'unidad_muestra': 'mm', 'unidad_modelo': 'm', 'rango': (0.01, 0.1)},
+    {'argumento': 'VWentrepiso', 'nombre': 'Carga muerta de entrepiso', 'columna_lhs': 0,
+     'unidad_muestra': 'kN/m²', 'unidad_modelo': 'kN/m²', 'rango': (0.0, 20.0)},
+    {'argumento': 'VWcubierta', 'nombre': 'Carga muerta de cubierta', 'columna_lhs': 1,
+     'unidad_muestra': 'kN/m²', 'unidad_modelo': 'kN/m²', 'rango': (0.0, 5.0)},
+    {'argumento': 'VWviva', 'nombre': 'Carga viva', 'columna_lhs': 2,
+     'unidad_muestra': 'kN/m²', 'unidad_modelo': 'kN/m²', 'rango': (0.0, 10.0)},
+]
+
+# Vectores derivados del esquema
+ARGUMENTOS_PUSHOVER = [c['argumento'] for c in ESQUEMA_PUSHOVER]
+COLUMNAS_PUSHOVER = [c['columna_lhs'] for c in ESQUEMA_PUSHOVER]
+FACTORES_PUSHOVER = np.array([FACTORES_UNIDAD[(c['unidad_muestra'], c['unidad_modelo'])]
+                              for c in ESQUEMA_PUSHOVER])
+RANGOS_PUSHOVER = np.array([c['rango'] for c in ESQUEMA_PUSHOVER])
+DTYPE_PUSHOVER = np.dtype([(nombre, np.float64) for nombre in ARGUMENTOS_PUSHOVER])
+
+
+def validar_argumentos(argumentos):
+    """
+    Verifica en bloque que cada argumento esté en su rango plausible en
+    unidades del modelo. Un error de unidades (p. ej. recubrimiento en mm
+    en vez de m) queda fuera de rango y se detecta antes de la campaña.
+
+    Parámetros:
+    -----------
+    argumentos : np.ndarray
+        Matriz (n, 14) en el orden y unidades de pushover
+    """
+    fuera = (argumentos < RANGOS_PUSHOVER[:, 0]) | (argumentos > RANGOS_PUSHOVER[:, 1])
+    fuera |= ~np.isfinite(argumentos)
+    if fuera.any():
+        conteo = fuera.sum(axis=0)
+        detalle = ", ".join(f"{ARGUMENTOS_PUSHOVER[j]} ({conteo[j]} muestras, "
+                            f"rango {RANGOS_PUSHOVER[j, 0]:g}–{RANGOS_PUSHOVER[j, 1]:g} "
+                            f"{ESQUEMA_PUSHOVER[j]['unidad_modelo']})"
+                            for j in np.flatnonzero(conteo))
+        raise ValueError(f"Argumentos fuera de rango: {detalle}")
+    return argumentos
+
+
+def convertir_a_argumentos(samples, validar=True):
+    """
+    Convierte una matriz LHS (n, 14) a argumentos de pushover en una pasada.
+
+    Parámetros:
+    -----------
+    samples : np.ndarray
+        Matriz de muestras en el orden y unidades de lhs_muestreo
+    validar : bool
+        Si es True, verifica los rangos plausibles (validar_argumentos)
+
+    Retorna:
+    --------
+    np.ndarray : Arreglo estructurado de forma (n,) con un campo por
+                 argumento (DTYPE_PUSHOVER), vista de la matriz de argumentos
+    """
+    samples = np.asarray(samples, dtype=np.float64)
+    argumentos = np.take(samples, COLUMNAS_PUSHOVER, axis=1)
+    argumentos *= FACTORES_PUSHOVER
+    if validar:
+        validar_argumentos(argumentos)
+    return argumentos.view(DTYPE_PUSHOVER).reshape(len(argumentos))
+
+
+def a_matriz(argumentos):
+    """Vista (n, 14) de float64 de un arreglo estructurado, sin copia."""
+    return argumentos.view(np.float64).reshape(len(argumentos), len(ARGUMENTOS_PUSHOVER))
@@ -0,0 +1,225 @@
+"""
+=============================================================================
+EVALUACIÓN DE LA FUNCIÓN DE ANÁLISIS EN MUESTRAS Y PUNTOS
+=============================================================================
+
+Utilidades comunes a las campañas (campana, cola_trabajos, campana_mpi) y
+a los análisis de sensibilidad (OAT, Morris, Sobol'), sin dependencias del
+muestreo LHS:
+
+- evaluar_muestra: una muestra en su propio directorio de trabajo, con el
+  error capturado como traceback.
+- evaluar_puntos / evaluar_salidas: listas de puntos ya construidos, en
+  serie o en un pool de procesos.
+- evaluador_lote / funcion_lote: funciones que reciben todos los puntos en
+  una sola llamada.
+=============================================================================
+"""
+
+import os
+import tempfile
+import traceback
+import multiprocessing
+import numpy as np
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+
+
+# ============================================================================
+# EVALUACIÓN DE UNA MUESTRA
+# ============================================================================
+
+def evaluar_muestra(funcion, indice, argumentos, directorio_base=None, directorio_salida=None):
+    """
+    Evalúa una muestra en un directorio propio, para que los archivos de los
+    recorders de tareas concurrentes no se pisen.
+
+    Por defecto el directorio es temporal y se borra al terminar: de la
+    muestra solo queda lo que retorna la función (p. ej. el diccionario de
+    pushover), no los archivos de los recorders.
+
+    Parámetros:
+    -----------
+    funcion : callable
+        Función de análisis
+    indice : int
+        Índice de la muestra
+    argumentos : tuple
+        Argumentos posicionales de la función
+    directorio_base : str, opcional
+        Dónde se crean los directorios temporales (por defecto el directorio
+        temporal del sistema)
+    directorio_salida : str, opcional
+        Si se indica, la muestra se evalúa en directorio_salida/muestra_{indice},
+        que se conserva con los archivos de los recorders
+
+    Retorna:
+    --------
+    tuple : (indice, resultado, error), con error como traceback en texto o None
+    """
+    if directorio_salida is not None:
+        directorio = os.path.join(directorio_salida, f"muestra_{indice}")
+        os.makedirs(directorio, exist_ok=True)
+        return _evaluar_en_directorio(funcion, indice, argumentos, directorio)
+    with tempfile.TemporaryDirectory(prefix=f"muestra_{indice}_", dir=directorio_base) as directorio:
+        return _evaluar_en_directorio(funcion, indice, argumentos, directorio)
+
+
+def _evaluar_en_directorio(funcion, indice, argumentos, directorio):
+    """Evalúa la función con `directorio` como directorio de trabajo."""
+    directorio_original = os.getcwd()
+    os.chdir(directorio)
+    try:
+        return indice, funcion(*argumentos), None
+    except Exception:
+        return indice, None, traceback.format_exc()
+    finally:
+        os.chdir(directorio_original)
+
+
+def contexto_procesos(precargar=()):
+    """
+    Contexto de multiprocessing para los pools y procesos de las campañas.
+
+    Se evita fork: el proceso principal tiene en marcha el hilo de
+    productor_bloques, y un hijo creado con fork puede heredar un lock
+    tomado por ese hilo y quedar bloqueado. Se usa forkserver donde existe
+    y spawn en el resto (Windows). En ambos casos la función de análisis
+    debe poder serializarse (definida a nivel de módulo).
+
+    Parámetros:
+    -----------
+    precargar : sequence of str
+        Módulos que el servidor de forkserver importa una sola vez, en
+        lugar de importarlos cada proceso hijo (≈1 s por proceso si
+        arrastran SciPy). Solo tiene efecto antes del primer proceso
+
+    Retorna:
+    --------
+    multiprocessing.context.BaseContext : Contexto forkserver o spawn
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    contexto = multiprocessing.get_context('forkserver')
+    if precargar:
+        contexto.set_forkserver_preload(['__main__', *precargar])
+    return contexto
+
+
+# ============================================================================
+# EVALUACIÓN DE LISTAS DE PUNTOS
+# ============================================================================
+
+def evaluador_lote(funcion):
+    """
+    Decorador que declara que la función evalúa un lote de puntos de una vez.
+
+    La función recibe una matriz (m, n) con un punto por fila y devuelve m
+    salidas: un vector (m,), una matriz (m, k) o una lista de m diccionarios.
+
+    Ejemplo:
+    --------
+    @evaluador_lote
+    def modelo_lineal(X):
+        return X @ coeficientes
+    """
+    funcion.acepta_lote = True
+    return funcion
+
+
+def funcion_lote(funcion):
+    """
+    Versión por lotes de la función (matriz (m, n) → m salidas), o None si
+    solo se puede evaluar punto a punto.
+    """
+    if getattr(funcion, 'acepta_lote', False):
+        return funcion
+    if callable(getattr(funcion, 'evaluar_lote', None)):
+        return funcion.evaluar_lote
+    return None
+
+
+def _evaluar_punto(funcion, argumentos):
+    """Evalúa un punto en el proceso actual: (resultado, error)."""
+    try:
+        return funcion(*argumentos), None
+    except Exception:
+        return None, traceback.format_exc()
+
+
+def evaluar_puntos(funcion, puntos, n_procesos=1):
+    """
+    Evalúa la función en una lista de puntos, en serie o en un pool.
+
+    Un fallo queda registrado en su posición sin detener el resto. En serie
+    la función se llama directamente en el proceso y directorio actuales;
+    en el pool cada punto se evalúa con evaluar_muestra en su propio
+    directorio temporal, por los recorders de tareas concurrentes. Si la
+    función es un
+    evaluador por lotes (ver evaluador_lote), se hace una sola llamada con
+    todos los puntos en el proceso actual; si esa llamada falla, todos los
+    puntos quedan con el mismo error.
+
+    Parámetros:
+    -----------
+    funcion : callable
+        Función Y = f(X1, ..., Xn). Con n_procesos > 1 debe poder
+        serializarse (definida a nivel de módulo)
+    puntos : array-like (n_puntos, n_variables)
+        Puntos a evaluar
+    n_procesos : int, opcional
+        Procesos del pool. 1 evalúa en serie; None usa todos los núcleos
+
+    Retorna:
+    --------
+    list : [(resultado, error)] en el orden de los puntos; error es el
+           traceback como texto, o None si la evaluación terminó bien
+    """
+    lote = funcion_lote(funcion)
+    if lote is not None:
+        X = np.atleast_2d(np.asarray(puntos, dtype=np.float64))
+        try:
+            resultados = lote(X)
+            if len(resultados) != len(X):
+                raise ValueError(f"El evaluador por lotes devolvió {len(resultados)} salidas "
+                                 f"para {len(X)} puntos")
+        except Exception:
+            return [(None, traceback.format_exc())] * len(X)
+        return [(resultado, None) for resultado in resultados]
+
+    puntos = [tuple(p) for p in np.atleast_2d(np.asarray(puntos, dtype=np.float64))]
+    n_procesos = n_procesos or os.cpu_count() or 1
+
+    if n_procesos == 1 or len(puntos) == 1:
+        return [_evaluar_punto(funcion, p) for p in puntos]
+
+    with ProcessPoolExecutor(max_workers=min(n_procesos, len(puntos)),
+                             mp_context=contexto_procesos()) as pool:
+        salidas = list(pool.map(evaluar_muestra, repeat(funcion), range(len(puntos)), puntos))
+    return [(resultado, error) for _, resultado, error in salidas]
+
+
+def evaluar_salidas(funcion, puntos, n_procesos=1):
+    """
+    Salida escalar de la función en cada punto, con NaN donde falló.
+
+    Los evaluadores por lotes (@evaluador_lote, o sustitutos con método
+    evaluar_lote como sensibilidad_sobol.SuperficieRespuesta) se evalúan
+    en una sola llamada.
+
+    Parámetros:
+    -----------
+    funcion : callable
+        Función Y = f(X1, ..., Xn) con salida escalar
+    puntos : array-like (n_puntos, n_variables)
+        Puntos a evaluar
+    n_procesos : int, opcional
+        Procesos del pool (ver evaluar_puntos)
+
+    Retorna:
+    --------
+    np.ndarray : Salidas de forma (n_puntos,)
+    """
+    salidas = evaluar_puntos(funcion, puntos, n_procesos)
+    return np.array([np.nan if error is not None else resultado for resultado, error in salidas],
+                    dtype=np.float64)
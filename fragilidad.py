@@ -0,0 +1,285 @@
+"""
+=============================================================================
+CURVAS DE FRAGILIDAD LOGNORMALES CON BANDAS DE CONFIANZA POR BOOTSTRAP
+=============================================================================
+
+Ajuste por máxima verosimilitud (MLE) de curvas de fragilidad lognormales
+P(DS >= ds | IM) = Φ(ln(IM/θ) / β) para cada estado de daño, a partir de
+los resultados de la campaña LHS:
+
+1. Capacidades por muestra (IM que lleva a cada estado de daño): el MLE
+   lognormal es cerrado (media y desviación de ln C).
+2. Demandas por muestra en varios niveles de intensidad: MLE binomial
+   (regresión probit sobre ln IM), resuelto con Fisher scoring vectorizado
+   sobre estados de daño y réplicas, sin optimizadores por estado.
+
+Las bandas de confianza se obtienen por bootstrap. Cada réplica tiene su
+propia semilla (SeedSequence.spawn), de modo que el resultado no depende
+del número de procesos ni del tamaño de bloque. Las réplicas se reparten
+en bloques entre un pool de procesos y, dentro de cada bloque, todos los
+reajustes se hacen de una sola vez con NumPy.
+
+Requisitos: NumPy >= 1.20, SciPy >= 1.7
+=============================================================================
+"""
+
+import os
+import numpy as np
+from scipy.stats import norm
+from scipy.special import ndtr, ndtri
+from concurrent.futures import ProcessPoolExecutor
+
+
+# ============================================================================
+# AJUSTE MLE
+# ============================================================================
+
+def ajustar_fragilidad_capacidades(capacidades):
+    """
+    Ajusta θ y β por MLE a partir de capacidades por muestra.
+
+    Parámetros:
+    -----------
+    capacidades : array-like (..., n_muestras, n_estados)
+        Intensidad que lleva cada muestra a cada estado de daño (> 0)
+
+    Retorna:
+    --------
+    tuple : (theta, beta) de forma (..., n_estados)
+    """
+    lnC = np.log(np.asarray(capacidades, dtype=np.float64))
+    theta = np.exp(lnC.mean(axis=-2))
+    beta = lnC.std(axis=-2)
+    return theta, beta
+
+
+def conteos_excedencia(demandas, umbrales):
+    """
+    Cuenta las muestras cuya demanda alcanza cada umbral de daño.
+
+    Parámetros:
+    -----------
+    demandas : array-like (..., n_muestras, n_im)
+        Demanda (p. ej. deriva) de cada muestra en cada nivel de intensidad
+    umbrales : array-like (n_estados,)
+        Umbral de demanda de cada estado de daño
+
+    Retorna:
+    --------
+    np.ndarray : conteos de forma (..., n_estados, n_im)
+    """
+    demandas = np.asarray(demandas, dtype=np.float64)
+    umbrales = np.asarray(umbrales, dtype=np.float64)
+    excede = demandas[..., None, :, :] >= umbrales[:, None, None]
+    return excede.sum(axis=-2)
+
+
+def ajustar_fragilidad_conteos(im, n_excede, n_total, max_iter=50, tol=1e-10, separados='error'):
+    """
+    Ajusta θ y β por MLE binomial (probit sobre ln IM).
+
+    Resuelve todas las curvas a la vez con Fisher scoring: cada iteración
+    forma y resuelve analíticamente el sistema 2×2 de cada estado de daño.
+
+    Si los conteos de una curva están separados (pasan de 0 a n_total con a
+    lo sumo un nivel de excedencia parcial, o no cambian), el MLE no existe:
+    β tiende a 0 y el sistema de Fisher se vuelve singular.
+
+    Parámetros:
+    -----------
+    im : array-like (n_im,)
+        Niveles de intensidad (> 0)
+    n_excede : array-like (..., n_estados, n_im)
+        Número de muestras que alcanzan el estado en cada nivel
+    n_total : int o array-like (n_im,)
+        Número de muestras evaluadas en cada nivel
+    max_iter : int
+        Máximo de iteraciones de Fisher scoring
+    tol : float
+        Tolerancia sobre el cambio de los parámetros
+    separados : str
+        'error' lanza ValueError si alguna curva tiene datos separados;
+        'nan' devuelve NaN en esas curvas (réplicas bootstrap)
+
+    Retorna:
+    --------
+    tuple : (theta, beta) de forma (..., n_estados)
+    """
+    if separados not in ('error', 'nan'):
+        raise ValueError(f"Opción separados desconocida: {separados}")
+    z = np.log(np.asarray(im, dtype=np.float64))
+    k = np.asarray(n_excede, dtype=np.float64)
+    N = np.broadcast_to(np.asarray(n_total, dtype=np.float64), k.shape)
+
+    # Punto inicial: mínimos cuadrados de Φ⁻¹(fracción empírica) sobre ln IM
+    p_emp = np.clip(k / N, 0.5 / N, 1 - 0.5 / N)
+    y = ndtri(p_emp)
+    z_med = z.mean()
+    b = ((y - y.mean(axis=-1, keepdims=True)) * (z - z_med)).sum(axis=-1) / ((z - z_med)**2).sum()
+    b = np.maximum(b, 1e-3)
+    a = y.mean(axis=-1) - b * z_med
+    singular = np.zeros(np.shape(a), dtype=bool)   # Curvas con sistema de Fisher singular
+
+    for _ in range(max_iter):
+        eta = a[..., None] + b[..., None] * z
+        p = np.clip(ndtr(eta), 1e-12, 1 - 1e-12)
+        phi = norm.pdf(eta)
+
+        s = phi * (k - N * p) / (p * (1 - p))       # Gradiente respecto a η
+        w = N * phi**2 / (p * (1 - p))              # Información de Fisher
+
+        I00, I01, I11 = w.sum(-1), (w * z).sum(-1), (w * z**2).sum(-1)
+        g0, g1 = s.sum(-1), (s * z).sum(-1)
+        det = I00 * I11 - I01**2
+
+        # Las curvas singulares quedan fijas, sin propagar NaN a las demás
+        singular |= ~(det > 1e-12 * I00 * I11) | ~np.isfinite(det)
+        det = np.where(singular, 1.0, det)
+        da = np.where(singular, 0.0, (I11 * g0 - I01 * g1) / det)
+        db = np.where(singular, 0.0, (I00 * g1 - I01 * g0) / det)
+        a, b = a + da, b + db
+
+        if np.max(np.abs(np.concatenate([np.ravel(da), np.ravel(db)]))) < tol:
+            break
+
+    separada = singular | ~np.isfinite(a) | ~np.isfinite(b) | ~(b > 0)
+    if np.any(separada):
+        if separados == 'error':
+            curva = f" (la primera en el índice {tuple(int(i) for i in np.argwhere(separada)[0])})" \
+                if separada.ndim else ""
+            raise ValueError(f"Conteos separados en {int(separada.sum())} curva(s){curva}: pasan de 0 a "
+                             f"n_total con a lo sumo un nivel de excedencia parcial, o no cambian, y el MLE "
+                             f"de β no existe (β → 0). Agregar niveles de intensidad intermedios o más muestras")
+        a, b = np.where(separada, np.nan, a), np.where(separada, np.nan, b)
+
+    theta = np.exp(-a / b)
+    beta = 1 / b
+    return theta, beta
+
+
+def probabilidad_excedencia(im, theta, beta):
+    """
+    Evalúa las curvas de fragilidad.
+
+    Parámetros:
+    -----------
+    im : array-like (n_im,)
+        Niveles de intensidad donde evaluar
+    theta, beta : array-like (..., n_estados)
+        Mediana y dispersión de cada curva
+
+    Retorna:
+    --------
+    np.ndarray : probabilidades de forma (..., n_estados, n_im)
+    """
+    im = np.asarray(im, dtype=np.float64)
+    theta = np.asarray(theta, dtype=np.float64)[..., None]
+    beta = np.asarray(beta, dtype=np.float64)[..., None]
+    return ndtr(np.log(im / theta) / beta)
+
+
+# ============================================================================
+# BOOTSTRAP EN PARALELO
+# ============================================================================
+
+def _ajustar(datos, metodo, im, umbrales, separados='error'):
+    """Ajusta un lote de conjuntos de datos (..., n_muestras, n_columnas)."""
+    if metodo == 'capacidades':
+        return ajustar_fragilidad_capacidades(datos)
+    n_excede = conteos_excedencia(datos, umbrales)
+    return ajustar_fragilidad_conteos(im, n_excede, datos.shape[-2], separados=separados)
+
+
+def _bloque_bootstrap(args):
+    """Reajusta un bloque de réplicas; cada réplica usa su propia semilla."""
+    datos, metodo, im, umbrales, semillas = args
+    n = datos.shape[0]
+
+    indices = np.empty((len(semillas), n), dtype=np.intp)
+    for r, semilla in enumerate(semillas):
+        indices[r] = np.random.default_rng(semilla).integers(0, n, n)
+
+    # Una réplica separada queda en NaN y no entra en los percentiles de las bandas
+    return _ajustar(datos[indices], metodo, im, umbrales, separados='nan')
+
+
+def bootstrap_fragilidad(datos, im, metodo='capacidades', umbrales=None,
+                         n_bootstrap=1000, niveles=(5, 95), seed=2025,
+                         n_procesos=None, tam_bloque=250):
+    """
+    Ajusta las curvas de fragilidad y calcula bandas de confianza por
+    bootstrap en un pool de procesos.
+
+    Parámetros:
+    -----------
+    datos : array-like (n_muestras, n_columnas)
+        Capacidades (n_muestras × n_estados) si metodo='capacidades', o
+        demandas (n_muestras × n_im) si metodo='conteos'
+    im : array-like (n_im,)
+        Niveles de intensidad: donde se evalúan las bandas y, para
+        metodo='conteos', donde se midieron las demandas
+    metodo : str
+        'capacidades' (MLE cerrado) o 'conteos' (MLE binomial)
+    umbrales : array-like (n_estados,), opcional
+        Umbrales de demanda por estado de daño (solo para 'conteos')
+    n_bootstrap : int
+        Número de réplicas bootstrap
+    niveles : tuple
+        Percentiles de las bandas de confianza
+    seed : int
+        Semilla maestra; la réplica r usa siempre la misma semilla hija
+    n_procesos : int, opcional
+        Procesos del pool. None usa todos los núcleos; 1 ejecuta en serie
+    tam_bloque : int
+        Réplicas por tarea enviada al pool
+
+    Retorna:
+    --------
+    dict : 'theta', 'beta' (estimación puntual), 'theta_bootstrap',
+           'beta_bootstrap' (n_bootstrap × n_estados; NaN en las réplicas
+           con conteos separados, que no entran en las bandas), 'im',
+           'probabilidad' (n_estados × n_im), 'niveles' y 'bandas'
+           (len(niveles) × n_estados × n_im)
+
+    Con metodo='conteos' lanza ValueError si los conteos de la muestra
+    completa están separados (ver ajustar_fragilidad_conteos).
+    """
+    datos = np.asarray(datos, dtype=np.float64)
+    im = np.asarray(im, dtype=np.float64)
+    if metodo not in ('capacidades', 'conteos'):
+        raise ValueError(f"Método desconocido: {metodo}")
+    if metodo == 'conteos':
+        if umbrales is None:
+            raise ValueError("El método 'conteos' requiere los umbrales de daño")
+        umbrales = np.asarray(umbrales, dtype=np.float64)
+
+    theta, beta = _ajustar(datos, metodo, im, umbrales)
+
+    semillas = np.random.SeedSequence(seed).spawn(n_bootstrap)
+    tareas = [(datos, metodo, im, umbrales, semillas[i:i + tam_bloque])
+              for i in range(0, n_bootstrap, tam_bloque)]
+
+    if n_procesos is None:
+        n_procesos = os.cpu_count() or 1
+    if n_procesos == 1:
+        parciales = [_bloque_bootstrap(t) for t in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=n_procesos) as pool:
+            parciales = list(pool.map(_bloque_bootstrap, tareas))
+
+    theta_b = np.concatenate([p[0] for p in parciales])
+    beta_b = np.concatenate([p[1] for p in parciales])
+
+    probabilidad_b = probabilidad_excedencia(im, theta_b, beta_b)
+    bandas = np.nanpercentile(probabilidad_b, niveles, axis=0)
+
+    return {
+        'theta': theta,
+        'beta': beta,
+        'theta_bootstrap': theta_b,
+        'beta_bootstrap': beta_b,
+        'im': im,
+        'probabilidad': probabilidad_excedencia(im, theta, beta),
+        'niveles': tuple(niveles),
+        'bandas': bandas,
+    }
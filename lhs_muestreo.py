@@ -5,16 +5,259 @@ LATIN HYPERCUBE SAMPLING (LHS) PARA ANÁLISIS DE CONFIABILIDAD ESTRUCTURAL
 
 Script que implementa el Muestreo por Hipercubo Latino (LHS) para generar
 muestras correlacionadas de 14 variables aleatorias con diferentes 
-distribuciones de probabilidad.
+distribuciones de probabilidad. Las correlaciones de rango entre variables
+se inducen con el método de Iman–Conover.
 
 =============================================================================
 """
 
 import numpy as np
-#from scipy import stats
+from scipy.special import ndtri
+from scipy.spatial.distance import pdist, squareform
+from scipy.stats import qmc
 import pandas as pd
 
-def generar_lhs_muestreo(n_samples=1000, seed=2025):
+from distribuciones import DISTRIBUCIONES, ppf_rapida
+from esquema_muestras import COLUMNAS_PUSHOVER
+
+
+# =============================================================================
+# DISTRIBUCIONES MARGINALES (ORDEN DE COLUMNAS DE LA MATRIZ LHS)
+# =============================================================================
+
+# Registro compartido con sensibilidad.py (ver distribuciones.py):
+# [0] Carga muerta entrepiso - Normal      [7] Módulo Ec concreto - Normal
+# [1] Carga muerta cubierta - Normal       [8] Módulo Es acero - Normal
+# [2] Carga viva - Gumbel derecha          [9] Ancho vigas bw - Normal Truncada
+# [3] Resistencia f'c vigas - Normal       [10] Altura vigas h - Normal Truncada
+# [4] Resistencia f'c columnas - Normal    [11] Ancho columnas bc - Normal Truncada
+# [5] Límite fluencia acero fy - Normal    [12] Altura columnas hc - Normal Truncada
+# [6] Resistencia última fu acero - Normal [13] Recubrimiento - Normal
+DISTRIBUCIONES_LHS = [DISTRIBUCIONES[var_id] for var_id in sorted(DISTRIBUCIONES)]
+
+
+def transformar_a_distribuciones(uniform_matrix, rapida=True):
+    """
+    Transforma una matriz uniforme en [0, 1] a las 14 distribuciones
+    marginales usando la PPF (inversa de la CDF) de cada columna.
+
+    Parámetros:
+    -----------
+    uniform_matrix : np.ndarray
+        Matriz de forma (n, 14) con valores en (0, 1)
+    rapida : bool
+        Si es True usa las tablas de inversa de la CDF del registro
+        (error ≤ 1e-6 desviaciones estándar); si es False, la PPF exacta
+
+    Retorna:
+    --------
+    samples : np.ndarray
+        Matriz de forma (n, 14) en las unidades de cada variable
+    """
+    if rapida:
+        return ppf_rapida(uniform_matrix)
+    samples = np.empty_like(uniform_matrix)
+    for j, dist in enumerate(DISTRIBUCIONES_LHS):
+        samples[:, j] = dist.ppf(uniform_matrix[:, j])
+    return samples
+
+
+# =============================================================================
+# CORRELACIÓN DE RANGOS (IMAN–CONOVER)
+# =============================================================================
+
+def matriz_correlacion(pares, n_variables=14):
+    """
+    Construye una matriz de correlación de rangos a partir de pares.
+
+    Parámetros:
+    -----------
+    pares : dict
+        {(i, j): rho} con índices de columna de la matriz LHS, p. ej.
+        {(3, 7): 0.6, (4, 7): 0.6, (5, 6): 0.7} para f'c–Ec y fy–fu
+    n_variables : int
+        Dimensión de la matriz
+
+    Retorna:
+    --------
+    np.ndarray : Matriz simétrica (n_variables × n_variables)
+    """
+    C = np.eye(n_variables)
+    for (i, j), rho in pares.items():
+        C[i, j] = C[j, i] = rho
+    return C
+
+
+def _rangos(matriz):
+    """Rangos 0..n-1 de cada columna (una sola ordenación por columna)."""
+    orden = np.argsort(matriz, axis=0)
+    rangos = np.empty_like(orden)
+    np.put_along_axis(rangos, orden, np.arange(len(matriz))[:, None], axis=0)
+    return rangos
+
+
+def correlacion_rangos(samples):
+    """Matriz de correlación de Spearman entre las columnas de la muestra."""
+    return np.corrcoef(_rangos(samples), rowvar=False)
+
+
+def inducir_correlacion(samples, correlacion_objetivo):
+    """
+    Reordena las filas de cada columna para imponer una correlación de
+    rangos objetivo (Iman & Conover, 1982), sin alterar las marginales.
+
+    Como solo se permutan los valores dentro de cada columna, un bloque LHS
+    sigue siendo LHS después de la inducción.
+
+    Parámetros:
+    -----------
+    samples : np.ndarray
+        Matriz de forma (n, d) (uniforme o ya transformada)
+    correlacion_objetivo : array-like
+        Matriz de correlación de rangos (Spearman) objetivo (d × d)
+
+    Retorna:
+    --------
+    tuple : (samples_correlacionadas, reporte)
+        reporte : dict con 'objetivo', 'lograda' y 'error_maximo'
+    """
+    n, d = samples.shape
+    C_rangos = np.asarray(correlacion_objetivo, dtype=np.float64)
+    if C_rangos.shape != (d, d) or not np.allclose(C_rangos, C_rangos.T):
+        raise ValueError("La correlación objetivo debe ser simétrica de tamaño d × d")
+
+    # Correlación de Pearson de los scores normales equivalente a la de rangos
+    C = 2 * np.sin(np.pi * C_rangos / 6)
+    np.fill_diagonal(C, 1.0)
+
+    # Scores de van der Waerden en el orden actual de cada columna
+    rangos = _rangos(samples)
+    scores = ndtri((rangos + 1) / (n + 1))
+
+    try:
+        P = np.linalg.cholesky(C)
+        Q = np.linalg.cholesky(np.corrcoef(scores, rowvar=False))
+    except np.linalg.LinAlgError:
+        raise ValueError("La correlación objetivo no es definida positiva") from None
+
+    # T = S·Q⁻ᵀ·Pᵀ tiene correlación C
+    scores = scores @ np.linalg.solve(Q.T, P.T)
+
+    # Cada columna toma sus propios valores en el orden de rangos de T
+    rangos = _rangos(scores)
+    del scores
+    resultado = np.take_along_axis(np.sort(samples, axis=0), rangos, axis=0)
+
+    lograda = correlacion_rangos(resultado)
+    reporte = {
+        'objetivo': C_rangos,
+        'lograda': lograda,
+        'error_maximo': np.abs(lograda - C_rangos).max(),
+    }
+    return resultado, reporte
+
+
+# =============================================================================
+# GENERACIÓN LHS VECTORIZADA POR BLOQUES
+# =============================================================================
+
+def _semilla_bloque(seed, indice):
+    """Semilla independiente para el bloque `indice` (0 = desplazamientos comunes)."""
+    return np.random.SeedSequence(seed, spawn_key=(indice,))
+
+
+def generar_bloque_lhs_uniforme(indice_bloque, n_bloques, tam_bloque,
+                                n_variables=14, seed=2025):
+    """
+    Genera un bloque de un LHS uniforme por rebanadas (sliced LHS).
+
+    El diseño completo tiene n = n_bloques × tam_bloque estratos finos por
+    variable. Cada estrato grueso (de tam_bloque) se divide en n_bloques
+    estratos finos que se reparten entre los bloques con un desplazamiento
+    cíclico aleatorio. Así cada bloque es por sí mismo un LHS de tam_bloque
+    puntos y la unión de todos es un LHS de n puntos.
+
+    Cada bloque depende solo de su propia semilla y de los desplazamientos
+    comunes (tam_bloque × n_variables), por lo que puede generarse de forma
+    independiente y reproducible en cualquier proceso.
+
+    Parámetros:
+    -----------
+    indice_bloque : int
+        Índice del bloque a generar, en [0, n_bloques)
+    n_bloques : int
+        Número total de bloques del diseño
+    tam_bloque : int
+        Número de muestras por bloque
+    n_variables : int
+        Número de variables (columnas)
+    seed : int
+        Semilla maestra del diseño
+
+    Retorna:
+    --------
+    np.ndarray : Matriz uniforme de forma (tam_bloque, n_variables)
+    """
+    if not 0 <= indice_bloque < n_bloques:
+        raise ValueError(f"Índice de bloque fuera de rango: {indice_bloque}")
+
+    # Desplazamientos comunes a todos los bloques
+    rng_comun = np.random.default_rng(_semilla_bloque(seed, 0))
+    desplazamiento = rng_comun.integers(0, n_bloques, size=(tam_bloque, n_variables))
+
+    rng = np.random.default_rng(_semilla_bloque(seed, indice_bloque + 1))
+
+    # Estrato grueso de cada fila: una permutación independiente por columna
+    gruesos = np.broadcast_to(np.arange(tam_bloque)[:, None], (tam_bloque, n_variables))
+    gruesos = rng.permuted(gruesos, axis=0)
+
+    # Estrato fino asignado a este bloque dentro de cada estrato grueso
+    columnas = np.arange(n_variables)
+    finos = gruesos * n_bloques + (indice_bloque + desplazamiento[gruesos, columnas]) % n_bloques
+
+    # Posición aleatoria dentro del estrato fino
+    n_total = n_bloques * tam_bloque
+    return (finos + rng.random((tam_bloque, n_variables))) / n_total
+
+
+def generar_lhs_por_bloques(n_samples=1000, tam_bloque=None, seed=2025, uniforme=False,
+                            correlacion=None):
+    """
+    Generador que produce el diseño LHS bloque a bloque con memoria acotada.
+
+    Parámetros:
+    -----------
+    n_samples : int
+        Número total de muestras (múltiplo de tam_bloque)
+    tam_bloque : int, opcional
+        Muestras por bloque. Si es None se genera un único bloque
+    seed : int
+        Semilla maestra del diseño
+    uniforme : bool
+        Si es True produce la matriz uniforme sin transformar
+    correlacion : array-like, opcional
+        Matriz de correlación de rangos objetivo (14 × 14), impuesta en
+        cada bloque con Iman–Conover
+
+    Produce:
+    --------
+    np.ndarray : Bloques de forma (tam_bloque, 14)
+    """
+    if tam_bloque is None:
+        tam_bloque = n_samples
+    if n_samples % tam_bloque != 0:
+        raise ValueError("n_samples debe ser múltiplo de tam_bloque")
+
+    n_bloques = n_samples // tam_bloque
+    for indice in range(n_bloques):
+        bloque = generar_bloque_lhs_uniforme(indice, n_bloques, tam_bloque,
+                                             len(DISTRIBUCIONES_LHS), seed)
+        if correlacion is not None:
+            bloque, _ = inducir_correlacion(bloque, correlacion)
+        yield bloque if uniforme else transformar_a_distribuciones(bloque)
+
+
+def generar_lhs_muestreo(n_samples=1000, seed=2025, tam_bloque=None, correlacion=None):
     """
     Genera muestras usando Latin Hypercube Sampling (LHS) para 14 variables 
     aleatorias con diferentes distribuciones de probabilidad.
@@ -25,10 +268,16 @@ def generar_lhs_muestreo(n_samples=1000, seed=2025):
     
     Parámetros:
     -----------
-    n_samples : int, default=500
+    n_samples : int, default=1000
         Número de muestras a generar
     seed : int, default=2025
         Semilla para reproducibilidad de los resultados
+    tam_bloque : int, opcional
+        Si se indica, el diseño se genera por bloques de este tamaño
+        (ver generar_lhs_por_bloques)
+    correlacion : array-like, opcional
+        Matriz de correlación de rangos objetivo (14 × 14), p. ej. la
+        construida con matriz_correlacion. Se induce con Iman–Conover
     
     Regresa:
     --------
@@ -46,99 +295,272 @@ def generar_lhs_muestreo(n_samples=1000, seed=2025):
     
     Proceso:
     1. Generación de matriz uniforme estratificada en [0, 1] usando LHS
+       (vectorizada, con un Generator local por bloque)
     2. Permutación aleatoria para romper correlaciones sistemáticas
     3. Transformación a distribuciones específicas usando PPF (Inverse CDF)
     """
     
-    # Establecer semilla para reproducibilidad
-    np.random.seed(seed)
-    
-    n_variables = 14
-    
-    # ========================================================================
-    # PASO 1: Generar matriz uniforme estratificada en [0, 1] usando LHS
-    # ========================================================================
-    
     print("[1/3] Generando matriz uniforme estratificada (LHS)...")
     
-    uniform_matrix = np.zeros((n_samples, n_variables))
-    
-    for j in range(n_variables):
-        # Crear n_samples intervalos de igual tamaño en [0, 1]
-        intervals = np.linspace(0, 1, n_samples + 1)
-        
-        # Para cada intervalo, muestrear un valor uniforme
-        uniform_samples = np.array([
-            np.random.uniform(intervals[i], intervals[i + 1])
-            for i in range(n_samples)
-        ])
-        
-        # Permutar aleatoriamente para romper la correlación sistemática
-        permutation = np.random.permutation(n_samples)
-        uniform_matrix[:, j] = uniform_samples[permutation]
+    uniform_matrix = np.concatenate(list(
+        generar_lhs_por_bloques(n_samples, tam_bloque, seed, uniforme=True,
+                                correlacion=correlacion)))
     
     print(f"   ✓ Matriz uniforme LHS generada: {uniform_matrix.shape}")
     
-    # ========================================================================
-    # PASO 2: Transformar muestras uniformes a distribuciones específicas
-    # ========================================================================
+    if correlacion is not None:
+        lograda = correlacion_rangos(uniform_matrix)
+        error = np.abs(lograda - np.asarray(correlacion)).max()
+        print(f"   ✓ Correlación de rangos inducida (Iman–Conover): error máximo {error:.4f}")
+        for i, j in zip(*np.triu_indices_from(lograda, k=1)):
+            if correlacion[i][j] != 0:
+                print(f"     [{i}]–[{j}]: objetivo {correlacion[i][j]:+.3f}, lograda {lograda[i, j]:+.3f}")
     
     print("[2/3] Transformando a distribuciones de probabilidad...")
     
-    # Inicializar matriz de salida
-    samples = np.zeros((n_samples, n_variables))
-    # [0] Carga muerta entrepiso - Normal
-    samples[:, 0] = stats.norm.ppf(uniform_matrix[:, 0], loc=6.03, scale=0.63)
-    # [1] Carga muerta cubierta - Normal
-    samples[:, 1] = stats.norm.ppf(uniform_matrix[:, 1], loc=0.21, scale=0.02)
-    # [2] Carga viva - Gumbel derecha
-    samples[:, 2] = stats.gumbel_r.ppf(uniform_matrix[:, 2], loc=1.75, scale=0.36)
-    # [3] Resistencia f'c vigas - Normal
-    samples[:, 3] = stats.norm.ppf(uniform_matrix[:, 3], loc=25.2, scale=4.54)
-    # [4] Resistencia f'c columnas - Normal
-    samples[:, 4] = stats.norm.ppf(uniform_matrix[:, 4], loc=34.0, scale=6.05)
-    # [5] Límite fluencia acero fy - Normal
-    samples[:, 5] = stats.norm.ppf(uniform_matrix[:, 5], loc=453.6, scale=40.82)
-    # [6] Resistencia última fu acero - Normal
-    samples[:, 6] = stats.norm.ppf(uniform_matrix[:, 6], loc=683.6, scale=27.35)
-    # [7] Módulo Ec concreto - Normal
-    samples[:, 7] = stats.norm.ppf(uniform_matrix[:, 7], loc=23.59, scale=4.25)
-    # [8] Módulo Es acero - Normal
-    samples[:, 8] = stats.norm.ppf(uniform_matrix[:, 8], loc=200, scale=8)
-    # [9] Ancho vigas bw - Normal Truncada
-    mu_bw, sigma_bw = 0.303, 0.009
-    a_bw = (0.29 - mu_bw) / sigma_bw
-    b_bw = (0.315 - mu_bw) / sigma_bw
-    samples[:, 9] = stats.truncnorm.ppf(uniform_matrix[:, 9], 
-                                         a=a_bw, b=b_bw, 
-                                         loc=mu_bw, scale=sigma_bw)
-    # [10] Altura vigas h - Normal Truncada
-    mu_h, sigma_h = 0.396, 0.012
-    a_h = (0.39 - mu_h) / sigma_h
-    b_h = (0.415 - mu_h) / sigma_h
-    samples[:, 10] = stats.truncnorm.ppf(uniform_matrix[:, 10], 
-                                          a=a_h, b=b_h, 
-                                          loc=mu_h, scale=sigma_h)
-    # [11] Ancho columnas bc - Normal Truncada
-    mu_bc, sigma_bc = 0.404, 0.016
-    a_bc = (0.39 - mu_bc) / sigma_bc
-    b_bc = (0.415 - mu_bc) / sigma_bc
-    samples[:, 11] = stats.truncnorm.ppf(uniform_matrix[:, 11], 
-                                          a=a_bc, b=b_bc, 
-                                          loc=mu_bc, scale=sigma_bc)    
-    # [12] Altura columnas hc - Normal Truncada
-    mu_hc, sigma_hc = 0.404, 0.016
-    a_hc = (0.39 - mu_hc) / sigma_hc
-    b_hc = (0.415 - mu_hc) / sigma_hc
-    samples[:, 12] = stats.truncnorm.ppf(uniform_matrix[:, 12], 
-                                          a=a_hc, b=b_hc, 
-                                          loc=mu_hc, scale=sigma_hc)  
-    # [13] Recubrimiento - Normal
-    samples[:, 13] = stats.norm.ppf(uniform_matrix[:, 13], loc=34.67, scale=1.65)
+    samples = transformar_a_distribuciones(uniform_matrix)
+    
     print(f"   ✓ Transformación completada: {samples.shape}")
     return samples
 
 
+# =============================================================================
+# LHS OPTIMIZADO (MAXIMIN / BAJA CORRELACIÓN)
+# =============================================================================
+
+def metricas_lhs(uniform_matrix):
+    """
+    Calidad de llenado del espacio de un diseño uniforme en [0, 1]^d.
+
+    Retorna:
+    --------
+    dict : 'distancia_minima' (maximin), 'discrepancia_centrada' (CD²)
+           y 'max_abs_rho' (máxima correlación de Pearson entre columnas)
+    """
+    rho = np.corrcoef(uniform_matrix, rowvar=False)
+    np.fill_diagonal(rho, 0.0)
+    return {
+        'distancia_minima': pdist(uniform_matrix).min(),
+        'discrepancia_centrada': qmc.discrepancy(uniform_matrix, method='CD'),
+        'max_abs_rho': np.abs(rho).max(),
+    }
+
+
+def optimizar_lhs(uniform_matrix, n_iteraciones=5000, p=50, peso_correlacion=1.0,
+                  temperatura=0.01, seed=2025, verbose=True):
+    """
+    Mejora un LHS uniforme intercambiando valores dentro de una columna.
+
+    Un intercambio conserva la propiedad de hipercubo latino. El criterio
+    combina el φp de Morris–Mitchell (aproximación suave del maximin) y la
+    suma de correlaciones al cuadrado entre columnas, ambos normalizados por
+    su valor inicial. Un intercambio de las filas a y b en la columna k solo
+    modifica las distancias de los pares que contienen a o b y la fila k de
+    la matriz de productos cruzados, así que cada evaluación cuesta O(n + d)
+    y nunca se recalcula la matriz completa de distancias.
+
+    Parámetros:
+    -----------
+    uniform_matrix : np.ndarray
+        Diseño LHS uniforme de forma (n, d)
+    n_iteraciones : int
+        Número de intercambios propuestos
+    p : float
+        Exponente de φp (valores grandes ≈ maximin puro)
+    peso_correlacion : float
+        Peso relativo del término de correlación
+    temperatura : float
+        Temperatura inicial del recocido (decrece linealmente a 0)
+    seed : int
+        Semilla del Generator local
+    verbose : bool
+        Si es True, imprime las métricas antes y después
+
+    Retorna:
+    --------
+    tuple : (diseño_optimizado, reporte)
+        reporte : dict con las métricas 'inicial' y 'final'
+    """
+    rng = np.random.default_rng(seed)
+    X = np.array(uniform_matrix, dtype=np.float64)
+    n, d = X.shape
+    inicial = metricas_lhs(X)
+
+    # Distancias al cuadrado, escaladas por la mínima inicial para evitar
+    # desbordes de d^(-p), y contribuciones de cada par a φp^p
+    escala_d2 = inicial['distancia_minima']**2
+    D2 = squareform(pdist(X, 'sqeuclidean')) / escala_d2
+    np.fill_diagonal(D2, np.inf)
+    contrib = D2**(-p / 2)
+    phi = contrib.sum() / 2
+
+    # Productos cruzados de columnas centradas (media y varianza invariantes).
+    # Correlación² = G² · W, con W = 1 / (G_ii G_jj) fuera de la diagonal y 0
+    # en ella; se calcula una sola vez
+    Xc = X - X.mean(axis=0)
+    G = Xc.T @ Xc
+    escala = np.diag(G).copy()
+    W = 1 / np.outer(escala, escala)
+    np.fill_diagonal(W, 0)
+    corr = np.sum(G**2 * W)
+
+    phi0, corr0 = phi, max(corr, 1e-12)
+    objetivo = phi / phi0 + peso_correlacion * corr / corr0
+
+    for it in range(n_iteraciones):
+        k = rng.integers(d)
+        a, b = rng.choice(n, size=2, replace=False)
+        xa, xb = X[a, k], X[b, k]
+
+        # Nuevas distancias de a y b al resto (el par a–b no cambia)
+        col = X[:, k]
+        fila_a = D2[a] + ((xb - col)**2 - (xa - col)**2) / escala_d2
+        fila_b = D2[b] + ((xa - col)**2 - (xb - col)**2) / escala_d2
+        fila_a[[a, b]] = D2[a, [a, b]]
+        fila_b[[a, b]] = D2[b, [a, b]]
+        nueva_a, nueva_b = fila_a**(-p / 2), fila_b**(-p / 2)
+        phi_nuevo = (phi - contrib[a].sum() - contrib[b].sum() + contrib[a, b]
+                     + nueva_a.sum() + nueva_b.sum() - nueva_a[b])
+
+        # Cambio en la fila y columna k de los productos cruzados: solo esos
+        # 2(d - 1) términos de la suma de correlaciones cambian
+        fila_G = G[k] + (xb - xa) * (Xc[a] - Xc[b])
+        fila_G[k] = G[k, k]
+        corr_nuevo = corr + 2 * np.dot(fila_G**2 - G[k]**2, W[k])
+
+        objetivo_nuevo = phi_nuevo / phi0 + peso_correlacion * corr_nuevo / corr0
+        T = temperatura * (1 - it / n_iteraciones)
+        delta = objetivo_nuevo - objetivo
+        if delta < 0 or (T > 0 and rng.random() < np.exp(-delta / T)):
+            X[a, k], X[b, k] = xb, xa
+            Xc[a, k], Xc[b, k] = Xc[b, k], Xc[a, k]
+            D2[a], D2[:, a] = fila_a, fila_a
+            D2[b], D2[:, b] = fila_b, fila_b
+            contrib[a], contrib[:, a] = nueva_a, nueva_a
+            contrib[b], contrib[:, b] = nueva_b, nueva_b
+            G[k], G[:, k] = fila_G, fila_G
+            phi, corr, objetivo = phi_nuevo, corr_nuevo, objetivo_nuevo
+
+    final = metricas_lhs(X)
+    if verbose:
+        print(f"   ✓ LHS optimizado ({n_iteraciones} intercambios)")
+        for clave in ('distancia_minima', 'discrepancia_centrada', 'max_abs_rho'):
+            print(f"     {clave:<24} {inicial[clave]:.5f} → {final[clave]:.5f}")
+
+    return X, {'inicial': inicial, 'final': final}
+
+
+def generar_lhs_optimizado(n_samples=250, seed=2025, n_iteraciones=5000, **opciones):
+    """
+    Genera un LHS optimizado (maximin / baja correlación) para campañas
+    pequeñas, transformado a las 14 distribuciones.
+
+    Parámetros:
+    -----------
+    n_samples : int
+        Número de muestras
+    seed : int
+        Semilla del diseño inicial y de la optimización
+    n_iteraciones : int
+        Número de intercambios propuestos
+    **opciones :
+        Argumentos adicionales de optimizar_lhs
+
+    Retorna:
+    --------
+    tuple : (samples, reporte) con samples de forma (n_samples, 14)
+    """
+    uniform_matrix = generar_bloque_lhs_uniforme(0, 1, n_samples, len(DISTRIBUCIONES_LHS), seed)
+    uniform_matrix, reporte = optimizar_lhs(uniform_matrix, n_iteraciones, seed=seed, **opciones)
+    return transformar_a_distribuciones(uniform_matrix), reporte
+
+
+# =============================================================================
+# EXTENSIÓN INCREMENTAL DE UN DISEÑO LHS
+# =============================================================================
+
+def recuperar_uniformes(samples):
+    """Lleva muestras ya transformadas (n, 14) de vuelta a [0, 1] con la CDF."""
+    uniform_matrix = np.empty_like(samples, dtype=np.float64)
+    for j, dist in enumerate(DISTRIBUCIONES_LHS):
+        uniform_matrix[:, j] = dist.cdf(samples[:, j])
+    return uniform_matrix
+
+
+def extender_lhs(uniform_existente, factor=2, seed=2025):
+    """
+    Agrega muestras a un LHS existente conservando la propiedad de
+    hipercubo latino del conjunto combinado (estratificación anidada).
+
+    Cada uno de los n estratos de una columna se divide en `factor`
+    estratos finos. La muestra existente ya ocupa uno de ellos y las nuevas
+    muestras ocupan los restantes, con un emparejamiento aleatorio entre
+    columnas. El diseño combinado de n × factor filas es un LHS y solo las
+    filas nuevas requieren evaluación.
+
+    Parámetros:
+    -----------
+    uniform_existente : np.ndarray
+        Diseño LHS uniforme existente de forma (n, d)
+    factor : int
+        Factor de ampliación (2 = duplicar el diseño)
+    seed : int
+        Semilla del Generator local (usar una distinta a la del diseño base)
+
+    Retorna:
+    --------
+    np.ndarray : Nuevas muestras uniformes de forma (n × (factor - 1), d)
+    """
+    U = np.asarray(uniform_existente, dtype=np.float64)
+    n, d = U.shape
+    n_total = n * factor
+    if factor < 2:
+        raise ValueError("El factor de ampliación debe ser al menos 2")
+
+    gruesos = np.minimum(np.floor(U * n).astype(np.intp), n - 1)
+    if not np.all(np.sort(gruesos, axis=0) == np.arange(n)[:, None]):
+        raise ValueError("El diseño existente no es un hipercubo latino")
+
+    # Estrato fino ocupado por cada muestra existente
+    finos = np.clip(np.floor(U * n_total).astype(np.intp),
+                    gruesos * factor, gruesos * factor + factor - 1)
+    ocupados = np.zeros((d, n_total), dtype=bool)
+    ocupados[np.arange(d), finos] = True
+
+    # Estratos finos libres de cada columna, emparejados al azar entre columnas
+    rng = np.random.default_rng(seed)
+    libres = np.nonzero(~ocupados)[1].reshape(d, n_total - n).T
+    libres = rng.permuted(libres, axis=0)
+
+    return (libres + rng.random(libres.shape)) / n_total
+
+
+def extender_muestras(samples_existentes, factor=2, seed=2025):
+    """
+    Versión de extender_lhs para muestras ya transformadas (n, 14).
+
+    Retorna:
+    --------
+    np.ndarray : Nuevas muestras transformadas de forma (n × (factor - 1), 14)
+    """
+    nuevas = extender_lhs(recuperar_uniformes(samples_existentes), factor, seed)
+    return transformar_a_distribuciones(nuevas)
+
+
+# =============================================================================
+# ORDEN DE ARGUMENTOS DE pushover
+# =============================================================================
+
+def a_orden_pushover(samples):
+    """
+    Reordena una matriz LHS (n, 14) al orden de argumentos de pushover, sin
+    convertir unidades. Ec [7] alimenta vigas y columnas; fu [6] no se usa.
+    Para obtener argumentos en unidades del modelo usar
+    esquema_muestras.convertir_a_argumentos.
+    """
+    return samples[:, COLUMNAS_PUSHOVER]
+
+
 def crear_dataframe_muestras(samples):
     """
     Convierte la matriz de muestras NumPy a un DataFrame de pandas
@@ -293,4 +715,4 @@ if __name__ == "__main__":
     print("Script completado exitosamente ✓")
     print("=" * 90)
     print()
-print(df_samples)
+    print(df_samples)
@@ -2,6 +2,10 @@
 ALGORITMO DE INTERSECCIÓN DE CURVAS DISCRETAS CON ALTA PRECISIÓN
 ==================================================================
 
+Incluye además motores vectorizados por lotes para el método de
+coeficientes de desplazamiento (FEMA 440) y el método N2 (EC8, Anexo B),
+que devuelven el mismo esquema (xint, yint, info) que la intersección.
+
 Requisitos: NumPy >= 1.20, SciPy >= 1.5
 """
 
@@ -35,6 +39,75 @@ class InterseccionCurvas:
         if not np.all(np.diff(self.X) > 0):
             raise ValueError("X debe estar ordenado ascendentemente")
     
+    @classmethod
+    def desde_polilineas(cls, x1, y1, x2, y2, verbose=True):
+        """
+        Construye el problema a partir de dos polilíneas con abscisas propias
+        (p. ej. una curva pushover con pasos irregulares y un espectro de
+        demanda en su propia malla de periodos).
+
+        Las abscisas se fusionan con un barrido lineal O(n+m): se concatenan
+        las dos secuencias ya ordenadas y el ordenamiento estable (timsort)
+        las mezcla en una sola pasada. Cada curva se evalúa en los vértices
+        de la otra dentro de su propio tramo, de modo que ambas polilíneas
+        quedan representadas exactamente, sin remuestreo en una malla fina.
+        Solo se conserva el rango de abscisas común a las dos curvas.
+
+        Parámetros:
+        -----------
+        x1, y1 : array-like
+            Vértices de la primera curva (x1 estrictamente creciente)
+        x2, y2 : array-like
+            Vértices de la segunda curva (x2 estrictamente creciente)
+        verbose : bool
+            Se transmite a la instancia creada
+
+        Retorna:
+        --------
+        InterseccionCurvas : instancia sobre la malla fusionada
+        """
+        x1 = np.asarray(x1, dtype=np.float64)
+        y1 = np.asarray(y1, dtype=np.float64)
+        x2 = np.asarray(x2, dtype=np.float64)
+        y2 = np.asarray(y2, dtype=np.float64)
+
+        for x, y in ((x1, y1), (x2, y2)):
+            if len(x) != len(y):
+                raise ValueError("Cada polilínea debe tener x e y de la misma longitud")
+            if len(x) < 2:
+                raise ValueError("Se requieren al menos 2 puntos por polilínea")
+            if not np.all(np.diff(x) > 0):
+                raise ValueError("Las abscisas de cada polilínea deben ser crecientes")
+
+        x_inf = max(x1[0], x2[0])
+        x_sup = min(x1[-1], x2[-1])
+        if x_inf >= x_sup:
+            raise ValueError("Las polilíneas no comparten rango de abscisas")
+
+        # Mezcla lineal de las dos secuencias ordenadas
+        xs = np.concatenate([x1, x2])
+        de_curva1 = np.concatenate([np.ones(len(x1), bool), np.zeros(len(x2), bool)])
+        orden = np.argsort(xs, kind='stable')
+        X = xs[orden]
+        de_curva1 = de_curva1[orden]
+
+        # Tramo de cada curva que contiene cada vértice fusionado
+        k1 = np.clip(np.cumsum(de_curva1) - 1, 0, len(x1) - 2)
+        k2 = np.clip(np.cumsum(~de_curva1) - 1, 0, len(x2) - 2)
+        Y1 = y1[k1] + (y1[k1 + 1] - y1[k1]) * (X - x1[k1]) / (x1[k1 + 1] - x1[k1])
+        Y2 = y2[k2] + (y2[k2 + 1] - y2[k2]) * (X - x2[k2]) / (x2[k2 + 1] - x2[k2])
+
+        # Rango común y vértices repetidos
+        dentro = (X >= x_inf) & (X <= x_sup)
+        X, Y1, Y2 = X[dentro], Y1[dentro], Y2[dentro]
+        unico = np.concatenate([[True], np.diff(X) > 0])
+
+        return cls(X[unico], Y1[unico], Y2[unico], verbose=verbose)
+
+    def todas_las_intersecciones(self):
+        """Todos los cruces de las dos curvas (ver intersecciones_lote)."""
+        return self.intersecciones_lote(self.X, self.Y1, self.Y2)
+
     def buscar_intervalo_cruce(self):
         """Paso 1: Encuentra intervalo donde hay cambio de signo."""
         D = self.Y1 - self.Y2
@@ -42,7 +115,13 @@ class InterseccionCurvas:
         cambios = np.where(np.diff(signos) != 0)[0]
         
         if len(cambios) == 0:
-            raise ValueError("No hay intersección o hay múltiples cruces")
+            raise ValueError("No hay intersección entre las curvas")
+        # Un cruce sobre un nodo produce dos cambios de signo (hacia 0 y desde 0);
+        # se cuenta como en intersecciones_lote: nodos con D == 0 más tramos con cambio estricto
+        n_cruces = np.count_nonzero(D == 0) + np.count_nonzero(D[:-1] * D[1:] < 0)
+        if n_cruces > 1 and self.verbose:
+            warnings.warn(f"Se encontraron {n_cruces} cruces; se usa el primero "
+                          f"(ver intersecciones_lote para obtenerlos todos)")
         
         return cambios[0], D
     
@@ -123,5 +202,285 @@ class InterseccionCurvas:
         
         return xint, yint, info_dict
 
+    @staticmethod
+    def intersecciones_lote(X, Y1, Y2):
+        """
+        Encuentra TODOS los cruces de muchos pares de curvas a la vez.
+
+        Usa la solución lineal cerrada en cada tramo con cambio de signo,
+        vectorizada sobre pares y tramos (sin llamadas por par ni
+        buscadores de raíces). Un nodo con Y1 == Y2 cuenta como un cruce.
+
+        Parámetros:
+        -----------
+        X : array-like (n_puntos,) o (n_pares × n_puntos)
+            Abscisas, comunes a todos los pares o una fila por par
+        Y1, Y2 : array-like (n_pares × n_puntos)
+            Ordenadas de las dos curvas de cada par
+
+        Retorna:
+        --------
+        tuple : (xint, yint, info)
+            xint, yint : coordenadas de todos los cruces, ordenados por par
+                         y luego por abscisa
+            info : dict con 'par' (par de cada cruce), 'indice_cruce'
+                   (tramo o nodo de cada cruce) y 'n_cruces' por par
+        """
+        Y1 = np.atleast_2d(np.asarray(Y1, dtype=np.float64))
+        Y2 = np.atleast_2d(np.asarray(Y2, dtype=np.float64))
+        X = np.broadcast_to(np.asarray(X, dtype=np.float64), Y1.shape)
+
+        if Y1.shape != Y2.shape:
+            raise ValueError("Y1 e Y2 deben tener la misma forma (n_pares × n_puntos)")
+        if Y1.shape[1] < 2:
+            raise ValueError("Se requieren al menos 2 puntos")
+        if not np.all(np.diff(X, axis=1) > 0):
+            raise ValueError("X debe estar ordenado ascendentemente")
+
+        D = Y1 - Y2
+
+        # Cruces exactamente en un nodo
+        par_n, k_n = np.nonzero(D == 0)
+        x_n = X[par_n, k_n]
+        y_n = Y1[par_n, k_n]
+
+        # Cruces estrictos dentro de un tramo: solución lineal cerrada
+        par_t, k_t = np.nonzero(D[:, :-1] * D[:, 1:] < 0)
+        d0, d1 = D[par_t, k_t], D[par_t, k_t + 1]
+        t = d0 / (d0 - d1)
+        x_t = X[par_t, k_t] + t * (X[par_t, k_t + 1] - X[par_t, k_t])
+        y_t = Y1[par_t, k_t] + t * (Y1[par_t, k_t + 1] - Y1[par_t, k_t])
+
+        # Unir y ordenar por par y posición (un tramo va tras su nodo inicial)
+        par = np.concatenate([par_n, par_t])
+        posicion = np.concatenate([k_n, k_t + 0.5])
+        orden = np.lexsort((posicion, par))
+
+        info = {
+            'metodo': 'lineal_lote',
+            'par': par[orden],
+            'indice_cruce': np.floor(posicion[orden]).astype(np.intp),
+            'n_cruces': np.bincount(par, minlength=Y1.shape[0]),
+        }
+        return np.concatenate([x_n, x_t])[orden], np.concatenate([y_n, y_t])[orden], info
+
+    @staticmethod
+    def primer_cruce_lote(X, Y1, Y2):
+        """
+        Primer cruce de cada par, con el mismo esquema (xint, yint, info)
+        que los motores desempeno_coeficientes_lote y desempeno_n2_lote.
+
+        Los pares sin cruce quedan con NaN y info['valido'] = False.
+        """
+        xs, ys, info_todos = InterseccionCurvas.intersecciones_lote(X, Y1, Y2)
+        n_pares = len(info_todos['n_cruces'])
+
+        # El primer cruce de cada par es la primera aparición de su índice
+        pares, primero = np.unique(info_todos['par'], return_index=True)
+        xint = np.full(n_pares, np.nan)
+        yint = np.full(n_pares, np.nan)
+        xint[pares] = xs[primero]
+        yint[pares] = ys[primero]
+
+        info = {
+            'metodo': 'interseccion_lote',
+            'valido': info_todos['n_cruces'] > 0,
+            'n_cruces': info_todos['n_cruces'],
+        }
+        return xint, yint, info
+
+
+# ============================================================================
+# MOTORES DE PUNTO DE DESEMPEÑO POR LOTES (FEMA 440 Y N2)
+# ============================================================================
+#
+# Las curvas de capacidad se reciben en coordenadas espectrales (ADRS):
+# Sd en m y Sa en g, una curva por fila. Ambos motores devuelven la misma
+# tripleta que InterseccionCurvas.encontrar_interseccion, pero con arreglos
+# de longitud n_curvas: (xint, yint, info).
+
+g = 9.81                       # Aceleración de la gravedad (m/s²)
+
+# Coeficiente "a" de FEMA 440 (ec. 5-4) según la clase de sitio
+A_CLASE_SITIO = {'A': 130.0, 'B': 130.0, 'C': 90.0, 'D': 60.0, 'E': 60.0, 'F': 60.0}
+
+
+def _validar_curvas_lote(Sd, Sa):
+    """Convierte y valida curvas de capacidad (n_curvas × n_puntos)."""
+    Sd = np.atleast_2d(np.asarray(Sd, dtype=np.float64))
+    Sa = np.atleast_2d(np.asarray(Sa, dtype=np.float64))
+
+    if Sd.shape != Sa.shape:
+        raise ValueError("Sd y Sa deben tener la misma forma (n_curvas × n_puntos)")
+    if Sd.shape[1] < 2:
+        raise ValueError("Se requieren al menos 2 puntos por curva")
+    if not np.all(np.diff(Sd, axis=1) > 0):
+        raise ValueError("Sd debe estar ordenado ascendentemente en cada curva")
+
+    return Sd, Sa
+
+
+def _interp_filas(xq, X, Y):
+    """Interpolación lineal fila a fila: Y_k(xq_k), con X_k creciente."""
+    xq = np.clip(xq, X[:, 0], X[:, -1])
+    i = np.sum(X <= xq[:, None], axis=1) - 1
+    i = np.clip(i, 0, X.shape[1] - 2)
+    filas = np.arange(X.shape[0])
+
+    x0, x1 = X[filas, i], X[filas, i + 1]
+    y0, y1 = Y[filas, i], Y[filas, i + 1]
+    return y0 + (y1 - y0) * (xq - x0) / (x1 - x0)
+
+
+def _area_bajo_curvas(Sd, Sa):
+    """Energía de deformación (área bajo cada curva) por regla del trapecio."""
+    return 0.5 * np.sum((Sa[:, 1:] + Sa[:, :-1]) * np.diff(Sd, axis=1), axis=1)
+
+
+def _periodo_esquina(T_espectro, Sa_espectro, tol=1e-3):
+    """Estima Tc como el último periodo de la meseta de aceleración constante."""
+    meseta = Sa_espectro >= (1 - tol) * Sa_espectro.max()
+    return T_espectro[np.flatnonzero(meseta)[-1]]
+
+
+def desempeno_coeficientes_lote(Sd, Sa, T, T_espectro, Sa_espectro, clase_sitio='D'):
+    """
+    Punto de desempeño por el método de coeficientes de desplazamiento
+    (FEMA 440, cap. 5) para muchas curvas de capacidad a la vez.
+
+    Sd_t = C1 · C2 · Sa(Te) · Te² / (4π²) · g
+
+    La resistencia de fluencia se obtiene con una idealización elasto-plástica
+    de igual energía cuya rigidez inicial es la del periodo efectivo Te, de
+    modo que todo el cálculo es cerrado y sin búsqueda de raíces.
+
+    Parámetros:
+    -----------
+    Sd, Sa : array-like (n_curvas × n_puntos)
+        Curvas de capacidad en formato ADRS (Sd en m, Sa en g)
+    T : float o array-like (n_curvas,)
+        Periodo efectivo Te de cada muestra (s)
+    T_espectro, Sa_espectro : array-like
+        Espectro de demanda elástico (T en s, Sa en g)
+    clase_sitio : str
+        Clase de sitio para el coeficiente "a" de C1 ('A' a 'F')
+
+    Retorna:
+    --------
+    tuple : (xint, yint, info)
+        xint : desplazamiento espectral objetivo de cada curva (m)
+        yint : Sa de la curva de capacidad en xint (g)
+        info : dict con 'metodo', 'valido' y los coeficientes por muestra
+    """
+    Sd, Sa = _validar_curvas_lote(Sd, Sa)
+    n = Sd.shape[0]
+    T = np.broadcast_to(np.asarray(T, dtype=np.float64), (n,))
+    T_espectro = np.asarray(T_espectro, dtype=np.float64)
+    Sa_espectro = np.asarray(Sa_espectro, dtype=np.float64)
+
+    if clase_sitio not in A_CLASE_SITIO:
+        raise ValueError(f"Clase de sitio desconocida: {clase_sitio}")
+    a = A_CLASE_SITIO[clase_sitio]
+
+    # Demanda elástica en el periodo efectivo
+    Sa_T = np.interp(T, T_espectro, Sa_espectro)
+
+    # Fluencia por igual energía con rigidez inicial K0 = 4π²/(Te² g)
+    K0 = 4 * np.pi**2 / (T**2 * g)
+    du = Sd[:, -1]
+    Em = _area_bajo_curvas(Sd, Sa)
+    Say = K0 * (du - np.sqrt(np.maximum(du**2 - 2 * Em / K0, 0.0)))
+
+    # Relación de resistencia R y coeficientes C1, C2
+    R = Sa_T / Say
+    Tc1 = np.maximum(T, 0.2)
+    C1 = np.where(T >= 1.0, 1.0, 1 + (R - 1) / (a * Tc1**2))
+    C2 = np.where(T > 0.7, 1.0, 1 + ((R - 1) / T)**2 / 800)
+    C1 = np.where(R > 1, C1, 1.0)
+    C2 = np.where(R > 1, C2, 1.0)
+
+    xint = C1 * C2 * Sa_T * T**2 / (4 * np.pi**2) * g
+    yint = _interp_filas(xint, Sd, Sa)
+
+    info = {
+        'metodo': 'coeficientes_fema440',
+        'valido': xint <= du,
+        'periodo': T,
+        'Sa_demanda': Sa_T,
+        'Sa_fluencia': Say,
+        'R': R,
+        'C1': C1,
+        'C2': C2,
+    }
+    return xint, yint, info
+
+
+def desempeno_n2_lote(Sd, Sa, T_espectro, Sa_espectro, T=None, Tc=None):
+    """
+    Punto de desempeño por el método N2 (EC8, Anexo B) para muchas curvas
+    de capacidad a la vez.
+
+    La idealización bilineal es la del Anexo B: F*y = Sa máximo y
+    d*y = 2(d*m - E*m/F*y). El periodo T* se deduce de ella salvo que se
+    entregue explícitamente.
+
+    Parámetros:
+    -----------
+    Sd, Sa : array-like (n_curvas × n_puntos)
+        Curvas de capacidad en formato ADRS (Sd en m, Sa en g)
+    T_espectro, Sa_espectro : array-like
+        Espectro de demanda elástico (T en s, Sa en g)
+    T : float o array-like (n_curvas,), opcional
+        Periodo T* de cada muestra (s). Si es None se calcula de la bilineal
+    Tc : float, opcional
+        Periodo de esquina del espectro. Si es None se estima de la meseta
+
+    Retorna:
+    --------
+    tuple : (xint, yint, info)
+        xint : desplazamiento espectral objetivo d*t de cada curva (m)
+        yint : Sa de la curva de capacidad en xint (g)
+        info : dict con 'metodo', 'valido' y las magnitudes intermedias
+    """
+    Sd, Sa = _validar_curvas_lote(Sd, Sa)
+    n = Sd.shape[0]
+    T_espectro = np.asarray(T_espectro, dtype=np.float64)
+    Sa_espectro = np.asarray(Sa_espectro, dtype=np.float64)
+    if Tc is None:
+        Tc = _periodo_esquina(T_espectro, Sa_espectro)
+
+    # Idealización elasto-perfectamente plástica (EC8 B.3)
+    dm = Sd[:, -1]
+    Fy = Sa.max(axis=1)
+    Em = _area_bajo_curvas(Sd, Sa)
+    dy = 2 * (dm - Em / Fy)
+
+    if T is None:
+        T = 2 * np.pi * np.sqrt(dy / (Fy * g))
+    else:
+        T = np.broadcast_to(np.asarray(T, dtype=np.float64), (n,))
+
+    # Desplazamiento objetivo del sistema elástico equivalente
+    Se = np.interp(T, T_espectro, Sa_espectro)
+    det = Se * g * (T / (2 * np.pi))**2
 
+    # Corrección para periodos cortos (EC8 B.8), acotada a 3·d*et
+    qu = Se / Fy
+    corto = (T < Tc) & (qu > 1)
+    qu_seguro = np.where(corto, qu, 1.0)
+    xint = np.where(corto, det / qu_seguro * (1 + (qu_seguro - 1) * Tc / T), det)
+    xint = np.clip(xint, det, 3 * det)
+    yint = _interp_filas(xint, Sd, Sa)
 
+    info = {
+        'metodo': 'n2_ec8',
+        'valido': xint <= dm,
+        'periodo': T,
+        'Sa_demanda': Se,
+        'Sa_fluencia': Fy,
+        'd_fluencia': dy,
+        'd_elastico': det,
+        'qu': qu,
+        'Tc': Tc,
+    }
+    return xint, yint, info
@@ -0,0 +1,137 @@
+"""
+=============================================================================
+MUESTREO CUASI-MONTE CARLO ALEATORIZADO (SOBOL' / HALTON)
+=============================================================================
+
+Alternativa a generar_lhs_muestreo con secuencias de baja discrepancia
+aleatorizadas (scrambling) y las mismas 14 transformaciones marginales de
+lhs_muestreo. Con cada aleatorización independiente la media muestral es
+un estimador insesgado de la media de la respuesta, por lo que la
+dispersión entre aleatorizaciones da intervalos de confianza válidos para
+la media. Los estimadores de varianza y cuantiles no son insesgados con
+aleatorización, y sus intervalos son solo aproximados.
+
+Para respuestas suaves el error de QMC decrece más rápido que 1/√n, de
+modo que se alcanza la misma precisión con menos llamadas a pushover.
+
+Requisitos: NumPy >= 1.20, SciPy >= 1.7 (scipy.stats.qmc)
+=============================================================================
+"""
+
+import warnings
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc, t as t_student
+
+from lhs_muestreo import DISTRIBUCIONES_LHS, transformar_a_distribuciones
+
+
+def generar_qmc_muestreo(n_samples=1024, metodo='sobol', n_aleatorizaciones=8, seed=2025):
+    """
+    Genera muestras QMC aleatorizadas de las 14 variables.
+
+    Parámetros:
+    -----------
+    n_samples : int
+        Muestras por aleatorización (potencia de 2 para Sobol')
+    metodo : str
+        'sobol' o 'halton'
+    n_aleatorizaciones : int
+        Número de aleatorizaciones independientes
+    seed : int
+        Semilla maestra; cada aleatorización usa una semilla hija
+
+    Retorna:
+    --------
+    np.ndarray : Muestras de forma (n_aleatorizaciones, n_samples, 14)
+    """
+    d = len(DISTRIBUCIONES_LHS)
+    semillas = np.random.SeedSequence(seed).spawn(n_aleatorizaciones)
+    potencia_2 = n_samples > 0 and (n_samples & (n_samples - 1)) == 0
+
+    if metodo == 'sobol' and not potencia_2:
+        warnings.warn("Sobol' pierde sus propiedades de balance si n no es potencia de 2")
+
+    samples = np.empty((n_aleatorizaciones, n_samples, d))
+    for r, semilla in enumerate(semillas):
+        rng = np.random.default_rng(semilla)
+        if metodo == 'sobol':
+            sampler = qmc.Sobol(d, scramble=True, seed=rng)
+            u = sampler.random_base2(int(np.log2(n_samples))) if potencia_2 else sampler.random(n_samples)
+        elif metodo == 'halton':
+            u = qmc.Halton(d, scramble=True, seed=rng).random(n_samples)
+        else:
+            raise ValueError(f"Método desconocido: {metodo}")
+
+        # Evita 0 y 1 exactos, que la PPF lleva a ±∞
+        u = np.clip(u, 0.5 / 2**53, 1 - 0.5 / 2**53)
+        samples[r] = transformar_a_distribuciones(u)
+
+    return samples
+
+
+def diagnostico_convergencia(salidas, puntos_control=None, cuantiles=(0.5, 0.9),
+                             confianza=0.95):
+    """
+    Estimaciones acumuladas de media, varianza y cuantiles con intervalos
+    de confianza a partir de aleatorizaciones independientes (válidos para
+    la media; aproximados para la varianza y los cuantiles, cuyos
+    estimadores tienen sesgo).
+
+    Parámetros:
+    -----------
+    salidas : array-like (n_aleatorizaciones, n_samples)
+        Respuesta evaluada en las muestras de generar_qmc_muestreo, en el
+        mismo orden de la secuencia
+    puntos_control : list, opcional
+        Tamaños de muestra donde evaluar (por defecto potencias de 2)
+    cuantiles : tuple
+        Cuantiles de la respuesta a seguir
+    confianza : float
+        Nivel de confianza de los intervalos (t de Student con R - 1 g.l.)
+
+    Retorna:
+    --------
+    pandas.DataFrame : Tabla larga con columnas 'n', 'Estadistico',
+                       'Estimacion', 'IC_inferior', 'IC_superior' y
+                       'Error_relativo_%'
+    """
+    Y = np.atleast_2d(np.asarray(salidas, dtype=np.float64))
+    R, n = Y.shape
+    if R < 2:
+        raise ValueError("Se requieren al menos 2 aleatorizaciones para el intervalo")
+    if puntos_control is None:
+        puntos_control = [2**k for k in range(1, int(np.log2(n)) + 1)]
+        if puntos_control[-1] != n:
+            puntos_control.append(n)
+
+    # Media y varianza acumuladas de cada aleatorización (centradas para
+    # evitar cancelación numérica)
+    Yc = Y - Y[:, :1]
+    m = np.arange(1, n + 1)
+    suma = np.cumsum(Yc, axis=1)
+    suma2 = np.cumsum(Yc**2, axis=1)
+    media = suma / m + Y[:, :1]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        varianza = (suma2 - suma**2 / m) / (m - 1)
+
+    t_crit = t_student.ppf(0.5 + confianza / 2, R - 1)
+    datos = []
+    for n_k in puntos_control:
+        estimadores = {'Media': media[:, n_k - 1], 'Varianza': varianza[:, n_k - 1]}
+        for q, valor in zip(cuantiles, np.quantile(Y[:, :n_k], cuantiles, axis=1)):
+            estimadores[f'Cuantil_{q:g}'] = valor
+
+        for nombre, valores in estimadores.items():
+            estimacion = valores.mean()
+            semiancho = t_crit * valores.std(ddof=1) / np.sqrt(R)
+            datos.append({
+                'n': n_k,
+                'Estadistico': nombre,
+                'Estimacion': estimacion,
+                'IC_inferior': estimacion - semiancho,
+                'IC_superior': estimacion + semiancho,
+                'Error_relativo_%': abs(semiancho / estimacion) * 100 if estimacion != 0 else np.nan,
+            })
+
+    return pd.DataFrame(datos)
@@ -14,6 +14,16 @@ Descripción:
     - Percentiles 10-90 CALCULADOS AUTOMÁTICAMENTE desde media y desv.est
     - Distribuciones soportadas: Normal, Gumbel, Normal truncada
     - Sin lógica de pushover incluida
+    - Evaluación opcional en paralelo de los 2n + 1 puntos (n_procesos),
+      con los fallos registrados por punto en analizador.errores
+    - Salidas múltiples (vector o diccionario): cada punto se evalúa una
+      vez y se obtiene el ranking de cada salida (generar_tabla_larga)
+    - Barrido en k percentiles por variable (realizar_barrido) con curvas
+      de respuesta, indicador de no linealidad y caché de puntos evaluados
+    - Funciones por lotes (@evaluador_lote): reciben todos los puntos del
+      OAT o del barrido como una matriz (m × n) en una sola llamada
+    - Resultados persistentes (archivo=...): al cambiar la definición de
+      una variable solo se reevalúan sus puntos
 
 Uso:
     from analisis_oat import AnalisisSensibilidadOAT, variables_aleatorias
@@ -26,13 +36,16 @@ Uso:
     # Ejecutar OAT
     valores_nominales = [var['media'] for var in variables_aleatorias.values()]
     analizador = AnalisisSensibilidadOAT(pushover, variables_aleatorias, valores_nominales)
-    resultados = analizador.realizar_oat()
+    resultados = analizador.realizar_oat(n_procesos=None)   # None: todos los núcleos
     print(analizador.generar_tabla_resultados())
 """
 
+import os
+import json
 import numpy as np
 import pandas as pd
-from scipy.stats import norm, gumbel_r
+from distribuciones import variables_base, distribucion_congelada, DISTRIBUCIONES
+from evaluacion import evaluar_puntos, evaluador_lote, funcion_lote
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -40,7 +53,8 @@ warnings.filterwarnings('ignore')
 # FUNCIÓN PARA CALCULAR PERCENTILES AUTOMÁTICAMENTE
 # ============================================================================
 
-def calcular_percentiles(media, desv_est, distribucion='Normal'):
+def calcular_percentiles(media, desv_est, distribucion='Normal', limite_inferior=None,
+                         limite_superior=None):
     """
     Calcula percentiles 10 y 90 según la distribución.
 
@@ -52,34 +66,21 @@ def calcular_percentiles(media, desv_est, distribucion='Normal'):
         Desviación estándar
     distribucion : str
         Tipo: 'Normal', 'Gumbel', 'Normal truncada'
+    limite_inferior, limite_superior : float, opcional
+        Límites de la normal truncada (sin límite si se omiten)
 
     Retorna:
     --------
     tuple : (P10, P90) - Percentil 10 y percentil 90
     """
-
-    if distribucion == 'Normal' or distribucion == 'Normal truncada':
-        # Distribución normal: N(media, desv_est)
-        # Percentiles se calculan usando función cuantil ppf
-        dist = norm(loc=media, scale=desv_est)
-        P10 = dist.ppf(0.10)
-        P90 = dist.ppf(0.90)
-
-    elif distribucion == 'Gumbel':
-        # Distribución Gumbel
-        # Relaciones paramétricas:
-        # media = loc + gamma * scale (donde gamma ≈ 0.5772, constante de Euler-Mascheroni)
-        # desv_est = scale * pi / sqrt(6)
-        # Despejando: scale = desv_est * sqrt(6) / pi
-        scale = desv_est * np.sqrt(6) / np.pi
-        loc = media - 0.5772 * scale
-        dist = gumbel_r(loc=loc, scale=scale)
-        P10 = dist.ppf(0.10)
-        P90 = dist.ppf(0.90)
-
-    else:
-        raise ValueError(f"Distribución no soportada: {distribucion}")
-
+    info = {'distribucion': distribucion, 'media': media, 'desviacion_estandar': desv_est}
+    if limite_inferior is not None:
+        info['limite_inferior'] = limite_inferior
+    if limite_superior is not None:
+        info['limite_superior'] = limite_superior
+
+    # Misma parametrización que el muestreo LHS (ver distribuciones.py)
+    P10, P90 = distribucion_congelada(info).ppf([0.10, 0.90])
     return P10, P90
 
 
@@ -87,41 +88,13 @@ def calcular_percentiles(media, desv_est, distribucion='Normal'):
 # DEFINICIÓN DE VARIABLES ALEATORIAS (SIN PERCENTILES - SE CALCULAN AUTOMÁTICAMENTE)
 # ============================================================================
 
-variables_base = {
-    1: {'nombre': 'Carga muerta de entrepiso', 'unidad': 'kN/m²', 'distribucion': 'Normal', 
-        'media': 6.03, 'desviacion_estandar': 0.63},
-    2: {'nombre': 'Carga muerta de cubierta', 'unidad': 'kN/m²', 'distribucion': 'Normal', 
-        'media': 0.21, 'desviacion_estandar': 0.02},
-    3: {'nombre': 'Carga viva', 'unidad': 'kN/m²', 'distribucion': 'Gumbel', 
-        'media': 1.75, 'desviacion_estandar': 0.46},
-    4: {'nombre': 'fc vigas', 'unidad': 'MPa', 'distribucion': 'Normal', 
-        'media': 25.2, 'desviacion_estandar': 4.54},
-    5: {'nombre': 'fc columnas', 'unidad': 'MPa', 'distribucion': 'Normal', 
-        'media': 34.0, 'desviacion_estandar': 6.05},
-    6: {'nombre': 'Fy acero', 'unidad': 'MPa', 'distribucion': 'Normal', 
-        'media': 453.6, 'desviacion_estandar': 40.82},
-    7: {'nombre': 'Fu acero', 'unidad': 'MPa', 'distribucion': 'Normal', 
-        'media': 683.64, 'desviacion_estandar': 27.35},
-    8: {'nombre': 'Ec concreto', 'unidad': 'GPa', 'distribucion': 'Normal', 
-        'media': 23.59, 'desviacion_estandar': 4.25},
-    9: {'nombre': 'Es acero', 'unidad': 'GPa', 'distribucion': 'Normal', 
-        'media': 200.0, 'desviacion_estandar': 8.0},
-    10: {'nombre': 'Ancho viga', 'unidad': 'm', 'distribucion': 'Normal truncada', 
-        'media': 0.303, 'desviacion_estandar': 0.009},
-    11: {'nombre': 'Alto viga', 'unidad': 'm', 'distribucion': 'Normal truncada', 
-        'media': 0.396, 'desviacion_estandar': 0.012},
-    12: {'nombre': 'Ancho columna', 'unidad': 'm', 'distribucion': 'Normal truncada', 
-        'media': 0.404, 'desviacion_estandar': 0.016},
-    13: {'nombre': 'Alto columna', 'unidad': 'm', 'distribucion': 'Normal truncada', 
-        'media': 0.404, 'desviacion_estandar': 0.016},
-    14: {'nombre': 'Recubrimiento', 'unidad': 'mm', 'distribucion': 'Normal', 
-        'media': 34.67, 'desviacion_estandar': 1.65},
-}
+# variables_base se define una sola vez en distribuciones.py y se comparte
+# con lhs_muestreo; los percentiles salen de las mismas distribuciones.
 
 # Construir diccionario de variables con percentiles calculados automáticamente
 variables_aleatorias = {}
 for var_id, var_info in variables_base.items():
-    P10, P90 = calcular_percentiles(var_info['media'], var_info['desviacion_estandar'], var_info['distribucion'])
+    P10, P90 = DISTRIBUCIONES[var_id].ppf([0.10, 0.90])
     variables_aleatorias[var_id] = {
         'nombre': var_info['nombre'],
         'unidad': var_info['unidad'],
@@ -131,6 +104,10 @@ for var_id, var_info in variables_base.items():
         'rango_min': P10,
         'rango_max': P90
     }
+    # Límites de las normales truncadas (para reconstruir la distribución)
+    for limite in ('limite_inferior', 'limite_superior'):
+        if limite in var_info:
+            variables_aleatorias[var_id][limite] = var_info[limite]
 
 
 # ============================================================================
@@ -143,14 +120,15 @@ class AnalisisSensibilidadOAT:
     Genérico: funciona con cualquier función y conjunto de variables.
     """
 
-    def __init__(self, funcion, variables_dict, valores_nominales):
+    def __init__(self, funcion, variables_dict, valores_nominales, nombres_salidas=None):
         """
         Inicializa el analizador.
 
         Parámetros:
         -----------
         funcion : callable
-            Función de salida Y = f(X1, X2, ..., Xn)
+            Función de salida Y = f(X1, X2, ..., Xn). Puede devolver un
+            escalar, un vector o un diccionario {nombre_salida: valor}
 
         variables_dict : dict
             Diccionario con definición de variables
@@ -159,13 +137,23 @@ class AnalisisSensibilidadOAT:
 
         valores_nominales : list or array
             Valores nominales (medias) de cada variable en orden
+
+        nombres_salidas : list, opcional
+            Nombres de las componentes si la función devuelve un vector
+            (por defecto 'Y1', 'Y2', ...; 'Y' para una salida escalar)
         """
         self.funcion = funcion
         self.variables_dict = variables_dict
         self.valores_nominales = np.array(valores_nominales, dtype=float)
         self.n_variables = len(variables_dict)
+        self.nombres_salidas = list(nombres_salidas) if nombres_salidas is not None else None
+        self.salidas = []
         self.resultados = []
         self.resultados_ordenados = []
+        self.resultados_por_salida = {}
+        self.errores = {}
+        self.barrido = None
+        self._cache = {}
 
     def evaluar_en_punto(self, punto):
         """
@@ -181,63 +169,261 @@ class AnalisisSensibilidadOAT:
         float : Valor de salida de la función
         """
         try:
+            lote = funcion_lote(self.funcion)
+            if lote is not None:
+                return lote(np.atleast_2d(np.asarray(punto, dtype=float)))[0]
             return self.funcion(*punto)
         except Exception as e:
             print(f"Error al evaluar función: {e}")
             return None
 
-    def realizar_oat(self, verbose=True):
+    def construir_puntos(self):
+        """
+        Construye los 2n + 1 puntos del OAT.
+
+        Retorna:
+        --------
+        np.ndarray : Matriz (2n + 1, n). La fila 0 es el punto nominal; las
+                     filas 2i + 1 y 2i + 2 varían la variable i a P10 y P90
+        """
+        puntos = np.tile(self.valores_nominales, (2 * self.n_variables + 1, 1))
+        for i in range(self.n_variables):
+            var_info = self.variables_dict[i + 1]
+            puntos[2 * i + 1, i] = var_info['rango_min']
+            puntos[2 * i + 2, i] = var_info['rango_max']
+        return puntos
+
+    def realizar_oat(self, verbose=True, n_procesos=1, archivo=None):
         """
         Realiza el análisis OAT.
 
         Procedimiento:
-        1. Calcula Y0 en el punto nominal
-        2. Para cada variable:
-           - Varía entre P10 (rango_min) y P90 (rango_max)
-           - Calcula Y_min y Y_max
-           - Calcula IR = |Y_max - Y_min|
-        3. Ordena por IR descendente
+        1. Construye el punto nominal y, para cada variable, los puntos con
+           la variable en P10 (rango_min) y en P90 (rango_max)
+        2. Evalúa los 2n + 1 puntos (en paralelo si n_procesos > 1)
+        3. Calcula IR = |Y_max - Y_min| para cada variable
+        4. Ordena por IR descendente
+
+        Si una evaluación falla, su salida queda como NaN y el traceback se
+        guarda en self.errores con la clave 'nominal', (var_id, 'P10') o
+        (var_id, 'P90').
 
         Parámetros:
         -----------
         verbose : bool
             Si es True, muestra progreso del análisis
+        n_procesos : int, opcional
+            Procesos para evaluar los puntos. 1 evalúa en serie; None usa
+            todos los núcleos. Con más de un proceso la función debe estar
+            definida a nivel de módulo (p. ej. pushover)
+        archivo : str, opcional
+            Archivo JSON de resultados persistentes (ver cargar_resultados).
+            Si existe, solo se evalúan los puntos cuyas entradas cambiaron;
+            al terminar se actualiza
 
         Retorna:
         --------
         list : Resultados ordenados por impacto (mayor a menor)
         """
-        # Calcular valor nominal
-        Y0 = self.evaluar_en_punto(self.valores_nominales)
+        if archivo is not None and os.path.exists(archivo):
+            self.cargar_resultados(archivo, verbose)
+
+        puntos = self.construir_puntos()
+        claves = ['nominal'] + [(i + 1, p) for i in range(self.n_variables) for p in ('P10', 'P90')]
+        n_cache = sum(tuple(p) in self._cache for p in puntos)
+        por_punto, self.errores = self._evaluar_con_cache(puntos, claves, n_procesos)
+
+        if archivo is not None:
+            self.guardar_resultados(archivo)
+        if verbose and n_cache:
+            print(f"\n✓ {n_cache} de {len(puntos)} puntos reutilizados de resultados anteriores")
+
+        self.salidas = list(dict.fromkeys(nombre for valor in por_punto for nombre in valor))
+        if not self.salidas:
+            self.salidas = self.nombres_salidas or ['Y']
 
         if verbose:
             print("\n" + "="*100)
             print("ANÁLISIS DE SENSIBILIDAD OAT (ONE-AT-A-TIME)")
             print("="*100)
-            print(f"\nValor nominal Y₀ = {Y0:.6f}\n")
-            print(f"{'Var':<4} {'Nombre':<30} {'P10':<12} {'P90':<12} {'Y_P10':<12} {'Y_P90':<12} {'IR':<12}")
-            print("-" * 100)
 
-        # Iterar sobre cada variable
-        for i in range(self.n_variables):
-            var_idx = i + 1
-            var_info = self.variables_dict[var_idx]
+        self.resultados_por_salida = {}
+        for salida in self.salidas:
+            valores = [valor.get(salida, np.nan) for valor in por_punto]
+            resultados = self._resultados_salida(salida, valores)
+            # Ordenar por IR descendente (las variables con evaluaciones fallidas al final)
+            ordenados = sorted(resultados,
+                               key=lambda x: -np.inf if np.isnan(x['IR']) else x['IR'],
+                               reverse=True)
+            self.resultados_por_salida[salida] = ordenados
+
+            if verbose:
+                self._imprimir_salida(salida, resultados)
+
+        # La primera salida es la principal (compatibilidad con el uso escalar)
+        principal = self.salidas[0]
+        self.resultados_ordenados = self.resultados_por_salida[principal]
+        self.resultados = sorted(self.resultados_ordenados, key=lambda x: x['variable_id'])
+
+        if verbose and self.errores:
+            print(f"✗ {len(self.errores)} evaluaciones fallidas: {list(self.errores)}\n")
 
-            # Evaluar en percentil 10 (mínimo)
-            punto_min = self.valores_nominales.copy()
-            punto_min[i] = var_info['rango_min']
-            Y_min = self.evaluar_en_punto(punto_min)
+        return self.resultados_ordenados
+
+    def _evaluar_con_cache(self, puntos, claves, n_procesos=1):
+        """
+        Evalúa los puntos que no estén en la caché del analizador.
 
-            # Evaluar en percentil 90 (máximo)
-            punto_max = self.valores_nominales.copy()
-            punto_max[i] = var_info['rango_max']
-            Y_max = self.evaluar_en_punto(punto_max)
+        Los puntos repetidos (p. ej. el nominal, o P10/P90 ya evaluados en
+        realizar_oat) se evalúan una sola vez; cada punto se evalúa una vez
+        y sus salidas se separan por nombre. Solo se guardan en la caché las
+        evaluaciones exitosas: un punto fallido se vuelve a evaluar en la
+        siguiente llamada.
 
-            # Calcular Rango de Impacto
-            IR = abs(Y_max - Y_min)
+        Retorna:
+        --------
+        tuple : (lista de diccionarios {salida: valor}, vacía si falló;
+                 diccionario {clave: traceback} de los puntos fallidos)
+        """
+        llaves = [tuple(p) for p in np.asarray(puntos, dtype=float)]
+        nuevos = list(dict.fromkeys(k for k in llaves if k not in self._cache))
+        fallidos = {}       # Los fallos no se guardan en la caché: se reintentan en la próxima llamada
+        if nuevos:
+            for llave, (valor, error) in zip(nuevos, evaluar_puntos(self.funcion, nuevos, n_procesos)):
+                if error is None:
+                    try:
+                        valor = self._a_diccionario(valor)
+                    except (TypeError, ValueError) as e:
+                        error = f"Salida no válida: {e}"
+                if error is None:
+                    self._cache[llave] = (valor, None)
+                else:
+                    fallidos[llave] = ({}, error)
+
+        por_punto, errores = [], {}
+        for clave, llave in zip(claves, llaves):
+            valor, error = self._cache[llave] if llave in self._cache else fallidos[llave]
+            if error is not None:
+                errores[clave] = error
+            por_punto.append(valor)
+        return por_punto, errores
+
+    # ------------------------------------------------------------------------
+    # Persistencia de resultados
+    # ------------------------------------------------------------------------
+
+    def _identificador_funcion(self):
+        """Nombre calificado de la función, para no mezclar resultados de modelos distintos."""
+        funcion = self.funcion
+        nombre = getattr(funcion, '__qualname__', type(funcion).__qualname__)
+        return f"{getattr(funcion, '__module__', '')}.{nombre}"
+
+    def _definiciones(self):
+        """Definición de cada variable que determina sus puntos (sin nombre ni unidad)."""
+        return {str(var_id): {clave: (float(valor) if isinstance(valor, (int, float, np.floating)) else valor)
+                              for clave, valor in info.items() if clave not in ('nombre', 'unidad')}
+                for var_id, info in self.variables_dict.items()}
+
+    def guardar_resultados(self, filename='resultados_oat.json'):
+        """
+        Guarda en JSON las evaluaciones exitosas de la caché junto con la
+        función, el vector nominal y las definiciones de las variables.
+        Las evaluaciones fallidas no se guardan y se reintentan.
+
+        Parámetros:
+        -----------
+        filename : str
+            Nombre del archivo JSON a crear
+        """
+        datos = {
+            'funcion': self._identificador_funcion(),
+            'nominal': self.valores_nominales.tolist(),
+            'variables': self._definiciones(),
+            'puntos': [{'punto': list(punto), 'salidas': valor}
+                       for punto, (valor, error) in self._cache.items() if error is None],
+        }
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, ensure_ascii=False, indent=1)
+
+    def cargar_resultados(self, filename='resultados_oat.json', verbose=True):
+        """
+        Carga evaluaciones guardadas con guardar_resultados en la caché.
+
+        Las evaluaciones se identifican por su punto completo, de modo que
+        solo se reutilizan las de puntos cuyas entradas no cambiaron: si se
+        modifica la definición de una variable, solo sus puntos se vuelven
+        a evaluar; si cambia el vector nominal, se reevalúan todos los
+        puntos que lo contienen (solo coinciden los que varían justamente
+        la componente modificada). Los resultados de otra función se
+        descartan.
+
+        Parámetros:
+        -----------
+        filename : str
+            Archivo JSON a cargar
+        verbose : bool
+            Si es True, informa las diferencias con el análisis guardado
+
+        Retorna:
+        --------
+        dict : 'variables_modificadas' (ids), 'nominal_modificado' (bool) y
+               'puntos_cargados' (int)
+        """
+        with open(filename, encoding='utf-8') as f:
+            datos = json.load(f)
+
+        if datos.get('funcion') != self._identificador_funcion():
+            if verbose:
+                print(f"✗ Resultados de otra función ({datos.get('funcion')}); se descartan")
+            return {'variables_modificadas': list(self.variables_dict), 'nominal_modificado': True,
+                    'puntos_cargados': 0}
+
+        actuales = self._definiciones()
+        guardadas = datos.get('variables', {})
+        modificadas = [int(var_id) for var_id in actuales if guardadas.get(var_id) != actuales[var_id]]
+        nominal_modificado = datos.get('nominal') != self.valores_nominales.tolist()
+
+        # Una evaluación en memoria tiene prioridad, salvo que haya fallado
+        for registro in datos.get('puntos', []):
+            llave = tuple(registro['punto'])
+            if llave not in self._cache or self._cache[llave][1] is not None:
+                self._cache[llave] = (registro['salidas'], None)
+
+        if verbose:
+            print(f"\n✓ Resultados cargados de {filename}: {len(datos.get('puntos', []))} puntos")
+            if nominal_modificado:
+                print("   Vector nominal modificado: se reevalúan todos los puntos que lo usan")
+            elif modificadas:
+                print(f"   Variables modificadas: {modificadas}")
+
+        return {'variables_modificadas': modificadas, 'nominal_modificado': nominal_modificado,
+                'puntos_cargados': len(datos.get('puntos', []))}
+
+    def _a_diccionario(self, valor):
+        """Normaliza la salida de la función a {nombre_salida: float}."""
+        if isinstance(valor, dict):
+            return {str(nombre): float(v) for nombre, v in valor.items()}
+
+        vector = np.asarray(valor, dtype=float).ravel()
+        if self.nombres_salidas is None:
+            nombres = ['Y'] if vector.size == 1 else [f'Y{k + 1}' for k in range(vector.size)]
+        else:
+            nombres = self.nombres_salidas
+        if len(nombres) != vector.size:
+            raise ValueError(f"se esperaban {len(nombres)} salidas y la función devolvió {vector.size}")
+        return dict(zip(nombres, vector.tolist()))
+
+    def _resultados_salida(self, salida, valores):
+        """Resultados por variable (en orden) de una salida a partir de los 2n + 1 valores."""
+        Y0 = valores[0]
+        resultados = []
+        for i in range(self.n_variables):
+            var_idx = i + 1
+            var_info = self.variables_dict[var_idx]
+            Y_min, Y_max = valores[2 * i + 1], valores[2 * i + 2]
 
-            # Guardar resultado
-            resultado = {
+            resultados.append({
+                'salida': salida,
                 'variable_id': var_idx,
                 'nombre': var_info['nombre'],
                 'unidad': var_info['unidad'],
@@ -245,34 +431,167 @@ class AnalisisSensibilidadOAT:
                 'rango_max': var_info['rango_max'],
                 'Y_min': Y_min,
                 'Y_max': Y_max,
-                'IR': IR,
+                'IR': abs(Y_max - Y_min),   # Rango de Impacto
                 'Y0': Y0
-            }
-            self.resultados.append(resultado)
+            })
+        return resultados
+
+    def _imprimir_salida(self, salida, resultados):
+        """Imprime la tabla de avance de una salida, en el orden de las variables."""
+        if len(self.salidas) > 1:
+            print(f"\nSalida: {salida}")
+        print(f"\nValor nominal Y₀ = {resultados[0]['Y0']:.6f}\n")
+        print(f"{'Var':<4} {'Nombre':<30} {'P10':<12} {'P90':<12} {'Y_P10':<12} {'Y_P90':<12} {'IR':<12}")
+        print("-" * 100)
+        for r in resultados:
+            print(f"{r['variable_id']:<4} {r['nombre']:<30} {r['rango_min']:<12.4f} "
+                  f"{r['rango_max']:<12.4f} {r['Y_min']:<12.4f} {r['Y_max']:<12.4f} {r['IR']:<12.4f}")
+        print("-" * 100 + "\n")
+
+    def _ordenados(self, salida=None):
+        """Resultados ordenados de una salida (por defecto la principal)."""
+        if salida is None:
+            return self.resultados_ordenados
+        if salida not in self.resultados_por_salida:
+            raise KeyError(f"Salida desconocida: {salida}. Disponibles: {self.salidas}")
+        return self.resultados_por_salida[salida]
+
+    def realizar_barrido(self, percentiles=(5, 10, 25, 50, 75, 90, 95), verbose=True, n_procesos=1,
+                         archivo=None):
+        """
+        Curvas de respuesta OAT: cada variable se evalúa en k percentiles de
+        su distribución, con las demás en su valor nominal.
 
-            if verbose:
-                print(f"{var_idx:<4} {var_info['nombre']:<30} {var_info['rango_min']:<12.4f} "
-                      f"{var_info['rango_max']:<12.4f} {Y_min:<12.4f} {Y_max:<12.4f} {IR:<12.4f}")
+        Los n × k puntos (más el nominal) se evalúan juntos; los que ya
+        estén en la caché del analizador (p. ej. P10 y P90 de realizar_oat)
+        no se vuelven a evaluar.
 
-        # Ordenar por IR descendente
-        self.resultados_ordenados = sorted(self.resultados, key=lambda x: x['IR'], reverse=True)
+        El indicador de no linealidad de cada variable es la máxima
+        desviación de la curva respecto a su recta de mínimos cuadrados,
+        dividida por el rango de la respuesta (0 = lineal). 'Monotona'
+        indica si la respuesta no cambia de dirección en el barrido.
 
-        if verbose:
-            print("-" * 100 + "\n")
+        Parámetros:
+        -----------
+        percentiles : sequence
+            Percentiles a evaluar (entre 0 y 100, exclusivos)
+        verbose : bool
+            Si es True, muestra el resumen del barrido
+        n_procesos : int, opcional
+            Procesos para evaluar los puntos (1: en serie; None: todos los núcleos)
+        archivo : str, opcional
+            Archivo JSON de resultados persistentes (ver realizar_oat)
 
-        return self.resultados_ordenados
+        Retorna:
+        --------
+        tuple : (curvas, indicadores) como DataFrames en formato largo:
+                una fila por (salida, variable, percentil) y una fila por
+                (salida, variable)
+        """
+        percentiles = np.sort(np.asarray(percentiles, dtype=float))
+        if np.any((percentiles <= 0) | (percentiles >= 100)):
+            raise ValueError("Los percentiles deben estar entre 0 y 100 (exclusivos)")
+        k = len(percentiles)
+        if archivo is not None and os.path.exists(archivo):
+            self.cargar_resultados(archivo, verbose)
+
+        # Valores de cada variable en los percentiles (mismas distribuciones que el OAT)
+        valores_variable = np.array([
+            distribucion_congelada(self.variables_dict[i + 1]).ppf(percentiles / 100)
+            for i in range(self.n_variables)])
+
+        puntos = np.tile(self.valores_nominales, (self.n_variables * k + 1, 1))
+        claves = ['nominal']
+        for i in range(self.n_variables):
+            puntos[1 + i * k: 1 + (i + 1) * k, i] = valores_variable[i]
+            claves += [(i + 1, f'P{p:g}') for p in percentiles]
+
+        n_cache = sum(tuple(p) in self._cache for p in puntos)
+        por_punto, errores = self._evaluar_con_cache(puntos, claves, n_procesos)
+        if archivo is not None:
+            self.guardar_resultados(archivo)
+
+        salidas = list(dict.fromkeys(nombre for valor in por_punto for nombre in valor))
+        if not salidas:
+            salidas = self.nombres_salidas or ['Y']
+
+        curvas, indicadores = [], []
+        for salida in salidas:
+            Y = np.array([valor.get(salida, np.nan) for valor in por_punto], dtype=float)
+            Y0 = Y[0]
+            for i in range(self.n_variables):
+                var_info = self.variables_dict[i + 1]
+                x = valores_variable[i]
+                y = Y[1 + i * k: 1 + (i + 1) * k]
+
+                for p, xv, yv in zip(percentiles, x, y):
+                    curvas.append({
+                        'Salida': salida,
+                        'Var': i + 1,
+                        'Nombre': var_info['nombre'],
+                        'Percentil': p,
+                        'Valor_variable': xv,
+                        'Y': yv,
+                        'Cambio_%': (yv - Y0) / Y0 * 100 if Y0 != 0 else np.nan,
+                    })
+
+                indicadores.append({
+                    'Salida': salida,
+                    'Var': i + 1,
+                    'Nombre': var_info['nombre'],
+                    'Rango': np.ptp(y) if np.all(np.isfinite(y)) else np.nan,
+                    **self._indicador_no_linealidad(x, y),
+                })
+
+        curvas = pd.DataFrame(curvas)
+        indicadores = pd.DataFrame(indicadores).sort_values(
+            ['Salida', 'Rango'], ascending=[True, False], ignore_index=True)
+        self.barrido = {'curvas': curvas, 'indicadores': indicadores, 'errores': errores}
 
-    def generar_tabla_resultados(self):
+        if verbose:
+            print("\n" + "="*100)
+            print(f"BARRIDO OAT EN {k} PERCENTILES ({self.n_variables * k + 1} puntos, "
+                  f"{n_cache} reutilizados de la caché)")
+            print("="*100)
+            print(indicadores.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+            if errores:
+                print(f"✗ {len(errores)} evaluaciones fallidas: {list(errores)}")
+            print()
+
+        return curvas, indicadores
+
+    @staticmethod
+    def _indicador_no_linealidad(x, y):
+        """No linealidad (desviación máxima de la recta / rango) y monotonía de una curva."""
+        if not np.all(np.isfinite(y)) or len(y) < 3:
+            return {'No_linealidad': np.nan, 'Monotona': None}
+        rango = np.ptp(y)
+        if rango == 0:
+            return {'No_linealidad': 0.0, 'Monotona': True}
+        pendiente, intercepto = np.polyfit(x, y, 1)
+        desviacion = np.max(np.abs(y - (pendiente * x + intercepto)))
+        cambios = np.sign(np.diff(y))
+        cambios = cambios[cambios != 0]
+        return {'No_linealidad': desviacion / rango,
+                'Monotona': bool(np.all(cambios == cambios[0])) if len(cambios) else True}
+
+    def generar_tabla_resultados(self, salida=None):
         """
         Genera tabla de resultados en formato DataFrame.
 
+        Parámetros:
+        -----------
+        salida : str, opcional
+            Nombre de la salida (por defecto la principal)
+
         Retorna:
         --------
         pandas.DataFrame : Tabla con resultados ordenados por impacto
         """
+        ordenados = self._ordenados(salida)
         datos = []
-        for rank, resultado in enumerate(self.resultados_ordenados, 1):
-            IR_max = max([r['IR'] for r in self.resultados_ordenados])
+        for rank, resultado in enumerate(ordenados, 1):
+            IR_max = np.nanmax([r['IR'] for r in ordenados])
             Y0 = resultado['Y0']
 
             datos.append({
@@ -291,19 +610,13 @@ class AnalisisSensibilidadOAT:
 
         return pd.DataFrame(datos)
 
-    def exportar_csv(self, filename='resultados_oat.csv'):
-        """
-        Exporta resultados a archivo CSV.
-
-        Parámetros:
-        -----------
-        filename : str
-            Nombre del archivo CSV a crear
-        """
+    def _filas_exportacion(self, salida=None):
+        """Filas numéricas de la tabla de exportación de una salida."""
+        ordenados = self._ordenados(salida)
         datos = []
-        IR_max = max([r['IR'] for r in self.resultados_ordenados])
+        IR_max = np.nanmax([r['IR'] for r in ordenados])
 
-        for rank, resultado in enumerate(self.resultados_ordenados, 1):
+        for rank, resultado in enumerate(ordenados, 1):
             Y0 = resultado['Y0']
 
             datos.append({
@@ -322,16 +635,62 @@ class AnalisisSensibilidadOAT:
                 'Cambio_%_P10': round(((resultado['Y_min'] - Y0)/Y0)*100, 2),
                 'Cambio_%_P90': round(((resultado['Y_max'] - Y0)/Y0)*100, 2),
             })
+        return datos
 
-        df = pd.DataFrame(datos)
+    def exportar_csv(self, filename='resultados_oat.csv', salida=None):
+        """
+        Exporta resultados a archivo CSV.
+
+        Parámetros:
+        -----------
+        filename : str
+            Nombre del archivo CSV a crear
+        salida : str, opcional
+            Nombre de la salida (por defecto la principal)
+        """
+        df = pd.DataFrame(self._filas_exportacion(salida))
         df.to_csv(filename, index=False, encoding='utf-8-sig')
         print(f"\n✓ Resultados exportados a: {filename}")
         return df
 
-    def obtener_resumen(self):
+    def generar_tabla_larga(self):
+        """
+        Tabla en formato largo con todas las salidas: una fila por
+        (salida, variable), con las mismas columnas de exportar_csv.
+
+        Retorna:
+        --------
+        pandas.DataFrame : Tabla con la columna 'Salida' al inicio
+        """
+        datos = []
+        for salida in self.salidas:
+            for fila in self._filas_exportacion(salida):
+                datos.append({'Salida': salida, **fila})
+        return pd.DataFrame(datos)
+
+    def exportar_tabla_larga(self, filename='resultados_oat_salidas.csv'):
+        """
+        Exporta la tabla en formato largo de todas las salidas a CSV.
+
+        Parámetros:
+        -----------
+        filename : str
+            Nombre del archivo CSV a crear
+        """
+        df = self.generar_tabla_larga()
+        df.to_csv(filename, index=False, encoding='utf-8-sig')
+        print(f"\n✓ Resultados de {len(self.salidas)} salidas exportados a: {filename}")
+        return df
+
+    def obtener_resumen(self, salida=None):
         """
         Obtiene resumen estadístico del análisis.
 
+        Parámetros:
+        -----------
+        salida : str, opcional
+            Nombre de la salida (por defecto la principal)
+
         Retorna:
         --------
         dict : Estadísticas principales
@@ -340,18 +699,19 @@ class AnalisisSensibilidadOAT:
             print("Ejecuta realizar_oat() primero")
             return None
 
-        IRs = np.array([r['IR'] for r in self.resultados_ordenados])
-        Y0 = self.resultados_ordenados[0]['Y0']
+        ordenados = self._ordenados(salida)
+        IRs = np.array([r['IR'] for r in ordenados])
+        Y0 = ordenados[0]['Y0']
 
         return {
-            'Total_Variables': len(self.resultados_ordenados),
+            'Total_Variables': len(ordenados),
             'Valor_Nominal_Y0': Y0,
-            'IR_Maximo': IRs.max(),
-            'IR_Minimo': IRs.min(),
-            'IR_Promedio': IRs.mean(),
-            'IR_Desv_Est': IRs.std(),
-            'IR_Mediana': np.median(IRs),
-            'Top_3_Variables': [r['variable_id'] for r in self.resultados_ordenados[:3]],
+            'IR_Maximo': np.nanmax(IRs),
+            'IR_Minimo': np.nanmin(IRs),
+            'IR_Promedio': np.nanmean(IRs),
+            'IR_Desv_Est': np.nanstd(IRs),
+            'IR_Mediana': np.nanmedian(IRs),
+            'Top_3_Variables': [r['variable_id'] for r in ordenados[:3]],
         }
 
 
@@ -362,9 +722,14 @@ class AnalisisSensibilidadOAT:
 if __name__ == "__main__":
 
     # DEFINE TU FUNCIÓN AQUÍ
-    def mi_funcion_ejemplo(x1, x2, x3, x4, x5, x6, x7, x8, x9, x10, x11, x12, x13, x14):
-        """Función de ejemplo genérica"""
-        return x1*2 + x2*1.5 + x3*3 + x4*0.5 + x5*0.5 + x6*1 + x7*1.2 + x8*2.5 + x9*0.1 + x10*5 + x11*4 + x12*3 + x13*2 + x14*1
+    # Una función f(x1, ..., x14) se evalúa punto a punto; esta, decorada como
+    # evaluador por lotes, recibe todos los puntos como una matriz (m × 14)
+    coeficientes = np.array([2, 1.5, 3, 0.5, 0.5, 1, 1.2, 2.5, 0.1, 5, 4, 3, 2, 1])
+
+    @evaluador_lote
+    def mi_funcion_ejemplo(X):
+        """Función de ejemplo genérica (lineal)"""
+        return X @ coeficientes
 
     # Crear analizador
     valores_nominales = [var['media'] for var in variables_aleatorias.values()]
@@ -0,0 +1,295 @@
+"""
+=============================================================================
+CRIBADO DE MORRIS (EFECTOS ELEMENTALES)
+=============================================================================
+
+Método intermedio entre el OAT de sensibilidad.py (2n + 1 evaluaciones,
+local) y los índices de Sobol' de sensibilidad_sobol.py (miles de
+evaluaciones). Con r trayectorias de n + 1 puntos cada una, r(n + 1)
+análisis dan un ranking global de las 14 variables:
+
+- μ*: media del valor absoluto de los efectos elementales (importancia)
+- σ:  desviación de los efectos (no linealidad o interacciones)
+
+Las trayectorias se construyen en una malla de p niveles del espacio de
+probabilidad (centros de p estratos de igual probabilidad) y se llevan a
+cada distribución con su PPF. De un conjunto de candidatas se eligen las r
+más dispersas (Campolongo et al., 2007), eliminando una a una la de menor
+contribución a la dispersión total (Ruano et al., 2012). Los efectos se
+expresan por unidad de salto en el espacio de probabilidad, de modo que
+son comparables entre variables con unidades distintas.
+=============================================================================
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.spatial.distance import cdist
+
+from distribuciones import distribucion_congelada
+from evaluacion import evaluar_salidas
+
+
+class AnalisisMorris:
+    """
+    Cribado de Morris sobre un conjunto de variables aleatorias.
+    Genérico: funciona con cualquier función y conjunto de variables.
+    """
+
+    def __init__(self, funcion, variables_dict, r=10, niveles=4, n_candidatas=50, seed=2025):
+        """
+        Inicializa el analizador.
+
+        Parámetros:
+        -----------
+        funcion : callable
+            Función de salida Y = f(X1, X2, ..., Xn), con las variables en
+            el orden de variables_dict (el mismo del OAT)
+        variables_dict : dict
+            Diccionario con definición de variables (p. ej.
+            variables_aleatorias); se usan 'distribucion', 'media',
+            'desviacion_estandar' y los límites de las normales truncadas
+        r : int
+            Número de trayectorias a evaluar
+        niveles : int
+            Número de niveles p de la malla (par)
+        n_candidatas : int
+            Trayectorias candidatas entre las que se eligen las r más dispersas
+        seed : int
+            Semilla de generación de trayectorias
+        """
+        if niveles % 2:
+            raise ValueError("El número de niveles debe ser par")
+        if n_candidatas < r:
+            raise ValueError("n_candidatas debe ser mayor o igual que r")
+
+        self.funcion = funcion
+        self.variables_dict = variables_dict
+        self.ids = sorted(variables_dict)
+        self.n_variables = len(self.ids)
+        self.r = r
+        self.niveles = niveles
+        self.n_candidatas = n_candidatas
+        self.seed = seed
+        self.distribuciones = [distribucion_congelada(variables_dict[i]) for i in self.ids]
+
+        # Salto de p/2 niveles: los niveles son los centros (k + 0.5)/p de
+        # los estratos, separados 1/p, así que Δ = (p/2)/p = 0.5 en u
+        self.salto = niveles // 2
+        self.delta = self.salto / self.niveles
+
+        self.trayectorias = None
+        self.efectos = None
+        self.resultados_ordenados = []
+
+    # ------------------------------------------------------------------------
+    # Trayectorias
+    # ------------------------------------------------------------------------
+
+    def _candidatas(self, rng):
+        """
+        Genera trayectorias candidatas como índices de nivel.
+
+        Retorna:
+        --------
+        tuple : (niveles (M, n + 1, n), orden (M, n), signo (M, n))
+                orden[m, k] es la variable que cambia en el paso k y
+                signo[m, k] la dirección de ese cambio
+        """
+        M, n, J = self.n_candidatas, self.n_variables, self.salto
+
+        base = rng.integers(0, self.niveles, (M, n))
+        # Desde los niveles bajos se sube, desde los altos se baja
+        signo_var = np.where(base < J, 1, -1)
+        orden = np.argsort(rng.random((M, n)), axis=1)
+
+        pasos = np.zeros((M, n + 1, n), dtype=np.intp)
+        filas = np.arange(M)[:, None]
+        pasos[filas, np.arange(1, n + 1), orden] = J * signo_var[filas, orden]
+        indices = base[:, None, :] + np.cumsum(pasos, axis=1)
+
+        return indices, orden, np.take_along_axis(signo_var, orden, axis=1)
+
+    def _seleccionar(self, indices):
+        """
+        Elige las r trayectorias más dispersas eliminando iterativamente la
+        de menor contribución a la suma de distancias al cuadrado.
+        """
+        M, puntos, n = indices.shape
+        X = indices.reshape(M * puntos, n).astype(np.float64)
+        # Distancia entre trayectorias: suma de distancias entre sus puntos
+        D = cdist(X, X).reshape(M, puntos, M, puntos).sum(axis=(1, 3))
+        D2 = D**2
+
+        activas = np.ones(M, dtype=bool)
+        contribucion = D2.sum(axis=1)
+        for _ in range(M - self.r):
+            candidatas = np.flatnonzero(activas)
+            peor = candidatas[np.argmin(contribucion[candidatas])]
+            activas[peor] = False
+            contribucion -= D2[:, peor]
+        return np.flatnonzero(activas)
+
+    def generar_trayectorias(self):
+        """
+        Construye las r trayectorias optimizadas.
+
+        Retorna:
+        --------
+        np.ndarray : Puntos de forma (r, n + 1, n) en las unidades de cada variable
+        """
+        rng = np.random.default_rng(self.seed)
+        indices, orden, signo = self._candidatas(rng)
+        elegidas = self._seleccionar(indices)
+
+        self._orden = orden[elegidas]
+        self._signo = signo[elegidas]
+
+        # Centros de p estratos de igual probabilidad → PPF de cada variable
+        u = (indices[elegidas] + 0.5) / self.niveles
+        self.trayectorias = np.empty_like(u)
+        for j, dist in enumerate(self.distribuciones):
+            self.trayectorias[..., j] = dist.ppf(u[..., j])
+        return self.trayectorias
+
+    # ------------------------------------------------------------------------
+    # Análisis
+    # ------------------------------------------------------------------------
+
+    def realizar_morris(self, verbose=True, n_procesos=1):
+        """
+        Evalúa todas las trayectorias y calcula μ, μ* y σ por variable.
+
+        Los efectos elementales que dependen de una evaluación fallida
+        (NaN) se descartan; 'N_efectos' indica cuántos quedaron.
+
+        Parámetros:
+        -----------
+        verbose : bool
+            Si es True, muestra progreso del análisis
+        n_procesos : int, opcional
+            Procesos para evaluar los r(n + 1) puntos (1: en serie; None:
+            todos los núcleos)
+
+        Retorna:
+        --------
+        list : Resultados ordenados por μ* (mayor a menor)
+        """
+        if self.trayectorias is None:
+            self.generar_trayectorias()
+        r, puntos, n = self.trayectorias.shape
+
+        if verbose:
+            print("\n" + "="*100)
+            print("CRIBADO DE MORRIS (EFECTOS ELEMENTALES)")
+            print("="*100)
+            print(f"\n{r} trayectorias × {puntos} puntos = {r * puntos} evaluaciones\n")
+
+        Y = evaluar_salidas(self.funcion, self.trayectorias.reshape(r * puntos, n),
+                            n_procesos).reshape(r, puntos)
+
+        # Efecto del paso k de cada trayectoria, asignado a la variable que cambió
+        efectos_paso = np.diff(Y, axis=1) * self._signo / self.delta
+        self.efectos = np.empty((r, n))
+        np.put_along_axis(self.efectos, self._orden, efectos_paso, axis=1)
+
+        validos = np.isfinite(self.efectos)
+        mu = np.nanmean(self.efectos, axis=0)
+        mu_estrella = np.nanmean(np.abs(self.efectos), axis=0)
+        sigma = np.nanstd(self.efectos, axis=0, ddof=1)
+
+        self.resultados = []
+        for j, var_id in enumerate(self.ids):
+            var_info = self.variables_dict[var_id]
+            self.resultados.append({
+                'variable_id': var_id,
+                'nombre': var_info['nombre'],
+                'unidad': var_info['unidad'],
+                'mu': mu[j],
+                'mu_estrella': mu_estrella[j],
+                'sigma': sigma[j],
+                'N_efectos': int(validos[:, j].sum()),
+            })
+
+        self.resultados_ordenados = sorted(
+            self.resultados,
+            key=lambda x: -np.inf if np.isnan(x['mu_estrella']) else x['mu_estrella'],
+            reverse=True)
+
+        if verbose:
+            print(f"{'Var':<4} {'Nombre':<30} {'mu*':<12} {'mu':<12} {'sigma':<12}")
+            print("-" * 100)
+            for res in self.resultados_ordenados:
+                print(f"{res['variable_id']:<4} {res['nombre']:<30} {res['mu_estrella']:<12.4f} "
+                      f"{res['mu']:<12.4f} {res['sigma']:<12.4f}")
+            print("-" * 100)
+            n_fallidas = int(np.sum(~np.isfinite(Y)))
+            if n_fallidas:
+                print(f"✗ {n_fallidas} evaluaciones fallidas")
+            print()
+
+        return self.resultados_ordenados
+
+    def generar_tabla_resultados(self):
+        """
+        Genera tabla de resultados en formato DataFrame.
+
+        Retorna:
+        --------
+        pandas.DataFrame : Tabla con resultados ordenados por μ*
+        """
+        mu_max = np.nanmax([r['mu_estrella'] for r in self.resultados_ordenados])
+
+        datos = []
+        for rank, resultado in enumerate(self.resultados_ordenados, 1):
+            datos.append({
+                'Ranking': rank,
+                'Var': resultado['variable_id'],
+                'Nombre': resultado['nombre'],
+                'Unidad': resultado['unidad'],
+                'mu*': f"{resultado['mu_estrella']:.4f}",
+                'mu': f"{resultado['mu']:.4f}",
+                'sigma': f"{resultado['sigma']:.4f}",
+                'mu*_Normalizado(%)': f"{(resultado['mu_estrella']/mu_max*100):.2f}",
+                'sigma/mu*': f"{(resultado['sigma']/resultado['mu_estrella']):.2f}",
+                'N_efectos': resultado['N_efectos'],
+            })
+
+        return pd.DataFrame(datos)
+
+    def exportar_csv(self, filename='resultados_morris.csv'):
+        """
+        Exporta resultados a archivo CSV.
+
+        Parámetros:
+        -----------
+        filename : str
+            Nombre del archivo CSV a crear
+        """
+        df = self.generar_tabla_resultados()
+        df.to_csv(filename, index=False, encoding='utf-8-sig')
+        print(f"\n✓ Resultados exportados a: {filename}")
+        return df
+
+
+# ============================================================================
+# EJEMPLO DE USO
+# ============================================================================
+
+if __name__ == "__main__":
+
+    from sensibilidad import variables_aleatorias
+
+    # DEFINE TU FUNCIÓN AQUÍ
+    def mi_funcion_ejemplo(x1, x2, x3, x4, x5, x6, x7, x8, x9, x10, x11, x12, x13, x14):
+        """Función de ejemplo genérica (no lineal en x6 y x10)"""
+        return x1*2 + x3*3 + x4*0.5 + x6*x10*10 + x9*0.1 + x11*4 + x14*1
+
+    analizador = AnalisisMorris(mi_funcion_ejemplo, variables_aleatorias, r=10)
+    analizador.realizar_morris(verbose=True)
+
+    print("\nTABLA DE RESULTADOS:")
+    print(analizador.generar_tabla_resultados().to_string(index=False))
+
+    print("\n" + "="*100)
+    print("✓ Análisis completado")
+    print("="*100)
@@ -0,0 +1,232 @@
+"""
+=============================================================================
+SENSIBILIDAD BASADA EN MUESTREO (PRCC / SRRC)
+=============================================================================
+
+Rankings globales de sensibilidad a partir de una campaña LHS ya evaluada
+(matriz de muestras y sus salidas), sin análisis pushover adicionales:
+
+- PRCC: coeficiente de correlación parcial de rangos entre cada variable y
+  la salida, descontando el efecto lineal (en rangos) de las demás. Se
+  obtiene de la inversa de la matriz de correlación de rangos.
+- SRRC: coeficientes de la regresión lineal de rangos estandarizados. Su
+  R² indica qué fracción de la varianza (en rangos) explica el modelo
+  monótono; si es bajo, el ranking por SRRC es poco confiable.
+
+La significancia se evalúa con la prueba t de cada coeficiente y los
+intervalos de confianza por bootstrap, con todas las réplicas de un bloque
+calculadas a la vez (rangos, correlaciones e inversas en lote).
+
+Las correlaciones inducidas entre variables (Iman–Conover) no invalidan el
+PRCC, que controla por las demás variables, pero sí aumentan la varianza
+de los coeficientes; los intervalos bootstrap lo reflejan.
+=============================================================================
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata, t as t_student
+
+from distribuciones import variables_base
+
+
+# ============================================================================
+# COEFICIENTES EN LOTE
+# ============================================================================
+
+def _coeficientes(Z):
+    """
+    PRCC y SRRC de la última columna de Z respecto a las demás.
+
+    Parámetros:
+    -----------
+    Z : np.ndarray (..., n, d + 1)
+        Rangos de las variables y de la salida (última columna)
+
+    Retorna:
+    --------
+    tuple : (prcc, srrc, r2, diag_inv) con prcc, srrc y diag_inv (diagonal
+            de la inversa de la correlación entre variables) de forma
+            (..., d) y r2 de forma (...)
+    """
+    Zc = Z - Z.mean(axis=-2, keepdims=True)
+    Zc = Zc / np.sqrt((Zc**2).sum(axis=-2, keepdims=True))
+    C = np.swapaxes(Zc, -1, -2) @ Zc                  # Correlación de rangos (Spearman)
+
+    # Correlación parcial de cada variable con la salida
+    P = np.linalg.inv(C)
+    diag = np.diagonal(P, axis1=-2, axis2=-1)
+    prcc = -P[..., :-1, -1] / np.sqrt(diag[..., :-1] * diag[..., -1:])
+
+    # Regresión estandarizada: β = Cxx⁻¹ cxy, R² = cxyᵀ β
+    Cxx_inv = np.linalg.inv(C[..., :-1, :-1])
+    cxy = C[..., :-1, -1]
+    srrc = (Cxx_inv @ cxy[..., None])[..., 0]
+    r2 = np.sum(srrc * cxy, axis=-1)
+    return prcc, srrc, r2, np.diagonal(Cxx_inv, axis1=-2, axis2=-1)
+
+
+def _valores_p(prcc, srrc, r2, diag_inv, n):
+    """Valores p bilaterales de las pruebas t de PRCC y SRRC."""
+    d = len(prcc)
+    # PRCC: t = r √((n − 2 − (d − 1)) / (1 − r²))
+    gl_prcc = n - 1 - d
+    t_prcc = prcc * np.sqrt(gl_prcc / np.maximum(1 - prcc**2, 1e-300))
+    # SRRC: Var(β_j) = (1 − R²) / (n − d − 1) · [Cxx⁻¹]_jj
+    gl_srrc = n - d - 1
+    t_srrc = srrc / np.sqrt(max(1 - r2, 1e-300) / gl_srrc * diag_inv)
+    return 2 * t_student.sf(np.abs(t_prcc), gl_prcc), 2 * t_student.sf(np.abs(t_srrc), gl_srrc)
+
+
+def _bootstrap(D, n_bootstrap, seed):
+    """
+    Coeficientes de n_bootstrap remuestreos de las filas de D (n, d + 1).
+
+    Las réplicas se calculan en bloques de ~2e7 valores; cada remuestreo se
+    vuelve a convertir a rangos antes de calcular los coeficientes.
+    """
+    n, d1 = D.shape
+    indices = np.random.default_rng(seed).integers(0, n, (n_bootstrap, n))
+    tam_bloque = max(1, int(2e7 // (n * d1)))
+
+    prcc_b = np.empty((n_bootstrap, d1 - 1))
+    srrc_b = np.empty((n_bootstrap, d1 - 1))
+    for i in range(0, n_bootstrap, tam_bloque):
+        Zb = rankdata(D[indices[i:i + tam_bloque]], axis=1)
+        prcc_b[i:i + tam_bloque], srrc_b[i:i + tam_bloque], _, _ = _coeficientes(Zb)
+    return prcc_b, srrc_b
+
+
+# ============================================================================
+# ANÁLISIS COMPLETO
+# ============================================================================
+
+def analisis_prcc_srrc(samples, salidas, nombres=None, nombres_salidas=None,
+                       n_bootstrap=1000, confianza=0.95, seed=2025, verbose=True):
+    """
+    PRCC y SRRC de cada variable para cada salida de una campaña evaluada.
+
+    Parámetros:
+    -----------
+    samples : np.ndarray o pandas.DataFrame (n, d)
+        Matriz de muestras (p. ej. generar_lhs_muestreo, o el CSV de
+        crear_dataframe_muestras)
+    salidas : array-like (n,) o (n, k), o pandas.DataFrame
+        Salida(s) de cada muestra. Las filas con NaN (análisis fallidos) se
+        descartan para esa salida
+    nombres : list, opcional
+        Nombres de las variables. Por defecto las columnas del DataFrame o,
+        con 14 columnas, los nombres del registro de variables
+    nombres_salidas : list, opcional
+        Nombres de las salidas (por defecto las columnas o 'Y1', 'Y2', ...)
+    n_bootstrap : int
+        Réplicas bootstrap para los intervalos de confianza
+    confianza : float
+        Nivel de confianza de los intervalos; también fija el nivel de la
+        columna 'Significativa' (p < 1 − confianza)
+    seed : int
+        Semilla del remuestreo
+    verbose : bool
+        Si es True, muestra la tabla resumida
+
+    Retorna:
+    --------
+    pandas.DataFrame : Una fila por (salida, variable), ordenada por |PRCC|
+                       descendente dentro de cada salida
+    """
+    if isinstance(samples, pd.DataFrame):
+        nombres = nombres or list(samples.columns)
+    X = np.asarray(samples, dtype=np.float64)
+    n, d = X.shape
+    if nombres is None:
+        nombres = ([variables_base[i]['nombre'] for i in sorted(variables_base)]
+                   if d == len(variables_base) else [f'X{j + 1}' for j in range(d)])
+
+    if isinstance(salidas, pd.DataFrame):
+        nombres_salidas = nombres_salidas or list(salidas.columns)
+    elif isinstance(salidas, pd.Series):
+        nombres_salidas = nombres_salidas or [salidas.name or 'Y']
+    Y = np.asarray(salidas, dtype=np.float64)
+    if Y.ndim == 1:
+        Y = Y[:, None]
+    if len(Y) != n:
+        raise ValueError(f"Hay {n} muestras y {len(Y)} salidas")
+    if nombres_salidas is None:
+        nombres_salidas = ['Y'] if Y.shape[1] == 1 else [f'Y{k + 1}' for k in range(Y.shape[1])]
+
+    alfa = (1 - confianza) / 2
+    niveles = [alfa, 1 - alfa]
+    datos = []
+    for k, salida in enumerate(nombres_salidas):
+        validas = np.isfinite(Y[:, k]) & np.all(np.isfinite(X), axis=1)
+        D = np.column_stack([X[validas], Y[validas, k]])
+        n_validas = len(D)
+        if n_validas <= d + 2:
+            raise ValueError(f"Salida '{salida}': se necesitan más de {d + 2} muestras válidas "
+                             f"(hay {n_validas})")
+
+        try:
+            prcc, srrc, r2, diag_inv = _coeficientes(rankdata(D, axis=0))
+            prcc_b, srrc_b = _bootstrap(D, n_bootstrap, seed)
+        except np.linalg.LinAlgError:
+            raise ValueError(f"Salida '{salida}': la correlación de rangos es singular "
+                             f"(¿salida constante o función monótona exacta de una "
+                             f"sola variable?)") from None
+        p_prcc, p_srrc = _valores_p(prcc, srrc, r2, diag_inv, n_validas)
+        prcc_ic = np.quantile(prcc_b, niveles, axis=0)
+        srrc_ic = np.quantile(srrc_b, niveles, axis=0)
+
+        for rank, j in enumerate(np.argsort(-np.abs(prcc)), 1):
+            datos.append({
+                'Salida': salida,
+                'Ranking': rank,
+                'Var': j + 1,
+                'Nombre': nombres[j],
+                'PRCC': prcc[j],
+                'PRCC_IC_inf': prcc_ic[0, j],
+                'PRCC_IC_sup': prcc_ic[1, j],
+                'p_PRCC': p_prcc[j],
+                'SRRC': srrc[j],
+                'SRRC_IC_inf': srrc_ic[0, j],
+                'SRRC_IC_sup': srrc_ic[1, j],
+                'p_SRRC': p_srrc[j],
+                'Significativa': bool(p_prcc[j] < 1 - confianza),
+                'R2_rangos': r2,
+                'N_muestras': n_validas,
+            })
+
+    df = pd.DataFrame(datos)
+
+    if verbose:
+        print("\n" + "="*100)
+        print("SENSIBILIDAD BASADA EN MUESTREO (PRCC / SRRC)")
+        print("="*100)
+        for salida, grupo in df.groupby('Salida', sort=False):
+            print(f"\nSalida: {salida}  (n = {grupo['N_muestras'].iloc[0]}, "
+                  f"R² de la regresión de rangos = {grupo['R2_rangos'].iloc[0]:.3f})")
+            print(grupo[['Ranking', 'Var', 'Nombre', 'PRCC', 'PRCC_IC_inf', 'PRCC_IC_sup',
+                         'p_PRCC', 'SRRC', 'Significativa']]
+                  .to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+        print()
+
+    return df
+
+
+# ============================================================================
+# EJEMPLO DE USO
+# ============================================================================
+
+if __name__ == "__main__":
+
+    from lhs_muestreo import generar_lhs_muestreo, crear_dataframe_muestras
+
+    # Campaña LHS ya evaluada (aquí con una función de ejemplo no lineal)
+    samples = generar_lhs_muestreo(n_samples=500, seed=2025)
+    salida = samples[:, 5] * samples[:, 9] * samples[:, 10] + 0.05 * samples[:, 4] + samples[:, 0]
+
+    resultados = analisis_prcc_srrc(crear_dataframe_muestras(samples), salida,
+                                    nombres_salidas=['Respuesta'])
+
+    print("="*100)
+    print("✓ Análisis completado")
+    print("="*100)
@@ -0,0 +1,326 @@
+"""
+=============================================================================
+ANÁLISIS DE SENSIBILIDAD GLOBAL DE SOBOL' (BASADO EN VARIANZA)
+=============================================================================
+
+Complementa el OAT de sensibilidad.py (local, alrededor de las medias) con
+índices de Sobol' de primer orden (S1) y totales (ST) sobre las mismas 14
+variables aleatorias y sus distribuciones (ver distribuciones.py):
+
+1. Diseño de Saltelli: dos matrices base A y B (Sobol' aleatorizado) y las
+   d matrices AB_i (A con la columna i tomada de B), N(d + 2) evaluaciones
+   enviadas juntas a evaluacion.evaluar_salidas.
+2. Estimadores de Saltelli (2010) para S1 y de Jansen (1999) para ST.
+3. Intervalos de confianza por bootstrap, con las réplicas calculadas por
+   bloques de memoria acotada con indexación de NumPy.
+
+Para la función pushover completa N(d + 2) análisis suelen ser demasiados;
+en ese caso se ajusta primero una superficie de respuesta cuadrática
+(SuperficieRespuesta) con los resultados de una campaña LHS y se pasan sus
+índices de Sobol' por la superficie, que se evalúa en bloque.
+
+Requisitos: NumPy >= 1.20, SciPy >= 1.7, pandas
+=============================================================================
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+from distribuciones import variables_base, distribucion_congelada, DISTRIBUCIONES
+from evaluacion import evaluar_salidas
+
+
+# ============================================================================
+# DISEÑO DE SALTELLI
+# ============================================================================
+
+def matrices_saltelli(n_base=1024, distribuciones=None, seed=2025):
+    """
+    Construye el diseño de Saltelli en las unidades de cada variable.
+
+    Parámetros:
+    -----------
+    n_base : int
+        Filas de las matrices base A y B (potencia de 2)
+    distribuciones : list, opcional
+        Distribuciones congeladas de SciPy, una por variable. Por defecto
+        las 14 del registro compartido
+    seed : int
+        Semilla de la secuencia de Sobol' aleatorizada
+
+    Retorna:
+    --------
+    np.ndarray : Matriz (n_base * (d + 2), d) con los bloques apilados
+                 [A, B, AB_1, ..., AB_d]
+    """
+    if distribuciones is None:
+        distribuciones = [DISTRIBUCIONES[var_id] for var_id in sorted(DISTRIBUCIONES)]
+    d = len(distribuciones)
+
+    # Una sola secuencia de dimensión 2d: A y B son sus dos mitades
+    u = qmc.Sobol(2 * d, scramble=True, seed=seed).random(n_base)
+    u = np.clip(u, 0.5 / 2**53, 1 - 0.5 / 2**53)
+    x = np.empty_like(u)
+    for j in range(2 * d):
+        x[:, j] = distribuciones[j % d].ppf(u[:, j])
+    A, B = x[:, :d], x[:, d:]
+
+    bloques = [A, B]
+    for i in range(d):
+        AB_i = A.copy()
+        AB_i[:, i] = B[:, i]
+        bloques.append(AB_i)
+    return np.vstack(bloques)
+
+
+# ============================================================================
+# ESTIMADORES Y BOOTSTRAP
+# ============================================================================
+
+def _estimadores(yA, yB, yAB):
+    """
+    S1 (Saltelli 2010) y ST (Jansen 1999) para un lote de réplicas.
+
+    yA, yB : (..., N); yAB : (..., d, N). Retorna (S1, ST) de forma (..., d).
+    """
+    # Centrar con la media de A y B reduce mucho la varianza del estimador de S1
+    media = np.concatenate([yA, yB], axis=-1).mean(axis=-1, keepdims=True)
+    yA, yB, yAB = yA - media, yB - media, yAB - media[..., None]
+    varianza = np.concatenate([yA, yB], axis=-1).var(axis=-1)[..., None]
+    S1 = np.mean(yB[..., None, :] * (yAB - yA[..., None, :]), axis=-1) / varianza
+    ST = 0.5 * np.mean((yA[..., None, :] - yAB)**2, axis=-1) / varianza
+    return S1, ST
+
+
+def indices_sobol(y, d, n_bootstrap=1000, confianza=0.95, seed=2025):
+    """
+    Índices de Sobol' a partir de las salidas del diseño de Saltelli.
+
+    Las bases (filas de A) con alguna evaluación fallida (NaN) se descartan
+    en todos los bloques.
+
+    Parámetros:
+    -----------
+    y : array-like (N * (d + 2),)
+        Salidas en el orden de matrices_saltelli
+    d : int
+        Número de variables
+    n_bootstrap : int
+        Réplicas bootstrap (remuestreo de las bases con reemplazo)
+    confianza : float
+        Nivel de confianza de los intervalos percentiles
+    seed : int
+        Semilla del remuestreo
+
+    Retorna:
+    --------
+    dict : 'S1', 'ST' (d,), 'S1_ic', 'ST_ic' (2, d) y 'n_validas'
+    """
+    Y = np.asarray(y, dtype=np.float64).reshape(d + 2, -1)
+    Y = Y[:, np.all(np.isfinite(Y), axis=0)]
+    n = Y.shape[1]
+    if n < 2:
+        raise ValueError("No hay suficientes evaluaciones válidas para estimar los índices")
+    yA, yB, yAB = Y[0], Y[1], Y[2:]
+
+    S1, ST = _estimadores(yA, yB, yAB)
+
+    # Réplicas vectorizadas por bloques: cada bloque genera sus (bloque, N)
+    # índices y da (bloque, d); el bloque limita cada arreglo a ~2e7 valores
+    rng = np.random.default_rng(seed)
+    tam_bloque = max(1, int(2e7 // (d * n)))
+    S1_b, ST_b = np.empty((n_bootstrap, d)), np.empty((n_bootstrap, d))
+    for i in range(0, n_bootstrap, tam_bloque):
+        idx = rng.integers(0, n, (min(tam_bloque, n_bootstrap - i), n))
+        S1_b[i:i + tam_bloque], ST_b[i:i + tam_bloque] = _estimadores(
+            yA[idx], yB[idx], yAB[:, idx].transpose(1, 0, 2))
+
+    alfa = (1 - confianza) / 2
+    niveles = [alfa, 1 - alfa]
+    return {
+        'S1': S1,
+        'ST': ST,
+        'S1_ic': np.quantile(S1_b, niveles, axis=0),
+        'ST_ic': np.quantile(ST_b, niveles, axis=0),
+        'n_validas': n,
+    }
+
+
+# ============================================================================
+# ANÁLISIS COMPLETO
+# ============================================================================
+
+def analisis_sobol(funcion, n_base=1024, variables_dict=None, n_bootstrap=1000,
+                   confianza=0.95, seed=2025, n_procesos=1, verbose=True):
+    """
+    Análisis de sensibilidad global de Sobol' sobre las variables aleatorias.
+
+    Parámetros:
+    -----------
+    funcion : callable
+        Función Y = f(X1, ..., Xd) con las variables en el orden de
+        variables_dict (el mismo del OAT), o un sustituto con método
+        evaluar_lote(X) como SuperficieRespuesta
+    n_base : int
+        Tamaño N de las matrices base; se evalúan N(d + 2) puntos
+    variables_dict : dict, opcional
+        Definición de variables {id: {'nombre', 'distribucion', ...}}.
+        Por defecto variables_base del registro compartido
+    n_bootstrap : int
+        Réplicas bootstrap para los intervalos
+    confianza : float
+        Nivel de confianza de los intervalos
+    seed : int
+        Semilla del diseño y del bootstrap
+    n_procesos : int, opcional
+        Procesos para evaluar los puntos (1: en serie; None: todos los núcleos)
+    verbose : bool
+        Si es True, muestra el progreso
+
+    Retorna:
+    --------
+    pandas.DataFrame : Una fila por variable, ordenada por ST descendente,
+                       con S1, ST y sus intervalos de confianza
+    """
+    if variables_dict is None:
+        variables_dict = variables_base
+    ids = sorted(variables_dict)
+    distribuciones = [distribucion_congelada(variables_dict[i]) for i in ids]
+    d = len(ids)
+
+    if verbose:
+        print("\n" + "="*70)
+        print("ANÁLISIS DE SENSIBILIDAD GLOBAL DE SOBOL'")
+        print("="*70)
+        print(f"\n[1/3] Generando diseño de Saltelli: {n_base} × ({d} + 2) = "
+              f"{n_base * (d + 2)} evaluaciones...")
+
+    puntos = matrices_saltelli(n_base, distribuciones, seed)
+
+    if verbose:
+        print("[2/3] Evaluando la función...")
+
+    y = evaluar_salidas(funcion, puntos, n_procesos)
+
+    if verbose:
+        n_fallidas = int(np.sum(~np.isfinite(y)))
+        print(f"   ✓ Evaluaciones completadas ({n_fallidas} fallidas)")
+        print(f"[3/3] Calculando índices con {n_bootstrap} réplicas bootstrap...")
+
+    indices = indices_sobol(y, d, n_bootstrap, confianza, seed)
+
+    datos = []
+    for j, var_id in enumerate(ids):
+        datos.append({
+            'Var': var_id,
+            'Nombre': variables_dict[var_id]['nombre'],
+            'S1': indices['S1'][j],
+            'S1_IC_inf': indices['S1_ic'][0, j],
+            'S1_IC_sup': indices['S1_ic'][1, j],
+            'ST': indices['ST'][j],
+            'ST_IC_inf': indices['ST_ic'][0, j],
+            'ST_IC_sup': indices['ST_ic'][1, j],
+        })
+    df = pd.DataFrame(datos).sort_values('ST', ascending=False, ignore_index=True)
+
+    if verbose:
+        print(f"   ✓ Bases válidas: {indices['n_validas']} de {n_base}")
+        print(f"   ✓ Suma de S1: {indices['S1'].sum():.3f} (1 si el modelo es aditivo)\n")
+
+    return df
+
+
+# ============================================================================
+# SUPERFICIE DE RESPUESTA (SUSTITUTO BARATO)
+# ============================================================================
+
+class SuperficieRespuesta:
+    """
+    Polinomio cuadrático ajustado por mínimos cuadrados sobre variables
+    estandarizadas, usado como sustituto barato de pushover.
+
+    Se evalúa como la función original, f(X1, ..., Xd), o en bloque con
+    evaluar_lote(X). Es serializable, por lo que también sirve con pools.
+    """
+
+    def __init__(self, X, y, interacciones=True):
+        """
+        Parámetros:
+        -----------
+        X : array-like (n, d)
+            Entradas evaluadas (p. ej. muestras LHS, en el orden del OAT)
+        y : array-like (n,)
+            Respuesta en esas entradas; las filas no finitas se descartan
+        interacciones : bool
+            Si es True incluye los términos cruzados x_i x_j; si es False
+            solo términos lineales y cuadrados puros
+        """
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        validas = np.isfinite(y) & np.all(np.isfinite(X), axis=1)
+        X, y = X[validas], y[validas]
+
+        self.interacciones = interacciones
+        self.media = X.mean(axis=0)
+        self.escala = X.std(axis=0)
+        self.escala[self.escala == 0] = 1.0
+
+        P = self._terminos(X)
+        if len(y) <= P.shape[1]:
+            raise ValueError(f"Se necesitan más de {P.shape[1]} muestras válidas "
+                             f"para ajustar la superficie (hay {len(y)})")
+        self.coeficientes, *_ = np.linalg.lstsq(P, y, rcond=None)
+
+        # Calidad del ajuste: R² y Q² de validación cruzada dejando uno fuera
+        # (residuos PRESS con la diagonal de la matriz sombrero)
+        residuos = y - P @ self.coeficientes
+        Q, _ = np.linalg.qr(P)
+        h = np.sum(Q**2, axis=1)
+        ss_total = np.sum((y - y.mean())**2)
+        self.r2 = 1 - np.sum(residuos**2) / ss_total
+        self.q2 = 1 - np.sum((residuos / (1 - h))**2) / ss_total
+        self.n_muestras = len(y)
+
+    def _terminos(self, X):
+        """Matriz de términos [1, z, z², (z_i z_j)] de las entradas estandarizadas."""
+        Z = (X - self.media) / self.escala
+        columnas = [np.ones((len(Z), 1)), Z, Z**2]
+        if self.interacciones:
+            i, j = np.triu_indices(Z.shape[1], k=1)
+            columnas.append(Z[:, i] * Z[:, j])
+        return np.hstack(columnas)
+
+    def evaluar_lote(self, X):
+        """Evalúa la superficie en una matriz (m, d) de una sola vez."""
+        return self._terminos(np.atleast_2d(np.asarray(X, dtype=np.float64))) @ self.coeficientes
+
+    def __call__(self, *x):
+        return float(self.evaluar_lote(np.array(x))[0])
+
+
+# ============================================================================
+# EJEMPLO DE USO
+# ============================================================================
+
+if __name__ == "__main__":
+
+    from lhs_muestreo import generar_lhs_muestreo
+
+    # Función de ejemplo no lineal (a nivel de módulo no es necesaria en serie)
+    def mi_funcion_ejemplo(*x):
+        x = np.asarray(x)
+        return x[5] * x[9] * x[10] + 0.02 * x[3] * x[4] + 5 * x[0] + 2 * x[2]**2
+
+    # Sustituto ajustado con una campaña LHS pequeña
+    samples = generar_lhs_muestreo(n_samples=300, seed=2025)
+    y = np.array([mi_funcion_ejemplo(*fila) for fila in samples])
+    superficie = SuperficieRespuesta(samples, y)
+    print(f"\nSuperficie de respuesta: R² = {superficie.r2:.4f}, Q² = {superficie.q2:.4f}")
+
+    resultados = analisis_sobol(superficie, n_base=2048, n_bootstrap=500)
+    print(resultados.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+
+    print("\n" + "="*70)
+    print("✓ Análisis completado")
+    print("="*70)